@@ -0,0 +1,96 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BOT_TOKEN", "42:benchmark")
+os.environ.setdefault("API_URL", "http://localhost:8000/")
+os.environ.setdefault("ACCESS_EXPIRES_IN", "300")
+os.environ.setdefault("REFRESH_EXPIRES_IN", "86400")
+
+from aiogram.types import CallbackQuery, User
+
+from bot import create_dispatcher
+from handlers.teacher import CancelChoose
+from middlewares.callback_index import CallbackIndex
+
+ITERATIONS = 2000
+
+PAYLOADS = [
+    "start",
+    "role_student",
+    "book_15",
+    "choose_book_15_2",
+    "student_my_consultations_2",
+    CancelChoose(consultation_id=12, page=3).pack(),
+    "teacher_task_detail_7_1",
+    "teacher_edit_reminder_toggle_60",
+    "dean_tasks_page_3",
+    "dean_delete_task_confirm_4_2",
+    "menu_profile:tasks_menu",
+    "menu_help:main",
+    "help_section:tasks",
+    "help_flow:create_task:2:main",
+    "unknown_payload"
+]
+
+
+def make_query(data: str) -> CallbackQuery:
+    user = User(id=1000001, is_bot=False, first_name="Benchmark")
+    return CallbackQuery(id="1", from_user=user, chat_instance="benchmark", data=data)
+
+
+async def first_match(entries, event):
+    checks = 0
+    for handler in entries:
+        checks += 1
+        result, _ = await handler.check(event, raw_state=None)
+        if result:
+            return handler, checks
+    return None, checks
+
+
+async def linear(dp, event):
+    handlers = [handler for router in dp.chain_tail for handler in router.callback_query.handlers]
+    return await first_match(handlers, event)
+
+
+async def indexed(index, event):
+    return await first_match([entry[2] for entry in index.candidates(event.data)], event)
+
+
+async def measure(func, arg, event):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await func(arg, event)
+    return (time.perf_counter() - start) / ITERATIONS * 1_000_000
+
+
+async def main():
+    dp = create_dispatcher()
+    index = CallbackIndex.from_router(dp)
+    print(f"Обработчиков callback_query: {index.size}, итераций: {ITERATIONS}\n")
+    print(f"{'payload':<36}{'chain, µs':>12}{'checks':>8}{'index, µs':>12}{'checks':>8}")
+
+    total_linear = total_indexed = 0.0
+    for payload in PAYLOADS:
+        event = make_query(payload)
+        linear_match, linear_checks = await linear(dp, event)
+        indexed_match, indexed_checks = await indexed(index, event)
+        if linear_match is not indexed_match:
+            print(f"⚠ {payload}: индекс выбрал другой обработчик")
+
+        linear_us = await measure(linear, dp, event)
+        indexed_us = await measure(indexed, index, event)
+        total_linear += linear_us
+        total_indexed += indexed_us
+        print(f"{payload:<36}{linear_us:>12.1f}{linear_checks:>8}{indexed_us:>12.1f}{indexed_checks:>8}")
+
+    print(f"\nВ среднем: цепочка {total_linear / len(PAYLOADS):.1f} µs, "
+          f"индекс {total_indexed / len(PAYLOADS):.1f} µs, "
+          f"ускорение x{total_linear / max(total_indexed, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+import os
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.consultations_utils import format_date_verbose
+
+ITERATIONS = 20000
+
+DATES = [(date(2025, 9, 1) + timedelta(days=i % 14)).isoformat() for i in range(20)]
+
+
+def babel_format_date_verbose(date_str: str) -> str:
+    from babel.dates import format_date
+    try:
+        dt = datetime.strptime(date_str, "%Y-%m-%d")
+        formatted = format_date(dt, format="EEEE, d MMMM, y", locale="ru")
+        return formatted[0].upper() + formatted[1:]
+    except (ValueError, TypeError):
+        return date_str or "—"
+
+
+def render_page(formatter):
+    for date_str in DATES:
+        formatter(date_str)
+
+
+def main():
+    pages = ITERATIONS // len(DATES)
+    cached = timeit.timeit(lambda: render_page(format_date_verbose), number=pages)
+    print(f"Таблицы + lru_cache: {cached / ITERATIONS * 1_000_000:.2f} µs на дату")
+
+    try:
+        mismatches = [d for d in DATES if babel_format_date_verbose(d) != format_date_verbose(d)]
+    except ImportError:
+        print("babel не установлен, сравнение пропущено")
+        return
+    if mismatches:
+        print(f"⚠ Расхождения с babel: {mismatches}")
+
+    babel = timeit.timeit(lambda: render_page(babel_format_date_verbose), number=pages)
+    print(f"babel.format_date:    {babel / ITERATIONS * 1_000_000:.2f} µs на дату")
+    print(f"Ускорение: x{babel / cached:.1f}")
+
+
+if __name__ == "__main__":
+    main()
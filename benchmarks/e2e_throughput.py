@@ -0,0 +1,312 @@
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BOT_TOKEN", "42:benchmark")
+os.environ.setdefault("ACCESS_EXPIRES_IN", "300")
+os.environ.setdefault("REFRESH_EXPIRES_IN", "86400")
+os.environ.setdefault("REDIS_DB", "14")
+
+from aiohttp import web
+
+from tests.fake_tsu_api import FakeTSUAPI
+
+SCRATCH_MARKER = "benchmark:scratch"
+
+
+class FakeBotAPI:
+    def __init__(self):
+        self.calls: Counter = Counter()
+        self._message_ids = itertools.count(1000)
+        self._runner: web.AppRunner | None = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        data = await request.post()
+        if method.startswith("send") or method.startswith("edit"):
+            chat_id = int(data.get("chat_id") or 0)
+            result = {
+                "message_id": int(data.get("message_id") or next(self._message_ids)),
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": data.get("text", "")
+            }
+        else:
+            result = True
+        return web.json_response({"ok": True, "result": result})
+
+    async def start(self, host: str = "127.0.0.1") -> str:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, 0).start()
+        return f"http://{host}:{self._runner.addresses[0][1]}"
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+
+class Collector:
+    def __init__(self):
+        self.updates: list[float] = []
+        self.handlers: list[float] = []
+        self.per_handler: dict[str, list[float]] = {}
+        self.backend = 0
+        self.redis = 0
+        self.telegram = 0
+        self.errors = 0
+        self.backend_errors: Counter = Counter()
+
+    def started(self, operation):
+        pass
+
+    def finished(self, operation):
+        if operation.kind == "update":
+            self.updates.append(operation.duration)
+            if operation.error is not None:
+                self.errors += 1
+        elif operation.kind == "handler":
+            self.handlers.append(operation.duration)
+            key = f"{operation.labels.get('router', '')}.{operation.name}"
+            self.per_handler.setdefault(key, []).append(operation.duration)
+        elif operation.kind == "tsu_api":
+            self.backend += 1
+            status = operation.labels.get("status", "error")
+            if not status.startswith("2"):
+                self.backend_errors[(status, operation.labels.get("method", ""), operation.name)] += 1
+        elif operation.kind == "redis":
+            self.redis += 1
+        elif operation.kind == "telegram":
+            self.telegram += 1
+
+
+async def claim_scratch_redis(auth, flush: bool):
+    await auth.init_redis()
+    for client in (auth.redis_tokens, auth.redis_flags):
+        db = client.connection_pool.connection_kwargs.get("db", 0)
+        if not await client.exists(SCRATCH_MARKER) and await client.dbsize() and not flush:
+            raise SystemExit(
+                f"Redis DB {db} has data and is not marked as a benchmark DB ({SCRATCH_MARKER}). "
+                f"Point REDIS_DB at a scratch database or pass --flush-redis to wipe it."
+            )
+    for client in (auth.redis_tokens, auth.redis_flags):
+        await client.flushdb()
+        await client.set(SCRATCH_MARKER, "1")
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)] * 1000
+
+
+class UpdateFactory:
+    def __init__(self):
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+
+    def _user(self, telegram_id: int) -> dict:
+        return {"id": telegram_id, "is_bot": False, "first_name": f"User{telegram_id}"}
+
+    def _message(self, telegram_id: int, text: str | None = None) -> dict:
+        message = {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": {"id": telegram_id, "type": "private"},
+            "from": self._user(telegram_id)
+        }
+        if text is not None:
+            message["text"] = text
+        return message
+
+    def message(self, telegram_id: int, text: str) -> dict:
+        return {"update_id": next(self._update_ids), "message": self._message(telegram_id, text)}
+
+    def callback(self, telegram_id: int, data: str) -> dict:
+        return {
+            "update_id": next(self._update_ids),
+            "callback_query": {
+                "id": str(next(self._update_ids)),
+                "from": self._user(telegram_id),
+                "chat_instance": str(telegram_id),
+                "data": data,
+                "message": {**self._message(telegram_id, "menu"), "from": {"id": 42, "is_bot": True, "first_name": "Bot"}}
+            }
+        }
+
+
+def student_flow(api: FakeTSUAPI, updates: UpdateFactory, telegram_id: int, rng: random.Random) -> list[dict]:
+    consultation = rng.choice([c for c in api.consultations.values() if c["status"] == "active"])
+    teacher_id = consultation["teacher_id"]
+    return [
+        updates.callback(telegram_id, "student_view_teachers"),
+        updates.callback(telegram_id, "teacher_page_1"),
+        updates.callback(telegram_id, f"teacher_{teacher_id}"),
+        updates.callback(telegram_id, f"choose_book_{teacher_id}_1"),
+        updates.callback(telegram_id, f"book_{consultation['id']}"),
+        updates.message(telegram_id, "Вопрос по курсовой"),
+        updates.callback(telegram_id, "student_my_consultations"),
+        updates.callback(telegram_id, "student_cancel_consultations_1"),
+        updates.callback(telegram_id, f"cancel_booking_{consultation['id']}")
+    ]
+
+
+def teacher_flow(api: FakeTSUAPI, updates: UpdateFactory, telegram_id: int, rng: random.Random) -> list[dict]:
+    day = (date.today() + timedelta(days=rng.randint(1, 30))).strftime("%d-%m-%Y")
+    return [
+        updates.callback(telegram_id, "teacher_create_consultation"),
+        updates.message(telegram_id, "Разбор контрольной"),
+        updates.message(telegram_id, day),
+        updates.message(telegram_id, "10:00"),
+        updates.message(telegram_id, "11:30"),
+        updates.message(telegram_id, str(rng.randint(5, 30))),
+        updates.callback(telegram_id, "confirm_create_consultation"),
+        updates.callback(telegram_id, "teacher_my_consultations")
+    ]
+
+
+def dean_flow(api: FakeTSUAPI, updates: UpdateFactory, telegram_id: int, rng: random.Random) -> list[dict]:
+    teacher = rng.choice([u for u in api.users.values() if u["role"] == "teacher"])
+    return [
+        updates.callback(telegram_id, "dean_create_task"),
+        updates.message(telegram_id, "Подготовить отчёт"),
+        updates.callback(telegram_id, "task_skip_description"),
+        updates.callback(telegram_id, f"task_select_teacher_{teacher['id']}"),
+        updates.callback(telegram_id, "task_skip_deadline"),
+        updates.callback(telegram_id, "confirm_create_task"),
+        updates.callback(telegram_id, "dean_view_tasks")
+    ]
+
+
+SCENARIOS = {"student": student_flow, "teacher": teacher_flow, "dean": dean_flow}
+
+
+async def run_user(dp, bot, flows: list[list[dict]]):
+    for flow in flows:
+        for update in flow:
+            try:
+                await dp.feed_raw_update(bot, update)
+            except Exception:
+                pass
+
+
+async def main(args):
+    api = FakeTSUAPI(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed)
+    seeded = api.seed(teachers=args.teachers, students=args.students, deans=args.deans)
+    bot_api = FakeBotAPI()
+    os.environ["API_URL"] = await api.start()
+    bot_api_url = await bot_api.start()
+
+    from aiogram import Bot
+    from aiogram.client.session.aiohttp import AiohttpSession
+    from aiogram.client.telegram import TelegramAPIServer
+
+    from bot import create_dispatcher
+    from middlewares.instrumentation import TelegramRequestInstrumentation
+    from services import instrumentation
+    from services.auth import auth, shutdown
+    from utils.runtime import describe
+
+    session = AiohttpSession(api=TelegramAPIServer.from_base(bot_api_url))
+    bot = Bot(token=os.environ["BOT_TOKEN"], session=session)
+    bot.session.middleware(TelegramRequestInstrumentation())
+    dp = create_dispatcher()
+
+    await claim_scratch_redis(auth, args.flush_redis)
+
+    rng = random.Random(args.seed)
+    updates = UpdateFactory()
+    users = []
+    for role, scenario in SCENARIOS.items():
+        for telegram_id in seeded[role]:
+            flows = [scenario(api, updates, telegram_id, rng) for _ in range(args.rounds)]
+            users.append(flows)
+    rng.shuffle(users)
+
+    total_updates = sum(len(flow) for flows in users for flow in flows)
+    print(f"Среда: {describe()}")
+    print(f"Пользователей: {len(users)}, апдейтов: {total_updates}, одновременно: {args.concurrency}")
+    if args.concurrency > 1:
+        print("⚠ auth хранит telegram_id и токены в общем объекте, поэтому при одновременных пользователях "
+              "запросы уходят с чужими токенами. Цифры достоверны только при --concurrency 1.")
+    print(f"Fake TSU API: {os.environ['API_URL']} (задержка {args.latency * 1000:.0f} мс, "
+          f"ошибки {args.error_rate:.0%}), fake Bot API: {bot_api_url}\n")
+
+    collector = Collector()
+    instrumentation.add_listener(collector)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(flows):
+        async with semaphore:
+            await run_user(dp, bot, flows)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(limited(flows) for flows in users))
+    finally:
+        elapsed = time.perf_counter() - started
+        instrumentation.remove_listener(collector)
+        await shutdown()
+        await bot.session.close()
+        await api.stop()
+        await bot_api.stop()
+
+    processed = len(collector.updates) or 1
+    print(f"Время: {elapsed:.2f} с, апдейтов/с: {len(collector.updates) / elapsed:.1f}")
+    print(f"Обработчик, мс: p50 {percentile(collector.handlers, 0.50):.2f}, "
+          f"p95 {percentile(collector.handlers, 0.95):.2f}, p99 {percentile(collector.handlers, 0.99):.2f}")
+    print(f"Апдейт целиком, мс: p50 {percentile(collector.updates, 0.50):.2f}, "
+          f"p95 {percentile(collector.updates, 0.95):.2f}, p99 {percentile(collector.updates, 0.99):.2f}")
+    print(f"На апдейт: TSU API {collector.backend / processed:.2f}, Redis {collector.redis / processed:.2f}, "
+          f"Bot API {collector.telegram / processed:.2f}")
+    backend_errors = sum(collector.backend_errors.values())
+    if collector.errors:
+        print(f"⚠ Апдейтов с ошибкой: {collector.errors}")
+    if backend_errors:
+        print(f"⚠ Ответов TSU API не 2xx: {backend_errors} из {collector.backend}")
+        for (status, method, endpoint), count in collector.backend_errors.most_common():
+            print(f"    {status:<6}{method + ' ' + endpoint:<54}{count:>7}")
+
+    print(f"\n{'handler':<60}{'n':>7}{'p50, мс':>10}{'p95, мс':>10}")
+    for name, durations in sorted(collector.per_handler.items(), key=lambda item: -percentile(item[1], 0.95)):
+        print(f"{name:<60}{len(durations):>7}{percentile(durations, 0.50):>10.2f}{percentile(durations, 0.95):>10.2f}")
+
+    print(f"\n{'TSU API endpoint':<60}{'вызовов':>10}")
+    for (method, endpoint), count in api.calls.most_common():
+        print(f"{method + ' ' + endpoint:<60}{count:>10}")
+
+    if (collector.errors or backend_errors) and not args.error_rate:
+        print("\n❌ Прогон с ошибками, результаты недостоверны")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end throughput benchmark (needs a local Redis)")
+    parser.add_argument("--students", type=int, default=40)
+    parser.add_argument("--teachers", type=int, default=10)
+    parser.add_argument("--deans", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="users in flight at once; results are only valid at 1 until auth state is per-user")
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.005)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--flush-redis", action="store_true",
+                        help=f"wipe REDIS_DB and REDIS_DB + 1 even if they are not marked with {SCRATCH_MARKER}")
+    parser.add_argument("--loop", choices=("auto", "uvloop", "asyncio"), default="asyncio")
+    args = parser.parse_args()
+
+    from utils.runtime import run
+    run(main(args), args.loop)
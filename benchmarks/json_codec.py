@@ -0,0 +1,63 @@
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fake_tsu_api import FakeTSUAPI
+from utils import json_codec
+
+ITERATIONS = 200
+
+
+def build_payloads() -> dict[str, object]:
+    api = FakeTSUAPI(seed=1)
+    seeded = api.seed(teachers=50, students=10, deans=1, consultations_per_teacher=4, tasks_per_dean=500)
+    tasks = list(api.tasks.values())
+    consultations = [api._consultation_view(c) for c in api.consultations.values()]
+    teachers = [api._person(u) for u in api.users.values() if u["role"] == "teacher"]
+
+    def page(items, size):
+        return {"count": len(items), "total_pages": -(-len(items) // size), "current_page": 1,
+                "next": 2, "previous": None, "results": items[:size]}
+
+    return {
+        "todo/all (10)": page(tasks, 10),
+        "todo/all (100)": page(tasks, 100),
+        "todo/all (500)": page(tasks, 500),
+        "consultations/my (50)": page(consultations, 50),
+        "teachers (50)": page(teachers, 50),
+        "profile": api.users[seeded["dean"][0]],
+        "FSM state": {
+            "title": "Подготовить отчёт", "description": "", "assignee_id": teachers[0]["id"],
+            "deadline": tasks[0]["deadline"], "reminders": [15, 60, 1440], "selected_reminders": [15, 60],
+            "consultations_info": {str(c["id"]): {k: c[k] for k in ("title", "date", "start_time", "end_time")}
+                                   for c in consultations[:3]}
+        }
+    }
+
+
+def per_call(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1_000_000
+
+
+def main():
+    print(f"Кодек: {json_codec.BACKEND}, итераций: {ITERATIONS}\n")
+    print(f"{'payload':<24}{'размер':>10}{'json.loads':>12}{'codec.loads':>13}{'json.dumps':>12}{'codec.dumps':>13}")
+    for name, payload in build_payloads().items():
+        raw = json.dumps(payload, ensure_ascii=False).encode()
+        if json_codec.loads(raw) != json.loads(raw):
+            print(f"⚠ {name}: результат декодирования отличается")
+        stdlib_loads = per_call(lambda: json.loads(raw), ITERATIONS)
+        codec_loads = per_call(lambda: json_codec.loads(raw), ITERATIONS)
+        stdlib_dumps = per_call(lambda: json.dumps(payload, ensure_ascii=False), ITERATIONS)
+        codec_dumps = per_call(lambda: json_codec.dumps(payload), ITERATIONS)
+        size = f"{len(raw) / 1024:.1f} KB"
+        print(f"{name:<24}{size:>10}{stdlib_loads:>10.1f}µs{codec_loads:>11.1f}µs"
+              f"{stdlib_dumps:>10.1f}µs{codec_dumps:>11.1f}µs")
+    print(f"\nОтветы от {json_codec.THREAD_DECODE_THRESHOLD // 1024} KB декодируются в отдельном потоке")
+
+
+if __name__ == "__main__":
+    main()
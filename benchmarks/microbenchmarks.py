@@ -0,0 +1,193 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import timeit
+from datetime import date, datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BOT_TOKEN", "42:benchmark")
+os.environ.setdefault("API_URL", "http://localhost:8000/")
+os.environ.setdefault("ACCESS_EXPIRES_IN", "300")
+os.environ.setdefault("REFRESH_EXPIRES_IN", "86400")
+
+from handlers.teacher import CancelChoose, CancelPage, _parse_time, build_consultation_choice_keyboard
+from keyboards.paginated_keyboard import _paginated_rows, build_paginated_keyboard
+from keyboards.task_keyboard import (_reminders_choice_rows, _reminders_rows, build_reminders_choice_keyboard,
+                                     build_reminders_keyboard)
+from models.consultation import Consultation
+from models.task import Task
+from models.user import Profile, Teacher
+from services.profile import TSUProfile
+from utils.consultations_utils import (
+    _format_date_verbose,
+    _format_datetime_verbose,
+    _verbose_date,
+    convert_12_to_24,
+    format_consultation_card,
+    format_date_verbose,
+    format_datetime_verbose
+)
+
+REGRESSION_TOLERANCE = 0.25
+
+TEACHERS_RAW = [
+    {"id": 1000 + i, "first_name": f"Иван{i}", "last_name": f"Преподавателев{i}"} for i in range(10)
+]
+CONSULTATIONS_RAW = [
+    {
+        "id": 5000 + i,
+        "title": f"Консультация по матанализу №{i}",
+        "date": (date(2025, 10, 1) + timedelta(days=i)).isoformat(),
+        "start_time": "10:00:00",
+        "end_time": "11:30:00",
+        "max_students": 15,
+        "is_closed": i % 3 == 0
+    }
+    for i in range(10)
+]
+TASKS_RAW = [
+    {
+        "id": 9000 + i,
+        "title": f"Подготовить отчёт №{i}",
+        "description": "Сводка по консультациям за семестр",
+        "deadline": "2025-12-01T07:30:00Z",
+        "status": "active",
+        "creator": {"id": 1, "telegram_id": 100, "username": "@dean", "first_name": "Мария", "last_name": "Деканова"},
+        "assignee": {"id": 1000 + i, "telegram_id": 2000 + i, "username": f"@t{i}",
+                     "first_name": f"Иван{i}", "last_name": f"Преподавателев{i}"},
+        "reminders": [{"minutes": 15}, {"minutes": 1440}]
+    }
+    for i in range(10)
+]
+PROFILES_RAW = {
+    "student": {"username": "@student", "first_name": "Анна", "last_name": "Студентова", "role": "student",
+                "phone_number": "79001234567", "status": "active", "email": ""},
+    "teacher": {"username": "@teacher", "first_name": "Иван", "last_name": "Петров", "role": "teacher",
+                "phone_number": "+79001234567", "status": "pending", "email": "ivan@tsu.ru"},
+    "dean": {"username": "@dean", "first_name": "Мария", "last_name": "Деканова", "role": "dean",
+             "phone_number": "79001234567", "status": "active", "email": "dean@tsu.ru"}
+}
+TEACHERS_PAGE = [Teacher.from_api(t) for t in TEACHERS_RAW]
+CONSULTATIONS_PAGE = [Consultation.from_api(c) for c in CONSULTATIONS_RAW]
+PROFILES = {role: Profile.from_api(data) for role, data in PROFILES_RAW.items()}
+DEADLINE = datetime(2025, 12, 1, 7, 30, tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _cold(func, *caches):
+    def run(*args):
+        for cache in caches:
+            cache.cache_clear()
+        return func(*args)
+    return run
+
+
+def _schedule_page(cards):
+    return "\n".join(format_consultation_card(c) for c in cards)
+
+
+def _parse_page(model, items):
+    return [model.from_api(item) for item in items]
+
+
+CASES = [
+    ("keyboards", "build_paginated_keyboard[10, warm]",
+     build_paginated_keyboard, TEACHERS_PAGE, 1, 5, "teacher"),
+    ("keyboards", "build_paginated_keyboard[10, cold]",
+     _cold(build_paginated_keyboard, _paginated_rows), TEACHERS_PAGE, 1, 5, "teacher"),
+    ("keyboards", "build_consultation_choice_keyboard[3]",
+     build_consultation_choice_keyboard, CONSULTATIONS_PAGE[:3], 2, 4, CancelChoose, CancelPage),
+    ("keyboards", "build_consultation_choice_keyboard[10]",
+     build_consultation_choice_keyboard, CONSULTATIONS_PAGE, 2, 4, CancelChoose, CancelPage),
+    ("keyboards", "build_reminders_keyboard[warm]", build_reminders_keyboard, "task_reminder", [15, 60]),
+    ("keyboards", "build_reminders_keyboard[cold]",
+     _cold(build_reminders_keyboard, _reminders_rows), "task_reminder", [15, 60]),
+    ("keyboards", "build_reminders_choice_keyboard[cold]",
+     _cold(build_reminders_choice_keyboard, _reminders_choice_rows), "task_reminders", True, "cancel_create_task"),
+
+    ("formatters", "render_profile_text[student]", TSUProfile.render_profile_text, PROFILES["student"]),
+    ("formatters", "render_profile_text[teacher]", TSUProfile.render_profile_text, PROFILES["teacher"], True),
+    ("formatters", "render_profile_text[dean]", TSUProfile.render_profile_text, PROFILES["dean"], False),
+    ("formatters", "format_consultation_card[warm]", format_consultation_card, CONSULTATIONS_PAGE[0]),
+    ("formatters", "format_consultation_card[cold]",
+     _cold(format_consultation_card, _format_date_verbose, _verbose_date), CONSULTATIONS_PAGE[0]),
+    ("formatters", "schedule_page[5 cards]", _schedule_page, CONSULTATIONS_PAGE[:5]),
+    ("formatters", "format_date_verbose[cold]",
+     _cold(format_date_verbose, _format_date_verbose, _verbose_date), "2025-10-16"),
+    ("formatters", "format_datetime_verbose[cold]",
+     _cold(format_datetime_verbose, _format_datetime_verbose, _verbose_date), DEADLINE),
+    ("formatters", "format_datetime_verbose[warm]", format_datetime_verbose, DEADLINE),
+
+    ("parsers", "Teacher.from_api[10]", _parse_page, Teacher, TEACHERS_RAW),
+    ("parsers", "Consultation.from_api[10]", _parse_page, Consultation, CONSULTATIONS_RAW),
+    ("parsers", "Task.from_api[10]", _parse_page, Task, TASKS_RAW),
+    ("parsers", "_parse_time[valid]", _parse_time, "14:30"),
+    ("parsers", "_parse_time[invalid]", _parse_time, "25:99"),
+    ("parsers", "convert_12_to_24[12h]", convert_12_to_24, "02:30 PM"),
+    ("parsers", "convert_12_to_24[24h]", convert_12_to_24, "14:30:00"),
+    ("parsers", "convert_12_to_24[invalid]", convert_12_to_24, "soon"),
+    ("parsers", "callback_pack", lambda: CancelChoose(consultation_id=123456, page=3).pack()),
+    ("parsers", "callback_unpack", CancelChoose.unpack, CancelChoose(consultation_id=123456, page=3).pack()),
+]
+
+
+def measure(func, args, rounds: int, min_time: float) -> dict:
+    timer = timeit.Timer(lambda: func(*args))
+    number, _ = timer.autorange()
+    number = max(int(number * min_time / 0.2), 1)
+    samples = [t / number for t in timer.repeat(repeat=rounds, number=number)]
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "rounds": rounds,
+        "iterations": number
+    }
+
+
+def main(args):
+    results = {}
+    current_group = None
+    header = f"{'name':<46}{'min, µs':>10}{'median, µs':>12}{'mean, µs':>10}{'stddev':>9}{'OPS':>12}"
+    for group, name, func, *call_args in CASES:
+        if args.filter and args.filter not in f"{group}.{name}":
+            continue
+        if group != current_group:
+            current_group = group
+            print(f"\n----- {group} -----\n{header}")
+        stats = measure(func, call_args, args.rounds, args.min_time)
+        results[f"{group}.{name}"] = stats
+        print(f"{name:<46}{stats['min'] * 1e6:>10.2f}{stats['median'] * 1e6:>12.2f}{stats['mean'] * 1e6:>10.2f}"
+              f"{stats['stddev'] * 1e6:>9.2f}{1 / stats['median']:>12,.0f}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "benchmarks": results}, f, indent=2)
+        print(f"\n✅ Результаты сохранены в {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+        regressions = []
+        for key, stats in results.items():
+            old = baseline.get(key)
+            if old and stats["median"] > old["median"] * (1 + REGRESSION_TOLERANCE):
+                regressions.append((key, old["median"], stats["median"]))
+        if regressions:
+            print(f"\n❌ Медиана выросла больше чем на {REGRESSION_TOLERANCE:.0%}:")
+            for key, old, new in regressions:
+                print(f"  {key}: {old * 1e6:.2f} → {new * 1e6:.2f} µs")
+            sys.exit(1)
+        print(f"\n✅ Регрессий больше {REGRESSION_TOLERANCE:.0%} нет")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmarks for keyboard builders, formatters and parsers")
+    parser.add_argument("-k", "--filter", help="run only benchmarks whose 'group.name' contains this substring")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument("--save", help="write results as JSON")
+    parser.add_argument("--compare", help="compare medians with a JSON file written by --save")
+    main(parser.parse_args())
@@ -0,0 +1,244 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.e2e_throughput import (SCRATCH_MARKER, Collector, FakeBotAPI, UpdateFactory, claim_scratch_redis,
+                                      percentile)
+from middlewares.update_recorder import load_recording
+from tests.fake_tsu_api import FakeTSUAPI
+
+_PLACEHOLDER = re.compile(r"\{(id|date|time|email|text:\d+)}")
+
+ID_POOLS = (
+    ("request", "requests"),
+    ("select_teacher", "teachers"),
+    ("assignee", "teachers"),
+    ("task", "tasks"),
+    ("schedule", "teachers"),
+    ("choose_book", "teachers"),
+    ("subscribe", "teachers"),
+    ("teacher_", "teachers")
+)
+TEACHER_PREFIXES = ("teacher_", "tcp:", "tcc:", "tcx:", "tlp:", "tlc:", "tlx:", "confirm_create_consultation")
+DEAN_PREFIXES = ("dean_", "task_", "confirm_create_task")
+REGRESSION_TOLERANCE = 0.2
+
+
+def infer_role(shapes: list[str]) -> str:
+    if any(shape.startswith(DEAN_PREFIXES) for shape in shapes):
+        return "dean"
+    if any(shape.startswith(TEACHER_PREFIXES) for shape in shapes):
+        return "teacher"
+    return "student"
+
+
+class Materializer:
+    def __init__(self, api: FakeTSUAPI, seed: int):
+        self.rng = random.Random(seed)
+        self.pools = {
+            "teachers": [u["id"] for u in api.users.values() if u["role"] == "teacher"],
+            "consultations": list(api.consultations),
+            "tasks": list(api.tasks),
+            "requests": list(api.requests)
+        }
+        self._times: dict[int, int] = {}
+
+    def _id(self, context: str) -> str:
+        pool = next((name for keyword, name in ID_POOLS if keyword in context), "consultations")
+        values = self.pools[pool] or self.pools["consultations"]
+        return str(self.rng.choice(values))
+
+    def _value(self, placeholder: str, context: str, telegram_id: int) -> str:
+        if placeholder == "id":
+            return self._id(context)
+        if placeholder == "date":
+            return (date.today() + timedelta(days=7)).strftime("%d-%m-%Y")
+        if placeholder == "time":
+            n = self._times[telegram_id] = self._times.get(telegram_id, 0) + 1
+            return "10:00" if n % 2 else "11:30"
+        if placeholder == "email":
+            return f"user{telegram_id}@example.com"
+        length = int(placeholder.split(":", 1)[1])
+        return ("Текст " * (length // 6 + 1))[:length]
+
+    def text(self, shape: str, telegram_id: int) -> str:
+        parts, position = [], 0
+        for match in _PLACEHOLDER.finditer(shape):
+            parts.append(shape[position:match.start()])
+            parts.append(self._value(match.group(1), shape[:match.start()], telegram_id))
+            position = match.end()
+        parts.append(shape[position:])
+        return "".join(parts)
+
+    def callback(self, shape: str, telegram_id: int) -> str:
+        return self.text(shape, telegram_id)
+
+
+def summarize(collector: Collector, elapsed: float, calls) -> dict:
+    processed = len(collector.updates) or 1
+    return {
+        "updates": len(collector.updates),
+        "updates_per_second": round(len(collector.updates) / elapsed, 2),
+        "handler_p50_ms": round(percentile(collector.handlers, 0.50), 3),
+        "handler_p95_ms": round(percentile(collector.handlers, 0.95), 3),
+        "handler_p99_ms": round(percentile(collector.handlers, 0.99), 3),
+        "backend_per_update": round(collector.backend / processed, 3),
+        "redis_per_update": round(collector.redis / processed, 3),
+        "telegram_per_update": round(collector.telegram / processed, 3),
+        "errors": collector.errors,
+        "handlers": {
+            name: {"n": len(values), "p95_ms": round(percentile(values, 0.95), 3)}
+            for name, values in collector.per_handler.items()
+        },
+        "endpoints": {f"{method} {endpoint}": count for (method, endpoint), count in calls.items()}
+    }
+
+
+def compare(current: dict, baseline: dict) -> bool:
+    regressed = False
+    print(f"\n{'метрика':<28}{'база':>12}{'сейчас':>12}{'Δ':>9}")
+    for key in ("updates_per_second", "handler_p50_ms", "handler_p95_ms", "handler_p99_ms",
+                "backend_per_update", "redis_per_update", "telegram_per_update"):
+        old, new = baseline.get(key, 0), current.get(key, 0)
+        delta = (new - old) / old if old else 0.0
+        worse = delta < -REGRESSION_TOLERANCE if key == "updates_per_second" else delta > REGRESSION_TOLERANCE
+        if key.endswith("_per_update") and new > old + 0.01:
+            worse = True
+        regressed |= worse
+        print(f"{key:<28}{old:>12}{new:>12}{delta:>+9.0%}{'  ⚠' if worse else ''}")
+
+    old_handlers = baseline.get("handlers", {})
+    slower = []
+    for name, stats in current["handlers"].items():
+        old = old_handlers.get(name)
+        if old and old["p95_ms"] and stats["p95_ms"] > old["p95_ms"] * (1 + REGRESSION_TOLERANCE):
+            slower.append((name, old["p95_ms"], stats["p95_ms"]))
+    if slower:
+        print(f"\n{'handler p95 выросла':<60}{'база':>10}{'сейчас':>10}")
+        for name, old, new in sorted(slower, key=lambda item: item[2] / item[1], reverse=True):
+            print(f"{name:<60}{old:>10}{new:>10}")
+
+    old_endpoints = baseline.get("endpoints", {})
+    for endpoint, count in current["endpoints"].items():
+        if count > old_endpoints.get(endpoint, 0):
+            print(f"⚠ {endpoint}: {old_endpoints.get(endpoint, 0)} → {count} вызовов")
+    return regressed
+
+
+async def replay_user(dp, bot, events: list[tuple[float, dict]], origin: float, speed: float):
+    for offset, update in events:
+        if speed > 0:
+            delay = origin + offset / 1000 / speed - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        try:
+            await dp.feed_raw_update(bot, update)
+        except Exception:
+            pass
+
+
+async def main(args):
+    records = load_recording(args.recording)
+    by_user: dict[int, list[list]] = {}
+    for record in records:
+        by_user.setdefault(record[1], []).append(record)
+    roles = {user: infer_role([r[3] for r in user_records]) for user, user_records in by_user.items()}
+
+    api = FakeTSUAPI(latency=args.latency, jitter=args.jitter, seed=args.seed)
+    seeded = api.seed(
+        teachers=max(sum(r == "teacher" for r in roles.values()), 10),
+        students=max(sum(r == "student" for r in roles.values()), 1),
+        deans=max(sum(r == "dean" for r in roles.values()), 1)
+    )
+    bot_api = FakeBotAPI()
+    os.environ["API_URL"] = await api.start()
+    bot_api_url = await bot_api.start()
+
+    from aiogram import Bot
+    from aiogram.client.session.aiohttp import AiohttpSession
+    from aiogram.client.telegram import TelegramAPIServer
+
+    from bot import create_dispatcher
+    from middlewares.instrumentation import TelegramRequestInstrumentation
+    from services import instrumentation
+    from services.auth import auth, shutdown
+
+    bot = Bot(token=os.environ["BOT_TOKEN"], session=AiohttpSession(api=TelegramAPIServer.from_base(bot_api_url)))
+    bot.session.middleware(TelegramRequestInstrumentation())
+    dp = create_dispatcher()
+
+    await claim_scratch_redis(auth, args.flush_redis)
+
+    materializer = Materializer(api, args.seed)
+    updates = UpdateFactory()
+    available = {role: iter(ids) for role, ids in seeded.items()}
+    timelines = []
+    for user, user_records in by_user.items():
+        telegram_id = next(available[roles[user]])
+        events = []
+        for offset, _, kind, shape in user_records:
+            if kind == "callback_query":
+                events.append((offset, updates.callback(telegram_id, materializer.callback(shape, telegram_id))))
+            elif kind == "message":
+                events.append((offset, updates.message(telegram_id, materializer.text(shape, telegram_id))))
+        timelines.append(events)
+
+    duration = records[-1][0] / 1000 if records else 0
+    print(f"Запись: {len(records)} апдейтов, {len(by_user)} пользователей, {duration:.0f} с исходного времени")
+    print(f"Роли: {', '.join(f'{role} {sum(r == role for r in roles.values())}' for role in seeded)}; "
+          f"скорость: {'максимальная' if args.speed <= 0 else f'x{args.speed:g}'}")
+
+    collector = Collector()
+    instrumentation.add_listener(collector)
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(replay_user(dp, bot, events, started, args.speed) for events in timelines))
+    finally:
+        elapsed = time.perf_counter() - started
+        instrumentation.remove_listener(collector)
+        await shutdown()
+        await bot.session.close()
+        await api.stop()
+        await bot_api.stop()
+
+    summary = summarize(collector, elapsed, api.calls)
+    print(f"\nВремя: {elapsed:.2f} с, апдейтов/с: {summary['updates_per_second']}")
+    print(f"Обработчик, мс: p50 {summary['handler_p50_ms']}, p95 {summary['handler_p95_ms']}, "
+          f"p99 {summary['handler_p99_ms']}")
+    print(f"На апдейт: TSU API {summary['backend_per_update']}, Redis {summary['redis_per_update']}, "
+          f"Bot API {summary['telegram_per_update']}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"✅ База сохранена в {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(summary, baseline):
+            print("\n❌ Есть регрессия относительно базы")
+            sys.exit(1)
+        print("\n✅ Регрессий нет")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded updates against fake backends (needs a local Redis)")
+    parser.add_argument("recording", help="file written by UPDATE_RECORD_FILE (.jsonl or .jsonl.gz)")
+    parser.add_argument("--speed", type=float, default=0.0, help="1 = real time, 10 = ten times faster, 0 = no pauses")
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--baseline", help="compare against a summary saved with --save-baseline")
+    parser.add_argument("--save-baseline")
+    parser.add_argument("--flush-redis", action="store_true",
+                        help=f"wipe REDIS_DB and REDIS_DB + 1 even if they are not marked with {SCRATCH_MARKER}")
+    asyncio.run(main(parser.parse_args()))
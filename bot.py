@@ -1,45 +1,164 @@
 ﻿import asyncio
 import logging
+
+from utils.startup import StartupReport, FirstPollMiddleware
+
+startup = StartupReport()
+
 from aiogram import Bot, Dispatcher
 from aiogram.types import BotCommand
 from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
 
+startup.mark("import aiogram")
+
+import config
 from config import BOT_TOKEN
-from handlers import start, register, logout, home, profile, student, student_and_teacher, teacher, help, dean, tasks_menu
+from middlewares.callback_index import CallbackIndexMiddleware
+from middlewares.instrumentation import (
+    HandlerInstrumentationMiddleware,
+    TelegramRequestInstrumentation,
+    UpdateInstrumentationMiddleware
+)
+from middlewares.load_shedding import LoadSheddingMiddleware
+from middlewares.profiler import ProfilerMiddleware
+from middlewares.update_recorder import UpdateRecorder
 from services.auth import shutdown
+from services.call_budget import CallBudget
+from services.help_content import help_content
+from services.loop_monitor import LoopMonitor
+from services.message_cleanup import message_cleanup
+from services.metrics import metrics
+from services.profiler import profiler
+from services.scheduler import scheduler
+from services.tracing import create_tracer
+from utils import json_codec
+from utils.runtime import bot_session, create_resolver, describe, run
+
+startup.mark("import config and services")
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(name)s: %(message)s')
 
+HANDLER_MODULES = (
+    "admin",
+    "start",
+    "register",
+    "logout",
+    "home",
+    "profile",
+    "tasks_menu",
+    "student",
+    "student_and_teacher",
+    "teacher",
+    "dean",
+    "help"
+)
+
+
+def create_dispatcher(storage=None) -> Dispatcher:
+    dp = Dispatcher(storage=storage or MemoryStorage())
+    for name in HANDLER_MODULES:
+        dp.include_router(startup.import_module(f"handlers.{name}").router)
+    dp.callback_query.outer_middleware(CallbackIndexMiddleware(dp))
+    dp.update.outer_middleware(UpdateInstrumentationMiddleware())
+    dp.message.middleware(HandlerInstrumentationMiddleware())
+    dp.callback_query.middleware(HandlerInstrumentationMiddleware())
+    dp.message.middleware(LoadSheddingMiddleware())
+    dp.callback_query.middleware(LoadSheddingMiddleware())
+    dp.message.middleware(ProfilerMiddleware(profiler))
+    dp.callback_query.middleware(ProfilerMiddleware(profiler))
+    return dp
+
+
+def create_storage():
+    if config.FSM_STORAGE != "redis":
+        return MemoryStorage()
+    password = f":{config.REDIS_PASSWORD}@" if config.DEBUG is False else ""
+    return RedisStorage.from_url(
+        f"redis://{password}{config.REDIS_HOST}:{config.REDIS_PORT}/{config.REDIS_DB + 2}",
+        json_loads=json_codec.loads,
+        json_dumps=json_codec.dumps
+    )
+
+
+async def set_commands(bot: Bot):
+    try:
+        await bot.set_my_commands([
+            BotCommand(command="start", description="Начать"),
+            BotCommand(command="home", description="Главное меню"),
+            BotCommand(command="todos", description="Управление задачами")
+        ])
+    except Exception as e:
+        logging.error(f"Failed to set bot commands: {e}")
+
 
 async def main():
-    bot = Bot(token=BOT_TOKEN)
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
-    dp.include_router(start.router)
-    dp.include_router(register.router)
-    dp.include_router(logout.router)
-    dp.include_router(home.router)
-    dp.include_router(profile.router)
-    dp.include_router(tasks_menu.router)
-    dp.include_router(student.router)
-    dp.include_router(student_and_teacher.router)
-    dp.include_router(teacher.router)
-    dp.include_router(dean.router)
-    dp.include_router(help.router)
-
-    await bot.set_my_commands([
-        BotCommand(command="start", description="Начать"),
-        BotCommand(command="home", description="Главное меню"),
-        BotCommand(command="todos", description="Управление задачами")
-    ])
+    resolver = create_resolver(config.DNS_RESOLVER)
+    bot = Bot(token=BOT_TOKEN, session=bot_session(resolver))
+    logging.info(f"Runtime: {describe(resolver)}")
+    bot.session.middleware(FirstPollMiddleware(startup))
+    bot.session.middleware(TelegramRequestInstrumentation())
+    dp = create_dispatcher(create_storage())
+
+    loop_monitor = None
+    if config.LOOP_MONITOR_INTERVAL > 0:
+        loop_monitor = LoopMonitor(config.LOOP_MONITOR_INTERVAL, config.LOOP_SLOW_THRESHOLD, config.LOOP_DEBUG)
+        await loop_monitor.start()
+
+    recorder = None
+    if config.UPDATE_RECORD_FILE:
+        recorder = UpdateRecorder(config.UPDATE_RECORD_FILE)
+        dp.update.outer_middleware(recorder)
+        await recorder.start()
+
+    if config.METRICS_PORT:
+        metrics.track_storage(dp.storage)
+        await metrics.start(config.METRICS_HOST, config.METRICS_PORT)
+
+    tracer = create_tracer(config.TRACING_SAMPLE_RATE, config.TRACING_FILE, config.TRACING_OTLP_ENDPOINT)
+    if tracer:
+        await tracer.start()
+
+    call_budget = None
+    if config.CALL_BUDGET_ENABLED:
+        call_budget = CallBudget(
+            config.CALL_BUDGET_BACKEND,
+            config.CALL_BUDGET_REDIS,
+            report_interval=config.CALL_BUDGET_REPORT_INTERVAL
+        )
+        await call_budget.start()
+
+    with startup.phase("start background services"):
+        await asyncio.gather(
+            help_content.start(),
+            profiler.start(),
+            scheduler.start(bot),
+            message_cleanup.start(bot)
+        )
+    commands_task = asyncio.create_task(set_commands(bot))
 
     print("Бот запущен...")
 
     try:
         await dp.start_polling(bot)
     finally:
-        asyncio.run(shutdown())
+        commands_task.cancel()
+        await metrics.stop()
+        if tracer:
+            await tracer.stop()
+        if call_budget:
+            await call_budget.stop()
+        if recorder:
+            await recorder.stop()
+        await help_content.stop()
+        await profiler.stop()
+        await scheduler.stop()
+        await message_cleanup.stop()
+        if loop_monitor:
+            await loop_monitor.stop()
+        await shutdown()
+        await dp.storage.close()
         await bot.session.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main(), config.EVENT_LOOP)
\ No newline at end of file
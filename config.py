@@ -18,3 +18,42 @@ REDIS_PASSWORD = os.getenv('REDIS_PASSWORD')
 ACCESS_EXPIRES_IN = int(os.getenv('ACCESS_EXPIRES_IN'))
 REFRESH_EXPIRES_IN = int(os.getenv('REFRESH_EXPIRES_IN'))
 PARSE_MODE = os.getenv('PARSE_MODE', 'HTML')
+
+SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', 4))
+SCHEDULER_POLL_INTERVAL = float(os.getenv('SCHEDULER_POLL_INTERVAL', 1.0))
+TASK_DEFAULT_REMINDER_MINUTES = int(os.getenv('TASK_DEFAULT_REMINDER_MINUTES', 15))
+CONSULTATION_REMINDER_OFFSETS = [
+    int(m) for m in os.getenv('CONSULTATION_REMINDER_OFFSETS', '1440,60').split(',') if m.strip()
+]
+MESSAGE_CLEANUP_TICK = float(os.getenv('MESSAGE_CLEANUP_TICK', 1.0))
+HELP_CONTENT_SYNC = os.getenv('HELP_CONTENT_SYNC', 'True').lower() in ('1', 'true', 'yes')
+HELP_CONTENT_WATCH_INTERVAL = float(os.getenv('HELP_CONTENT_WATCH_INTERVAL', 0))
+METRICS_HOST = os.getenv('METRICS_HOST', '0.0.0.0')
+METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+TRACING_SAMPLE_RATE = float(os.getenv('TRACING_SAMPLE_RATE', 0))
+TRACING_FILE = os.getenv('TRACING_FILE')
+TRACING_OTLP_ENDPOINT = os.getenv('TRACING_OTLP_ENDPOINT')
+CALL_BUDGET_ENABLED = os.getenv('CALL_BUDGET_ENABLED', 'False').lower() in ('1', 'true', 'yes')
+CALL_BUDGET_BACKEND = int(os.getenv('CALL_BUDGET_BACKEND', 3))
+CALL_BUDGET_REDIS = int(os.getenv('CALL_BUDGET_REDIS', 10))
+CALL_BUDGET_REPORT_INTERVAL = float(os.getenv('CALL_BUDGET_REPORT_INTERVAL', 300))
+UPDATE_RECORD_FILE = os.getenv('UPDATE_RECORD_FILE')
+ADMIN_IDS = [int(i) for i in os.getenv('ADMIN_IDS', '').split(',') if i.strip()]
+PROFILER_SAMPLE_RATE = float(os.getenv('PROFILER_SAMPLE_RATE', 0))
+PROFILER_DIR = os.getenv('PROFILER_DIR', 'profiles')
+LOOP_MONITOR_INTERVAL = float(os.getenv('LOOP_MONITOR_INTERVAL', 0.5))
+LOOP_SLOW_THRESHOLD = float(os.getenv('LOOP_SLOW_THRESHOLD', 0.1))
+LOOP_DEBUG = os.getenv('LOOP_DEBUG', 'False').lower() in ('1', 'true', 'yes')
+EVENT_LOOP = os.getenv('EVENT_LOOP', 'auto')
+DNS_RESOLVER = os.getenv('DNS_RESOLVER', 'auto')
+FSM_STORAGE = os.getenv('FSM_STORAGE', 'memory')
+API_CONCURRENCY = {
+    name.strip(): int(limit) for name, limit in (
+        item.split('=', 1) for item in os.getenv(
+            'API_CONCURRENCY', 'booking=8,tasks=8,teachers=8,consultations=8,default=16'
+        ).split(',') if '=' in item
+    )
+}
+API_QUEUE_LIMIT = int(os.getenv('API_QUEUE_LIMIT', 32))
+API_QUEUE_TIMEOUT = float(os.getenv('API_QUEUE_TIMEOUT', 5))
+SCHEDULER_MAX_ATTEMPTS = int(os.getenv('SCHEDULER_MAX_ATTEMPTS', 5))
\ No newline at end of file
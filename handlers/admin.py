@@ -0,0 +1,40 @@
+from aiogram import F, Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+
+import config
+from services.profiler import profiler
+
+router = Router()
+router.message.filter(F.from_user.id.in_(config.ADMIN_IDS))
+
+PROFILER_USAGE = (
+    "/profiler — статус\n"
+    "/profiler on [процент] — включить (по умолчанию 5%)\n"
+    "/profiler off — выключить\n"
+    "/profiler flush — записать профили на диск"
+)
+
+
+@router.message(Command("profiler"))
+async def cmd_profiler(message: Message, command: CommandObject):
+    args = (command.args or "").split()
+    action = args[0].lower() if args else "status"
+
+    if action == "on":
+        try:
+            percent = float(args[1].rstrip("%")) if len(args) > 1 else 5.0
+        except ValueError:
+            await message.answer(PROFILER_USAGE)
+            return
+        profiler.set_rate(percent / 100)
+    elif action == "off":
+        profiler.set_rate(0)
+        await profiler.flush()
+    elif action == "flush":
+        await profiler.flush()
+    elif action != "status":
+        await message.answer(PROFILER_USAGE)
+        return
+
+    await message.answer(profiler.status())
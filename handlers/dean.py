@@ -1,5 +1,4 @@
-﻿import asyncio
-from datetime import datetime, timezone, timedelta
+﻿from datetime import datetime, timezone, timedelta
 
 from aiogram import Router, F
 from aiogram.exceptions import TelegramBadRequest
@@ -7,13 +6,16 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, Message
 
 from keyboards.main_keyboard import show_main_menu
+from keyboards.task_keyboard import build_reminders_choice_keyboard, build_reminders_keyboard
+from services.api_limiter import BackendOverloaded
+from services.pagination import first
 from services.profile import profile
 from services.tasks import tasks_service
 from services.teachers import TSUTeachers
 from states.create_task import CreateTaskFSM
 from states.update_task import UpdateTaskFSM
 from utils.auth_utils import ensure_auth
-from utils.messages import answer_and_delete
+from utils.messages import answer_and_delete, render
 router = Router()
 
 PAGE_SIZE = 5
@@ -30,12 +32,7 @@ async def start_create_task(callback: CallbackQuery, state: FSMContext):
     await state.clear()
     await state.set_state(CreateTaskFSM.waiting_for_title)
 
-    try:
-        await callback.message.delete()
-    except TelegramBadRequest:
-        pass
-
-    await callback.message.answer("Введите название задачи 👇")
+    await render(callback.message, "Введите название задачи 👇")
     await callback.answer()
 
 
@@ -112,8 +109,8 @@ async def show_teacher_selection(message: Message, teachers_data: dict, state: F
 
     keyboard_rows = []
     for teacher in results:
-        teacher_name = f"{teacher.get('first_name', '')} {teacher.get('last_name', '')}".strip()
-        teacher_id = teacher.get('id')
+        teacher_name = teacher.full_name
+        teacher_id = teacher.id
         keyboard_rows.append([
             InlineKeyboardButton(
                 text=teacher_name,
@@ -157,8 +154,8 @@ async def handle_teacher_page_navigation(callback: CallbackQuery, state: FSMCont
 
     keyboard_rows = []
     for teacher in results:
-        teacher_name = f"{teacher.get('first_name', '')} {teacher.get('last_name', '')}".strip()
-        teacher_id = teacher.get('id')
+        teacher_name = teacher.full_name
+        teacher_id = teacher.id
         keyboard_rows.append([
             InlineKeyboardButton(
                 text=teacher_name,
@@ -184,10 +181,7 @@ async def handle_teacher_page_navigation(callback: CallbackQuery, state: FSMCont
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard)
+    await render(callback.message, text, reply_markup=keyboard)
 
     await callback.answer()
 
@@ -197,17 +191,13 @@ async def handle_teacher_selection(callback: CallbackQuery, state: FSMContext):
     teacher_id = int(callback.data.split("_")[-1])
     await state.update_data(assignee_id=teacher_id)
 
-    try:
-        await callback.message.delete()
-    except TelegramBadRequest:
-        pass
-
     await state.set_state(CreateTaskFSM.waiting_for_deadline_date)
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="⏭️ Пропустить", callback_data="task_skip_deadline")]
     ])
-    await callback.message.answer(
+    await render(
+        callback.message,
         "Введите дату дедлайна в формате ДД-ММ-ГГГГ (например, 16-12-2025) 👇",
         reply_markup=keyboard
     )
@@ -306,11 +296,7 @@ async def handle_task_deadline_time(message: Message, state: FSMContext):
     await state.update_data(deadline=deadline_iso)
     await state.set_state(CreateTaskFSM.waiting_for_reminders_choice)
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="✅ Использовать напоминания по умолчанию", callback_data="task_reminders_default")],
-        [InlineKeyboardButton(text="⚙️ Настроить напоминания", callback_data="task_reminders_custom")],
-        [InlineKeyboardButton(text="🔕 Без напоминаний", callback_data="task_reminders_none")]
-    ])
+    keyboard = build_reminders_choice_keyboard("task_reminders")
 
     await message.answer(
         "Выберите настройку напоминаний 👇\n\n"
@@ -347,35 +333,7 @@ async def show_reminders_selection(callback: CallbackQuery, state: FSMContext):
     data = await state.get_data()
     selected_reminders = data.get("selected_reminders", [])
 
-    reminder_options = [
-        (15, "15 минут"),
-        (30, "30 минут"),
-        (60, "1 час"),
-        (1440, "1 день")
-    ]
-
-    keyboard_rows = []
-
-    for minutes, label in reminder_options:
-        is_selected = minutes in selected_reminders
-        button_text = f"{'✅' if is_selected else '⬜'} За {label}"
-        keyboard_rows.append([
-            InlineKeyboardButton(
-                text=button_text,
-                callback_data=f"task_reminder_toggle_{minutes}"
-            )
-        ])
-
-    if selected_reminders:
-        keyboard_rows.append([
-            InlineKeyboardButton(text="✅ Подтвердить выбор", callback_data="task_reminder_confirm")
-        ])
-
-    keyboard_rows.append([
-        InlineKeyboardButton(text="🔙 Назад", callback_data="task_reminder_back")
-    ])
-
-    keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
+    keyboard = build_reminders_keyboard("task_reminder", selected_reminders)
 
     selected_count = len(selected_reminders)
     text = "Выберите время для напоминаний 👇\n\n"
@@ -383,10 +341,7 @@ async def show_reminders_selection(callback: CallbackQuery, state: FSMContext):
         text += f"Выбрано: {selected_count}\n\n"
     text += "Вы можете выбрать несколько вариантов"
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard)
+    await render(callback.message, text, reply_markup=keyboard)
 
 
 @router.callback_query(F.data.regexp(r"^task_reminder_toggle_(\d+)$"), CreateTaskFSM.waiting_for_custom_reminders)
@@ -426,28 +381,16 @@ async def handle_reminder_confirm(callback: CallbackQuery, state: FSMContext):
 async def handle_reminder_back(callback: CallbackQuery, state: FSMContext):
     await state.set_state(CreateTaskFSM.waiting_for_reminders_choice)
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="✅ Использовать напоминания по умолчанию", callback_data="task_reminders_default")],
-        [InlineKeyboardButton(text="⚙️ Настроить напоминания", callback_data="task_reminders_custom")],
-        [InlineKeyboardButton(text="🔕 Без напоминаний", callback_data="task_reminders_none")]
-    ])
+    keyboard = build_reminders_choice_keyboard("task_reminders")
 
-    try:
-        await callback.message.edit_text(
-            "Выберите настройку напоминаний 👇\n\n"
-            "• По умолчанию: за 15 минут до дедлайна\n"
-            "• Настроить: выбрать свои варианты напоминаний\n"
-            "• Без напоминаний: уведомления не будут отправляться",
-            reply_markup=keyboard
-        )
-    except TelegramBadRequest:
-        await callback.message.answer(
-            "Выберите настройку напоминаний 👇\n\n"
-            "• По умолчанию: за 15 минут до дедлайна\n"
-            "• Настроить: выбрать свои варианты напоминаний\n"
-            "• Без напоминаний: уведомления не будут отправляться",
-            reply_markup=keyboard
-        )
+    await render(
+        callback.message,
+        "Выберите настройку напоминаний 👇\n\n"
+        "• По умолчанию: за 15 минут до дедлайна\n"
+        "• Настроить: выбрать свои варианты напоминаний\n"
+        "• Без напоминаний: уведомления не будут отправляться",
+        reply_markup=keyboard
+    )
 
     await callback.answer()
 
@@ -462,12 +405,10 @@ async def show_task_confirmation(callback: CallbackQuery, state: FSMContext):
     reminders = data.get("reminders")
 
     telegram_id = callback.from_user.id
-    teachers_data = await TSUTeachers.get_teachers_page(telegram_id, page=0, page_size=100)
-    teacher_name = "Не найден"
-    for teacher in teachers_data.get("results", []):
-        if teacher.get("id") == assignee_id:
-            teacher_name = f"{teacher.get('first_name', '')} {teacher.get('last_name', '')}".strip()
-            break
+    teacher = await first(
+        TSUTeachers.iter_teachers(telegram_id, page_size=100, prefetch=False), lambda t: t.id == assignee_id
+    )
+    teacher_name = teacher.full_name if teacher else "Не найден"
 
     deadline_text = "Не указан"
     if deadline:
@@ -521,10 +462,7 @@ async def show_task_confirmation(callback: CallbackQuery, state: FSMContext):
 
     await state.set_state(CreateTaskFSM.confirming)
 
-    try:
-        await callback.message.edit_text(summary, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(summary, reply_markup=keyboard)
+    await render(callback.message, summary, reply_markup=keyboard)
 
 
 @router.callback_query(F.data == "cancel_create_task")
@@ -538,7 +476,7 @@ async def cancel_create_task(callback: CallbackQuery, state: FSMContext):
     except TelegramBadRequest:
         pass
 
-    await asyncio.create_task(answer_and_delete(callback.message, "❌ Создание задачи отменено.", delay=5))
+    await answer_and_delete(callback.message, "❌ Создание задачи отменено.", delay=5)
 
     await show_main_menu(callback, role)
     await callback.answer()
@@ -613,18 +551,15 @@ async def show_tasks_page(callback: CallbackQuery, telegram_id: int, page: int):
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")]
         ])
-        try:
-            await callback.message.edit_text(text, reply_markup=keyboard)
-        except TelegramBadRequest:
-            await callback.message.answer(text, reply_markup=keyboard)
+        await render(callback.message, text, reply_markup=keyboard)
         await callback.answer()
         return
 
     text_lines = [f"📋 <b>Список задач — страница {current_page} из {total_pages}</b>"]
 
     for task in results:
-        title = task.get("title", "Без названия")
-        status = task.get("status", "unknown")
+        title = task.title
+        status = task.status
 
         status_text_map = {
             "in progress": "В процессе",
@@ -637,7 +572,7 @@ async def show_tasks_page(callback: CallbackQuery, telegram_id: int, page: int):
         }
         status_text = status_text_map.get(status, status.title() if status != 'unknown' else 'Неизвестно')
 
-        deadline = task.get("deadline")
+        deadline = task.deadline
         if deadline:
             try:
                 dt_utc = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
@@ -682,18 +617,12 @@ async def show_tasks_page(callback: CallbackQuery, telegram_id: int, page: int):
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(
-            "\n".join(text_lines),
-            reply_markup=keyboard,
-            parse_mode="HTML"
-        )
-    except TelegramBadRequest:
-        await callback.message.answer(
-            "\n".join(text_lines),
-            reply_markup=keyboard,
-            parse_mode="HTML"
-        )
+    await render(
+        callback.message,
+        "\n".join(text_lines),
+        reply_markup=keyboard,
+        parse_mode="HTML"
+    )
     await callback.answer()
 
 
@@ -714,7 +643,7 @@ async def show_task_selection_page(callback: CallbackQuery, telegram_id: int, pa
 
     results = tasks_data.get("results", [])
 
-    results = [task for task in results if task.get("status") not in ["deleted", "cancelled", "archived"]]
+    results = [task for task in results if task.is_visible]
 
     current_page = tasks_data.get("current_page", page)
     total_pages = max(tasks_data.get("total_pages", 1), 1)
@@ -728,12 +657,12 @@ async def show_task_selection_page(callback: CallbackQuery, telegram_id: int, pa
     keyboard_rows = []
 
     for task in results:
-        title = task.get("title", "Без названия")
+        title = task.title
 
         keyboard_rows.append([
             InlineKeyboardButton(
                 text=title,
-                callback_data=f"dean_task_detail_{task['id']}_{current_page}"
+                callback_data=f"dean_task_detail_{task.id}_{current_page}"
             )
         ])
 
@@ -757,10 +686,7 @@ async def show_task_selection_page(callback: CallbackQuery, telegram_id: int, pa
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -772,9 +698,9 @@ async def _show_task_detail(callback: CallbackQuery, telegram_id: int, task_id:
         await callback.answer("❌ Не удалось загрузить задачу", show_alert=True)
         return
 
-    title = task.get("title", "Без названия")
-    description = task.get("description", "Нет описания")
-    status = task.get("status", "unknown")
+    title = task.title
+    description = task.description or "Нет описания"
+    status = task.status
     status_text_map = {
         "in progress": "В процессе",
         "active": "В процессе",
@@ -786,7 +712,7 @@ async def _show_task_detail(callback: CallbackQuery, telegram_id: int, task_id:
     }
     status_text = status_text_map.get(status, status.title() if status != 'unknown' else 'Неизвестно')
 
-    deadline = task.get("deadline")
+    deadline = task.deadline
     if deadline:
         try:
             dt_utc = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
@@ -798,17 +724,17 @@ async def _show_task_detail(callback: CallbackQuery, telegram_id: int, task_id:
     else:
         deadline_text = "Не указан"
 
-    creator = task.get("creator")
+    creator = task.creator
     if creator:
-        creator_name = f"{creator.get('first_name', '')} {creator.get('last_name', '')}".strip()
+        creator_name = creator.full_name
     else:
         creator_name = "Не указан"
 
-    assignee = task.get("assignee")
-    assignee_id = assignee.get("id") if assignee else None
-    creator_id = creator.get("id") if creator else None
+    assignee = task.assignee
+    assignee_id = task.assignee_id
+    creator_id = task.creator_id
 
-    user_reminders = task.get("reminders", [])
+    user_reminders = task.reminders or ()
 
     text_lines = [f"<b>{title}</b>"]
 
@@ -820,15 +746,14 @@ async def _show_task_detail(callback: CallbackQuery, telegram_id: int, task_id:
     text_lines.append(f"👤 Автор: {creator_name}")
 
     if assignee_id and assignee_id != creator_id:
-        assignee_name = f"{assignee.get('first_name', '')} {assignee.get('last_name', '')}".strip()
+        assignee_name = assignee.full_name
         text_lines.append(f"👨‍🏫 Назначен: {assignee_name}")
 
     if deadline:
         reminders = user_reminders
         if reminders:
             reminder_texts = []
-            for reminder in reminders:
-                minutes = reminder.get("minutes", 0)
+            for minutes in reminders:
                 if minutes == 15:
                     reminder_texts.append("за 15 минут")
                 elif minutes == 30:
@@ -846,7 +771,7 @@ async def _show_task_detail(callback: CallbackQuery, telegram_id: int, task_id:
     text = "\n".join(text_lines)
 
     user_profile = await profile.get_profile(telegram_id)
-    user_id = user_profile.get("id") if user_profile else None
+    user_id = user_profile.id if user_profile else None
 
     can_edit = (user_id == creator_id) or (user_id == assignee_id and user_id != creator_id)
 
@@ -868,10 +793,7 @@ async def _show_task_detail(callback: CallbackQuery, telegram_id: int, task_id:
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -909,12 +831,17 @@ async def dean_edit_task_menu(callback: CallbackQuery, state: FSMContext):
         return
 
     user_profile = await profile.get_profile(telegram_id)
-    user_id = user_profile.get("id") if user_profile else None
-    creator = task.get("creator")
-    creator_id = creator.get("id") if creator else None
+    user_id = user_profile.id if user_profile else None
+    creator_id = task.creator_id
     is_creator = (user_id == creator_id)
 
-    await state.update_data(task_id=task_id, page=page, task=task, is_creator=is_creator)
+    await state.update_data(
+        task_id=task_id,
+        page=page,
+        is_creator=is_creator,
+        has_description=bool(task.description),
+        has_deadline=bool(task.deadline)
+    )
 
     text = "✏️ <b>Выберите, что вы хотите изменить:</b>"
 
@@ -925,7 +852,7 @@ async def dean_edit_task_menu(callback: CallbackQuery, state: FSMContext):
         [InlineKeyboardButton(text="👨‍🏫 Назначить исполнителя", callback_data="dean_edit_task_assignee")]
     ]
 
-    if task.get("deadline"):
+    if task.deadline:
         keyboard_rows.append([InlineKeyboardButton(text="🔔 Напоминания", callback_data="dean_edit_task_reminders")])
 
     keyboard_rows.append([
@@ -935,10 +862,7 @@ async def dean_edit_task_menu(callback: CallbackQuery, state: FSMContext):
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -961,10 +885,7 @@ async def dean_edit_task_title_start(callback: CallbackQuery, state: FSMContext)
         [InlineKeyboardButton(text="❌ Отмена", callback_data="dean_cancel_edit_task")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1012,7 +933,6 @@ async def dean_edit_task_description_start(callback: CallbackQuery, state: FSMCo
         return
 
     data = await state.get_data()
-    task = data.get("task")
 
     await state.set_state(UpdateTaskFSM.waiting_for_description)
 
@@ -1020,17 +940,14 @@ async def dean_edit_task_description_start(callback: CallbackQuery, state: FSMCo
 
     keyboard_rows = []
 
-    if task and task.get("description"):
+    if data.get("has_description"):
         keyboard_rows.append([InlineKeyboardButton(text="🗑️ Убрать описание", callback_data="dean_remove_description")])
 
     keyboard_rows.append([InlineKeyboardButton(text="❌ Отмена", callback_data="dean_cancel_edit_task")])
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1098,10 +1015,7 @@ async def dean_remove_description(callback: CallbackQuery, state: FSMContext):
         [InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -1119,7 +1033,6 @@ async def dean_edit_task_deadline_start(callback: CallbackQuery, state: FSMConte
 
     data = await state.get_data()
     is_creator = data.get("is_creator", False)
-    task = data.get("task")
 
     if not is_creator:
         await callback.answer("❌ Только создатель может редактировать дедлайн задачи.", show_alert=True)
@@ -1131,17 +1044,14 @@ async def dean_edit_task_deadline_start(callback: CallbackQuery, state: FSMConte
 
     keyboard_rows = []
 
-    if task and task.get("deadline"):
+    if data.get("has_deadline"):
         keyboard_rows.append([InlineKeyboardButton(text="🗑️ Отменить дедлайн", callback_data="dean_remove_deadline")])
 
     keyboard_rows.append([InlineKeyboardButton(text="❌ Отмена", callback_data="dean_cancel_edit_task")])
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1260,6 +1170,8 @@ async def dean_edit_task_deadline_time_process(message: Message, state: FSMConte
         await message.answer("❗ Ошибка при обработке даты и времени. Попробуйте снова.", reply_markup=keyboard)
         await state.clear()
         return
+    except BackendOverloaded:
+        raise
     except Exception as e:
         text = f"❌ Произошла ошибка: {str(e)}"
 
@@ -1306,10 +1218,7 @@ async def dean_remove_deadline(callback: CallbackQuery, state: FSMContext):
         [InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -1345,10 +1254,8 @@ async def dean_show_assignee_selection_page(callback: CallbackQuery, state: FSMC
     keyboard_rows = []
 
     for teacher in results:
-        first_name = teacher.get("first_name", "")
-        last_name = teacher.get("last_name", "")
-        teacher_id = teacher.get("id")
-        full_name = f"{first_name} {last_name}".strip()
+        teacher_id = teacher.id
+        full_name = teacher.full_name
 
         keyboard_rows.append([
             InlineKeyboardButton(
@@ -1375,10 +1282,7 @@ async def dean_show_assignee_selection_page(callback: CallbackQuery, state: FSMC
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1418,10 +1322,11 @@ async def dean_update_assignee_process(callback: CallbackQuery, state: FSMContex
     result = await tasks_service.update_task(telegram_id, task_id, assignee_id=assignee_id)
 
     if result:
-        teachers_data = await TSUTeachers.get_teachers_page(telegram_id, page=0, page_size=100)
-        teacher = next((t for t in teachers_data.get("results", []) if t.get("id") == assignee_id), None)
+        teacher = await first(
+            TSUTeachers.iter_teachers(telegram_id, page_size=100, prefetch=False), lambda t: t.id == assignee_id
+        )
         if teacher:
-            teacher_name = f"{teacher.get('first_name', '')} {teacher.get('last_name', '')}".strip()
+            teacher_name = teacher.full_name
             text = f"✅ Исполнитель успешно изменен на: <b>{teacher_name}</b>"
         else:
             text = "✅ Исполнитель успешно изменен"
@@ -1433,10 +1338,7 @@ async def dean_update_assignee_process(callback: CallbackQuery, state: FSMContex
         [InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -1456,16 +1358,9 @@ async def dean_edit_task_reminders_start(callback: CallbackQuery, state: FSMCont
            "• Настроить: выбрать свои варианты напоминаний\n" \
            "• Без напоминаний: уведомления не будут отправляться"
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="⚙️ Настроить напоминания", callback_data="dean_reminder_custom")],
-        [InlineKeyboardButton(text="🔕 Без напоминаний", callback_data="dean_reminder_none")],
-        [InlineKeyboardButton(text="❌ Отмена", callback_data="dean_cancel_edit_task")]
-    ])
+    keyboard = build_reminders_choice_keyboard("dean_reminder", with_default=False, cancel_callback="dean_cancel_edit_task")
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1494,10 +1389,7 @@ async def dean_edit_task_reminders_none(callback: CallbackQuery, state: FSMConte
         [InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -1521,35 +1413,7 @@ async def dean_show_reminders_selection(callback: CallbackQuery, state: FSMConte
     data = await state.get_data()
     selected_reminders = data.get("selected_reminders", [])
 
-    reminder_options = [
-        (15, "15 минут"),
-        (30, "30 минут"),
-        (60, "1 час"),
-        (1440, "1 день")
-    ]
-
-    keyboard_rows = []
-
-    for minutes, label in reminder_options:
-        is_selected = minutes in selected_reminders
-        button_text = f"{'✅' if is_selected else '⬜'} За {label}"
-        keyboard_rows.append([
-            InlineKeyboardButton(
-                text=button_text,
-                callback_data=f"dean_reminder_toggle_{minutes}"
-            )
-        ])
-
-    if selected_reminders:
-        keyboard_rows.append([
-            InlineKeyboardButton(text="✅ Подтвердить выбор", callback_data="dean_reminder_confirm")
-        ])
-
-    keyboard_rows.append([
-        InlineKeyboardButton(text="🔙 Назад", callback_data="dean_reminder_back")
-    ])
-
-    keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
+    keyboard = build_reminders_keyboard("dean_reminder", selected_reminders)
 
     selected_count = len(selected_reminders)
     text = "Выберите время для напоминаний 👇\n\n"
@@ -1557,10 +1421,7 @@ async def dean_show_reminders_selection(callback: CallbackQuery, state: FSMConte
         text += f"Выбрано: {selected_count}\n\n"
     text += "Вы можете выбрать несколько вариантов"
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard)
+    await render(callback.message, text, reply_markup=keyboard)
 
 
 @router.callback_query(F.data.regexp(r"^dean_reminder_toggle_(\d+)$"), UpdateTaskFSM.waiting_for_custom_reminders)
@@ -1619,10 +1480,7 @@ async def dean_handle_reminder_confirm(callback: CallbackQuery, state: FSMContex
         [InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -1642,16 +1500,9 @@ async def dean_handle_reminder_back(callback: CallbackQuery, state: FSMContext):
            "• Настроить: выбрать свои варианты напоминаний\n" \
            "• Без напоминаний: уведомления не будут отправляться"
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="⚙️ Настроить напоминания", callback_data="dean_reminder_custom")],
-        [InlineKeyboardButton(text="🔕 Без напоминаний", callback_data="dean_reminder_none")],
-        [InlineKeyboardButton(text="❌ Отмена", callback_data="dean_cancel_edit_task")]
-    ])
+    keyboard = build_reminders_choice_keyboard("dean_reminder", with_default=False, cancel_callback="dean_cancel_edit_task")
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1677,10 +1528,7 @@ async def dean_cancel_edit_task(callback: CallbackQuery, state: FSMContext):
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")]
         ])
-        try:
-            await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-        except TelegramBadRequest:
-            await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+        await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
         await callback.answer()
 
 
@@ -1711,7 +1559,7 @@ async def dean_show_task_deletion_page(callback: CallbackQuery, telegram_id: int
     tasks_data = await tasks_service.get_tasks(telegram_id, page=page, page_size=PAGE_SIZE)
 
     results = tasks_data.get("results", [])
-    results = [task for task in results if task.get("status") not in ["deleted", "cancelled", "archived"]]
+    results = [task for task in results if task.is_visible]
 
     current_page = tasks_data.get("current_page", page)
     total_pages = max(tasks_data.get("total_pages", 1), 1)
@@ -1721,22 +1569,21 @@ async def dean_show_task_deletion_page(callback: CallbackQuery, telegram_id: int
         return
 
     user_profile = await profile.get_profile(telegram_id)
-    user_id = user_profile.get("id") if user_profile else None
+    user_id = user_profile.id if user_profile else None
 
     text = f"🗑 <b>Выберите задачу для удаления</b>\n\nСтраница {current_page} из {total_pages}"
 
     keyboard_rows = []
 
     for task in results:
-        title = task.get("title", "Без названия")
-        creator = task.get("creator")
-        creator_id = creator.get("id") if creator else None
+        title = task.title
+        creator_id = task.creator_id
 
         if user_id == creator_id:
             keyboard_rows.append([
                 InlineKeyboardButton(
                     text=title,
-                    callback_data=f"dean_delete_task_confirm_{task['id']}_{current_page}"
+                    callback_data=f"dean_delete_task_confirm_{task.id}_{current_page}"
                 )
             ])
 
@@ -1764,10 +1611,7 @@ async def dean_show_task_deletion_page(callback: CallbackQuery, telegram_id: int
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1791,15 +1635,14 @@ async def dean_confirm_task_deletion(callback: CallbackQuery):
         return
 
     user_profile = await profile.get_profile(telegram_id)
-    user_id = user_profile.get("id") if user_profile else None
-    creator = task.get("creator")
-    creator_id = creator.get("id") if creator else None
+    user_id = user_profile.id if user_profile else None
+    creator_id = task.creator_id
 
     if user_id != creator_id:
         await callback.answer("❌ Только создатель может удалить задачу", show_alert=True)
         return
 
-    title = task.get("title", "Без названия")
+    title = task.title
     text = f"⚠️ <b>Подтверждение удаления</b>\n\nВы уверены, что хотите удалить задачу:\n<b>{title}</b>?"
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -1809,10 +1652,7 @@ async def dean_confirm_task_deletion(callback: CallbackQuery):
         ]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1832,9 +1672,8 @@ async def dean_delete_task(callback: CallbackQuery):
     task = await tasks_service.get_task_details(telegram_id, task_id)
     if task:
         user_profile = await profile.get_profile(telegram_id)
-        user_id = user_profile.get("id") if user_profile else None
-        creator = task.get("creator")
-        creator_id = creator.get("id") if creator else None
+        user_id = user_profile.id if user_profile else None
+        creator_id = task.creator_id
 
         if user_id != creator_id:
             await callback.answer("❌ Только создатель может удалить задачу", show_alert=True)
@@ -1852,10 +1691,7 @@ async def dean_delete_task(callback: CallbackQuery):
         [InlineKeyboardButton(text="🏠 В главное меню", callback_data="back_to_main_menu")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -8,6 +8,7 @@ from keyboards.main_keyboard import show_main_menu
 from services.help_content import help_content
 from services.profile import profile
 from utils.auth_utils import ensure_auth
+from utils.messages import render
 
 router = Router()
 logger = logging.getLogger(__name__)
@@ -47,10 +48,7 @@ async def guest_to_main(callback: CallbackQuery):
         ]
     )
 
-    try:
-        await callback.message.edit_text(greeting, reply_markup=kb)
-    except Exception:
-        await callback.message.answer(greeting, reply_markup=kb)
+    await render(callback.message, greeting, reply_markup=kb)
 
     await callback.answer()
 
@@ -74,7 +72,7 @@ async def open_help_menu(callback: CallbackQuery):
         teacher_status = await profile.get_teacher_status(telegram_id)
 
     kb = await make_help_menu(role, teacher_status, origin)
-    await callback.message.edit_text("❓ Справка — выберите раздел:", reply_markup=kb, parse_mode="HTML")
+    await render(callback.message, "❓ Справка — выберите раздел:", reply_markup=kb, parse_mode="HTML")
     await callback.answer()
 
 
@@ -136,10 +134,7 @@ async def help_back_callback(callback: CallbackQuery):
         teacher_status = await profile.get_teacher_status(telegram_id)
 
     kb = await make_help_menu(role, teacher_status, origin)
-    try:
-        await callback.message.edit_text("❓ Справка — выберите раздел:", reply_markup=kb, parse_mode="HTML")
-    except Exception:
-        await callback.message.answer("❓ Справка — выберите раздел:", reply_markup=kb, parse_mode="HTML")
+    await render(callback.message, "❓ Справка — выберите раздел:", reply_markup=kb, parse_mode="HTML")
     await callback.answer()
 
 
@@ -195,16 +190,7 @@ async def help_flow_callback(callback: CallbackQuery):
         raw = await help_content.get_raw()
         content = raw.get("content", {})
 
-        max_steps = 0
-        prefix = f"{scenario}_step_"
-        for k in content.keys():
-            if k.startswith(prefix):
-                try:
-                    n = int(k[len(prefix):])
-                    if n > max_steps:
-                        max_steps = n
-                except Exception:
-                    continue
+        max_steps = await help_content.get_flow_steps(scenario)
 
         if max_steps == 0:
             text = await help_content.get_section_text(scenario)
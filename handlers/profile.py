@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 from aiogram import Router, F, types
@@ -80,7 +79,7 @@ async def edit_profile_name(message: Message, state: FSMContext):
     else:
         await state.clear()
 
-        error_msg = await message.answer("❌ Не удалось обновить имя. Попробуйте позже.")
+        await answer_and_delete(message, "❌ Не удалось обновить имя. Попробуйте позже.", delay=2)
 
         if origin == "tasks_menu":
             await show_teacher_tasks_menu_message(message)
@@ -88,15 +87,6 @@ async def edit_profile_name(message: Message, state: FSMContext):
             role = await ensure_auth(telegram_id, message)
             await show_main_menu(message, role)
 
-        async def delete_after():
-            await asyncio.sleep(2)
-            try:
-                await error_msg.delete()
-            except:
-                pass
-
-        await asyncio.create_task(delete_after())
-
 
 @router.callback_query(F.data == "resubmit_teacher_request")
 async def resubmit_teacher_request(callback: CallbackQuery):
@@ -353,7 +343,7 @@ async def dean_change_email_start(callback: CallbackQuery, state: FSMContext):
         return
 
     profile_data = await profile.get_profile(telegram_id)
-    current_email = profile_data.get("email", "") if profile_data else ""
+    current_email = profile_data.email if profile_data else ""
 
     if current_email and not current_email.endswith("@telegram.local"):
         email_text = f"\n\nТекущий email: <code>{current_email}</code>"
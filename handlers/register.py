@@ -16,6 +16,7 @@ from aiogram.types import (
 )
 
 from keyboards.main_keyboard import show_main_menu
+from services.api_limiter import BackendOverloaded
 from services.auth import auth
 from states.register_state import RegisterState
 from utils.messages import edit_step
@@ -363,6 +364,8 @@ async def complete_registration_with_credentials(message: Message, state: FSMCon
         await message.answer("❌ Некорректный ответ от сервера.")
     except ValueError as e:
         await message.answer(f"❌ {str(e)}")
+    except BackendOverloaded:
+        raise
     except Exception as e:
         logger.error(f"Registration error: {e}")
         await message.answer("❌ Ошибка при регистрации. Попробуйте позже.")
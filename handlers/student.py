@@ -1,8 +1,4 @@
-﻿import asyncio
-import logging
-
-from aiogram import Router, F
-from aiogram.exceptions import TelegramBadRequest
+﻿from aiogram import Router, F
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, Message
 
@@ -14,7 +10,8 @@ from services.teachers import teachers
 from states.book_consultation import BookConsultation
 from states.create_request import CreateRequestFSM
 from utils.auth_utils import ensure_auth
-from utils.consultations_utils import format_time, format_date_verbose
+from utils.consultations_utils import format_consultation_card, format_date_verbose
+from utils.messages import answer_and_delete
 
 router = Router()
 PAGE_SIZE = 3
@@ -111,13 +108,23 @@ async def choose_consultation(callback: CallbackQuery, state: FSMContext):
 
     page_data = await teachers.get_teacher_schedule(telegram_id, teacher_id, page=page, page_size=PAGE_SIZE)
 
-    open_consultations = [c for c in page_data["results"] if not c["is_closed"]]
+    open_consultations = [c for c in page_data["results"] if not c.is_closed]
     if not open_consultations:
         await callback.answer("❌ На этой странице нет открытых консультаций.", show_alert=True)
         return
 
+    await state.update_data(consultations_info={
+        str(c.id): {
+            "title": c.title,
+            "date": c.date,
+            "start_time": c.start_time,
+            "end_time": c.end_time
+        }
+        for c in open_consultations
+    })
+
     keyboard_rows = [
-        [InlineKeyboardButton(text=f"{c['title']} ({c['date']})", callback_data=f"book_{c['id']}")]
+        [InlineKeyboardButton(text=f"{c.title} ({c.date})", callback_data=f"book_{c.id}")]
         for c in open_consultations
     ]
     keyboard_rows.append([InlineKeyboardButton(text="⬅️ Назад", callback_data=f"schedule_{teacher_id}_{page}")])
@@ -166,13 +173,14 @@ async def handle_consultation_request(message: Message, state: FSMContext):
     consultation_id = user_data.get("consultation_id")
     teacher_id = user_data.get("teacher_id")
     current_page = user_data.get("current_page", 1)
+    consultation_info = user_data.get("consultations_info", {}).get(str(consultation_id))
 
     if not message.text or not message.text.strip():
         await message.answer("❗ Пожалуйста, введите текст запроса.")
         return
 
     request_text = message.text.strip()
-    result = await consultations.book_consultation(telegram_id, consultation_id, request_text)
+    result = await consultations.book_consultation(telegram_id, consultation_id, request_text, consultation_info)
 
     if result == "success":
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -183,15 +191,8 @@ async def handle_consultation_request(message: Message, state: FSMContext):
             reply_markup=keyboard
         )
     elif result == "conflict":
-        warning_msg = await message.answer("⚠️ Вы уже записаны на эту консультацию.")
+        await answer_and_delete(message, "⚠️ Вы уже записаны на эту консультацию.", delay=10)
         await show_main_menu(message, role)
-        await asyncio.sleep(10)
-        try:
-            await warning_msg.delete()
-        except TelegramBadRequest:
-            pass
-        except Exception as e:
-            logging.warning(f"Unable to delete message {warning_msg}: {e}")
     else:
         await message.answer("❌ Не удалось записаться. Попробуйте позже.")
 
@@ -213,7 +214,7 @@ async def choose_consultation_to_cancel(callback: CallbackQuery):
         await callback.answer("❌ У вас нет записей для отмены.", show_alert=True)
         return
 
-    cancellable_consultations = [c for c in consultations_page["results"] if c["status"] == "active"]
+    cancellable_consultations = [c for c in consultations_page["results"] if c.status == "active"]
 
     if not cancellable_consultations:
         await callback.answer("❌ Нет доступных для отмены консультаций на этой странице.", show_alert=True)
@@ -221,8 +222,8 @@ async def choose_consultation_to_cancel(callback: CallbackQuery):
 
     keyboard_rows = [
         [InlineKeyboardButton(
-            text=f"{c['title']} ({format_date_verbose(c['date'])})",
-            callback_data=f"cancel_booking_{c['id']}"
+            text=f"{c.title} ({format_date_verbose(c.date)})",
+            callback_data=f"cancel_booking_{c.id}"
         )]
         for c in cancellable_consultations
     ]
@@ -318,7 +319,7 @@ async def handle_auto_subscribe_choice(callback: CallbackQuery, state: FSMContex
     ])
 
     if request_data:
-        request_id = request_data["id"]
+        request_id = request_data.id
         if auto_subscribe:
             await consultations.subscribe_request(telegram_id, request_id)
 
@@ -339,7 +340,7 @@ async def handle_auto_subscribe_choice(callback: CallbackQuery, state: FSMContex
 async def show_schedule_page(callback: CallbackQuery, telegram_id: int, teacher_id: int, page: int):
     page_data = await teachers.get_teacher_schedule(telegram_id, teacher_id, page=page, page_size=PAGE_SIZE)
     subscribed_teachers = await teachers.get_subscribed_teachers(telegram_id)
-    is_subscribed = any(t["id"] == teacher_id for t in subscribed_teachers)
+    is_subscribed = any(t.id == teacher_id for t in subscribed_teachers)
 
     if not page_data["results"]:
         text = (
@@ -367,7 +368,7 @@ async def show_schedule_page(callback: CallbackQuery, telegram_id: int, teacher_
         await callback.answer()
         return
 
-    teacher_name = page_data["results"][0].get("teacher_name", "Преподаватель")
+    teacher_name = page_data["results"][0].teacher_name or "Преподаватель"
 
     text_lines = [
         f"👨‍🏫 <b>Расписание консультаций — {teacher_name}</b>\n",
@@ -376,19 +377,8 @@ async def show_schedule_page(callback: CallbackQuery, telegram_id: int, teacher_
 
     open_consultations = []
     for c in page_data["results"]:
-        status_emoji = "✅" if not c["is_closed"] else "🔒"
-        start_time = format_time(c["start_time"])
-        end_time = format_time(c["end_time"])
-        formatted_date = format_date_verbose(c["date"])
-
-        text_lines.append(
-            f"\n<b>{status_emoji} {c['title']}</b>\n"
-            f"📅 {formatted_date}\n"
-            f"🕒 {start_time} – {end_time}\n"
-            f"👥 Мест: {c['max_students']}\n"
-            f"📌 Статус: {'Открыта' if not c['is_closed'] else 'Закрыта'}"
-        )
-        if not c["is_closed"]:
+        text_lines.append(format_consultation_card(c))
+        if not c.is_closed:
             open_consultations.append(c)
 
     current_page = page_data["current_page"]
@@ -454,8 +444,9 @@ async def edit_teachers_page(callback: CallbackQuery, page: int):
         callback_prefix="teacher"
     )
 
-    keyboard.inline_keyboard.append([
-        InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        *keyboard.inline_keyboard,
+        [InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")]
     ])
 
     await callback.message.edit_text(
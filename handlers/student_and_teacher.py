@@ -3,6 +3,7 @@ from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardBut
 from aiogram.fsm.context import FSMContext
 
 from keyboards.main_keyboard import show_main_menu
+from models.user import Person
 from services.consultations import consultations
 from utils.auth_utils import ensure_auth
 from utils.consultations_utils import format_time, format_date_verbose, format_datetime_verbose
@@ -54,20 +55,20 @@ async def view_my_consultations(callback: CallbackQuery):
     cancellable_consultations_exist = False
 
     for c in consultations_page["results"]:
-        start_time = format_time(c["start_time"])
-        end_time = format_time(c["end_time"])
-        formatted_date = format_date_verbose(c["date"])
+        start_time = format_time(c.start_time)
+        end_time = format_time(c.end_time)
+        formatted_date = format_date_verbose(c.date)
 
-        if role == "student" and c["status"] == "active":
+        if role == "student" and c.status == "active":
             cancellable_consultations_exist = True
 
         text_lines.append(
-            f"\n<b>{c['title']}</b>\n"
+            f"\n<b>{c.title}</b>\n"
             f"📅 {formatted_date}\n"
             f"🕒 {start_time} – {end_time}\n"
-            f"👨‍🏫 {c.get('teacher_name', '—')}\n"
-            f"👥 Мест: {c.get('max_students', '—')}\n"
-            f"📌 Статус: {'Закрыта' if c['is_closed'] else 'Открыта'}"
+            f"👨‍🏫 {c.teacher_name or '—'}\n"
+            f"👥 Мест: {c.max_students}\n"
+            f"📌 Статус: {'Закрыта' if c.is_closed else 'Открыта'}"
         )
 
     keyboard_rows = []
@@ -150,12 +151,12 @@ async def choose_request_to_subscribe(callback: CallbackQuery):
 
     keyboard_rows = []
     for r in requests_page["results"]:
-        title = r.get("title", "Без названия")
-        status = STATUS_RU.get(r.get("status"), r.get("status", "—"))
+        title = r.title
+        status = STATUS_RU.get(r.status, r.status or "—")
         keyboard_rows.append([
             InlineKeyboardButton(
                 text=f"{title} — {status}",
-                callback_data=f"subscribe_request_{r['id']}_{page}"
+                callback_data=f"subscribe_request_{r.id}_{page}"
             )
         ])
 
@@ -210,12 +211,12 @@ async def choose_request_to_unsubscribe(callback: CallbackQuery):
 
     keyboard_rows = []
     for r in requests_page["results"]:
-        title = r.get("title", "Без названия")
-        status = STATUS_RU.get(r.get("status"), r.get("status", "—"))
+        title = r.title
+        status = STATUS_RU.get(r.status, r.status or "—")
         keyboard_rows.append([
             InlineKeyboardButton(
                 text=f"{title} — {status}",
-                callback_data=f"unsubscribe_request_{r['id']}_{page}"
+                callback_data=f"unsubscribe_request_{r.id}_{page}"
             )
         ])
 
@@ -272,15 +273,14 @@ async def show_requests_page(callback: CallbackQuery, telegram_id: int, role: st
     text_lines = [f"📄 <b>Запросы на консультацию — страница {current_page} из {total_pages}</b>"]
 
     for r in requests_page["results"]:
-        student = r.get("student") or {}
-        student_name = f"{student.get('first_name', '')} {student.get('last_name', '')}".strip()
-        created_at = format_datetime_verbose(r.get("created_at"))
-        status_ru = STATUS_RU.get(r.get("status"), r.get("status", "—"))
+        student = r.student or Person()
+        created_at = format_datetime_verbose(r.created_at)
+        status_ru = STATUS_RU.get(r.status, r.status or "—")
 
         text_lines.append(
-            f"\n<b>{r['title']}</b>\n"
-            f"{r['description']}\n"
-            f"👤 Студент: {student_name} ({student.get('username', '—')})\n"
+            f"\n<b>{r.title}</b>\n"
+            f"{r.description}\n"
+            f"👤 Студент: {student.full_name} ({student.username or '—'})\n"
             f"📅 Создан: {created_at}\n"
             f"📌 Статус: {status_ru}"
         )
@@ -340,12 +340,12 @@ async def choose_request_to_create(callback: CallbackQuery):
 
     keyboard_rows = []
     for r in requests_page["results"]:
-        title = r.get("title", "Без названия")
-        status = STATUS_RU.get(r.get("status"), r.get("status", "—"))
+        title = r.title
+        status = STATUS_RU.get(r.status, r.status or "—")
         keyboard_rows.append([
             InlineKeyboardButton(
                 text=f"{title} — {status}",
-                callback_data=f"teacher_create_from_request_{r['id']}_{page}"
+                callback_data=f"teacher_create_from_request_{r.id}_{page}"
             )
         ])
 
@@ -378,9 +378,9 @@ async def create_consultation_from_request(callback: CallbackQuery, state: FSMCo
     request_status = None
     if requests_page and requests_page.get("results"):
         for r in requests_page["results"]:
-            if r.get("id") == request_id:
-                request_title = r.get("title")
-                request_status = r.get("status")
+            if r.id == request_id:
+                request_title = r.title
+                request_status = r.status
                 break
 
     if request_status and request_status != "open":
@@ -423,12 +423,11 @@ async def teacher_choose_consultation_for_students(callback: CallbackQuery):
 
     keyboard_rows = []
     for c in consultations_page["results"]:
-        title = c.get("title", "Без названия")
-        date_human = format_date_verbose(c.get("date")) if c.get("date") else "—"
+        date_human = format_date_verbose(c.date) if c.date else "—"
         keyboard_rows.append([
             InlineKeyboardButton(
-                text=f"{title} ({date_human})",
-                callback_data=f"teacher_show_students_{c['id']}_{page}"
+                text=f"{c.title} ({date_human})",
+                callback_data=f"teacher_show_students_{c.id}_{page}"
             )
         ])
 
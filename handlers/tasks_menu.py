@@ -1,10 +1,11 @@
 ﻿from aiogram import Router, F
 from aiogram.filters import Command
-from aiogram.exceptions import TelegramBadRequest
-from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, Message
+from aiogram.types import CallbackQuery, Message
 
+from keyboards.task_keyboard import teacher_tasks_menu
 from utils.auth_utils import ensure_auth
 from services.profile import profile
+from utils.messages import render
 
 router = Router()
 
@@ -19,28 +20,11 @@ async def cmd_todos(message: Message):
         return
 
     user_profile = await profile.get_profile(telegram_id)
-    first_name = user_profile.get("first_name", "") if user_profile else ""
-    last_name = user_profile.get("last_name", "") if user_profile else ""
-    user_name = f"{first_name} {last_name}".strip() or "Пользователь"
+    user_name = (user_profile.full_name if user_profile else "") or "Пользователь"
 
     text =f"👨‍🏫 Добро пожаловать, {user_name}"
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="➕ Создать задачу", callback_data="teacher_create_task"),
-            InlineKeyboardButton(text="🗑 Удалить задачу", callback_data="teacher_delete_task_from_menu")
-        ],
-        [
-            InlineKeyboardButton(text="📋 Мои задачи", callback_data="teacher_view_tasks")
-        ],
-        [
-            InlineKeyboardButton(text="👤 Профиль", callback_data="menu_profile:tasks_menu"),
-            InlineKeyboardButton(text="🚪 Выйти", callback_data="menu_logout")
-        ],
-        [
-            InlineKeyboardButton(text="❓ Справка", callback_data="menu_help:tasks_menu")
-        ]
-    ])
+    keyboard = teacher_tasks_menu
 
     await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
 
@@ -54,33 +38,13 @@ async def show_teacher_tasks_menu(callback: CallbackQuery):
         return
 
     user_profile = await profile.get_profile(telegram_id)
-    first_name = user_profile.get("first_name", "") if user_profile else ""
-    last_name = user_profile.get("last_name", "") if user_profile else ""
-    user_name = f"{first_name} {last_name}".strip() or "Пользователь"
+    user_name = (user_profile.full_name if user_profile else "") or "Пользователь"
 
     text = f"👨‍🏫 Добро пожаловать, {user_name}"
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="➕ Создать задачу", callback_data="teacher_create_task"),
-            InlineKeyboardButton(text="🗑 Удалить задачу", callback_data="teacher_delete_task_from_menu")
-        ],
-        [
-            InlineKeyboardButton(text="📋 Мои задачи", callback_data="teacher_view_tasks")
-        ],
-        [
-            InlineKeyboardButton(text="👤 Профиль", callback_data="menu_profile:tasks_menu"),
-            InlineKeyboardButton(text="🚪 Выйти", callback_data="menu_logout")
-        ],
-        [
-            InlineKeyboardButton(text="❓ Справка", callback_data="menu_help:tasks_menu")
-        ]
-    ])
-
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    keyboard = teacher_tasks_menu
+
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -93,27 +57,10 @@ async def show_teacher_tasks_menu_message(message: Message):
         return
 
     user_profile = await profile.get_profile(telegram_id)
-    first_name = user_profile.get("first_name", "") if user_profile else ""
-    last_name = user_profile.get("last_name", "") if user_profile else ""
-    user_name = f"{first_name} {last_name}".strip() or "Пользователь"
+    user_name = (user_profile.full_name if user_profile else "") or "Пользователь"
 
     text = f"👨‍🏫 Добро пожаловать, {user_name}"
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [
-            InlineKeyboardButton(text="➕ Создать задачу", callback_data="teacher_create_task"),
-            InlineKeyboardButton(text="🗑 Удалить задачу", callback_data="teacher_delete_task_from_menu")
-        ],
-        [
-            InlineKeyboardButton(text="📋 Мои задачи", callback_data="teacher_view_tasks")
-        ],
-        [
-            InlineKeyboardButton(text="👤 Профиль", callback_data="menu_profile:tasks_menu"),
-            InlineKeyboardButton(text="🚪 Выйти", callback_data="menu_logout")
-        ],
-        [
-            InlineKeyboardButton(text="❓ Справка", callback_data="menu_help:tasks_menu")
-        ]
-    ])
+    keyboard = teacher_tasks_menu
 
     await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
@@ -3,12 +3,15 @@ from datetime import datetime, timezone, timedelta
 
 from aiogram import Router, F
 from aiogram.exceptions import TelegramBadRequest
+from aiogram.filters.callback_data import CallbackData
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton, Message
 
 from handlers.student_and_teacher import show_requests_page
 from handlers.tasks_menu import show_teacher_tasks_menu
 from keyboards.main_keyboard import show_main_menu
+from keyboards.task_keyboard import build_reminders_choice_keyboard, build_reminders_keyboard, teacher_task_status_keyboard
+from models.consultation import Consultation
 from services.consultations import consultations
 from services.profile import profile
 from services.tasks import tasks_service
@@ -17,32 +20,49 @@ from states.create_task import CreateTeacherTaskFSM
 from states.update_task import UpdateTaskFSM
 from utils.auth_utils import ensure_auth
 from utils.consultations_utils import format_date_verbose
-from utils.messages import answer_and_delete
+from utils.messages import answer_and_delete, render
 router = Router()
 
 PAGE_SIZE = 3
 
 
-async def show_cancel_page(callback: CallbackQuery, telegram_id: int, page: int):
-    page_data = await consultations.get_consultations(telegram_id, page=page, page_size=PAGE_SIZE)
-    results = page_data.get("results", [])
-    current_page = page_data.get("current_page", page)
-    total_pages = max(page_data.get("total_pages", 1), 1)
+class CancelPage(CallbackData, prefix="tcp"):
+    page: int
 
-    if not results:
-        text = "Сейчас у вас нет активных консультаций, которые можно отменить."
-    else:
-        text = f"Выберите консультацию, которую хотите отменить 👇\n\nСтраница {current_page} из {total_pages}"
 
+class CancelChoose(CallbackData, prefix="tcc"):
+    consultation_id: int
+    page: int
+
+
+class CancelConfirm(CallbackData, prefix="tcx"):
+    consultation_id: int
+    page: int
+
+
+class ClosePage(CallbackData, prefix="tlp"):
+    page: int
+
+
+class CloseChoose(CallbackData, prefix="tlc"):
+    consultation_id: int
+    page: int
+
+
+class CloseConfirm(CallbackData, prefix="tlx"):
+    consultation_id: int
+    page: int
+
+
+def build_consultation_choice_keyboard(results: list[Consultation], current_page: int, total_pages: int,
+                                       choose: type[CallbackData], paginate: type[CallbackData]) -> InlineKeyboardMarkup:
     keyboard_rows: list[list[InlineKeyboardButton]] = []
     for c in results:
-        title = c.get("title", "Без названия")
-        date_iso = c.get("date")
-        date_human = format_date_verbose(date_iso) if date_iso else "—"
+        date_human = format_date_verbose(c.date) if c.date else "—"
         keyboard_rows.append([
             InlineKeyboardButton(
-                text=f"{title} ({date_human})",
-                callback_data=f"teacher_choose_cancel_{c['id']}_{current_page}"
+                text=f"{c.title} ({date_human})",
+                callback_data=choose(consultation_id=c.id, page=current_page).pack()
             )
         ])
 
@@ -50,24 +70,35 @@ async def show_cancel_page(callback: CallbackQuery, telegram_id: int, page: int)
     if results and current_page > 1:
         nav_row.append(InlineKeyboardButton(
             text="⬅️ Назад",
-            callback_data=f"teacher_cancel_consultation_{current_page - 1}"
+            callback_data=paginate(page=current_page - 1).pack()
         ))
     if results and current_page < total_pages:
         nav_row.append(InlineKeyboardButton(
             text="➡️ Вперёд",
-            callback_data=f"teacher_cancel_consultation_{current_page + 1}"
+            callback_data=paginate(page=current_page + 1).pack()
         ))
     if nav_row:
         keyboard_rows.append(nav_row)
 
     keyboard_rows.append([InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")])
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
+    return InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard)
+
+async def show_cancel_page(callback: CallbackQuery, telegram_id: int, page: int):
+    page_data = await consultations.get_consultations(telegram_id, page=page, page_size=PAGE_SIZE)
+    results = page_data.get("results", [])
+    current_page = page_data.get("current_page", page)
+    total_pages = max(page_data.get("total_pages", 1), 1)
+
+    if not results:
+        text = "Сейчас у вас нет активных консультаций, которые можно отменить."
+    else:
+        text = f"Выберите консультацию, которую хотите отменить 👇\n\nСтраница {current_page} из {total_pages}"
+
+    keyboard = build_consultation_choice_keyboard(results, current_page, total_pages, CancelChoose, CancelPage)
+
+    await render(callback.message, text, reply_markup=keyboard)
 
 
 @router.callback_query(F.data == "teacher_cancel_consultation")
@@ -82,69 +113,55 @@ async def teacher_start_cancel_consultation(callback: CallbackQuery):
     await callback.answer()
 
 
-@router.callback_query(F.data.regexp(r"^teacher_cancel_consultation_(\d+)$"))
-async def teacher_cancel_consultation_paginate(callback: CallbackQuery):
+@router.callback_query(CancelPage.filter())
+async def teacher_cancel_consultation_paginate(callback: CallbackQuery, callback_data: CancelPage):
     telegram_id = callback.from_user.id
     role = await ensure_auth(telegram_id, callback)
     if role != "teacher":
         await callback.answer("Доступно только для преподавателей.", show_alert=True)
         return
 
-    page = int(callback.data.split("_")[-1])
-    await show_cancel_page(callback, telegram_id, page=page)
+    await show_cancel_page(callback, telegram_id, page=callback_data.page)
     await callback.answer()
 
 
-@router.callback_query(F.data.regexp(r"^teacher_choose_cancel_(\d+)_(\d+)$"))
-async def teacher_choose_cancel(callback: CallbackQuery):
+@router.callback_query(CancelChoose.filter())
+async def teacher_choose_cancel(callback: CallbackQuery, callback_data: CancelChoose):
     telegram_id = callback.from_user.id
     role = await ensure_auth(telegram_id, callback)
     if role != "teacher":
         await callback.answer("Доступно только для преподавателей.", show_alert=True)
         return
 
-    parts = callback.data.split("_")
-    consultation_id = int(parts[-2])
-    page = int(parts[-1])
-
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="✅ Подтвердить отмену", callback_data=f"teacher_confirm_cancel_{consultation_id}_{page}")],
-        [InlineKeyboardButton(text="⬅️ Назад", callback_data=f"teacher_cancel_consultation_{page}")]
+        [InlineKeyboardButton(text="✅ Подтвердить отмену", callback_data=CancelConfirm(**callback_data.model_dump()).pack())],
+        [InlineKeyboardButton(text="⬅️ Назад", callback_data=CancelPage(page=callback_data.page).pack())]
     ])
 
-    try:
-        await callback.message.edit_text(
-            "Вы уверены, что хотите отменить эту консультацию?",
-            reply_markup=keyboard
-        )
-    except TelegramBadRequest:
-        await callback.message.answer(
-            "Вы уверены, что хотите отменить эту консультацию?",
-            reply_markup=keyboard
-        )
+    await render(
+        callback.message,
+        "Вы уверены, что хотите отменить эту консультацию?",
+        reply_markup=keyboard
+    )
     await callback.answer()
 
 
-@router.callback_query(F.data.regexp(r"^teacher_confirm_cancel_(\d+)_(\d+)$"))
-async def teacher_confirm_cancel(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(CancelConfirm.filter())
+async def teacher_confirm_cancel(callback: CallbackQuery, state: FSMContext, callback_data: CancelConfirm):
     telegram_id = callback.from_user.id
     role = await ensure_auth(telegram_id, callback)
     if role != "teacher":
         await callback.answer("Доступно только для преподавателей.", show_alert=True)
         return
 
-    parts = callback.data.split("_")
-    consultation_id = int(parts[-2])
-    page = int(parts[-1])
-
-    result = await consultations.cancel_consultation(telegram_id, consultation_id)
+    result = await consultations.cancel_consultation(telegram_id, callback_data.consultation_id)
 
     if result == "success":
         await callback.message.edit_text("✅ Консультация успешно отменена.")
         await show_main_menu(callback, role)
     else:
         await asyncio.sleep(0)
-        await show_cancel_page(callback, telegram_id, page=page)
+        await show_cancel_page(callback, telegram_id, page=callback_data.page)
         await callback.answer("❌ Не удалось отменить консультацию. Возможно, она уже отмененна. Попробуйте позже.", show_alert=True)
         return
 
@@ -163,12 +180,7 @@ async def start_create_consultation(callback: CallbackQuery, state: FSMContext):
     await state.clear()
     await state.set_state(CreateConsultationFSM.waiting_for_title)
 
-    try:
-        await callback.message.delete()
-    except TelegramBadRequest:
-        pass
-
-    await callback.message.answer("Введите тему консультации 👇")
+    await render(callback.message, "Введите тему консультации 👇")
     await callback.answer()
 
 
@@ -286,7 +298,7 @@ async def cancel_create_consultation(callback: CallbackQuery, state: FSMContext)
     except TelegramBadRequest:
         pass
 
-    await asyncio.create_task(answer_and_delete(callback.message, "❌ Создание консультации отменено.", delay=5))
+    await answer_and_delete(callback.message, "❌ Создание консультации отменено.", delay=5)
 
     await show_main_menu(callback, role)
     await callback.answer()
@@ -349,40 +361,9 @@ async def show_close_page(callback: CallbackQuery, telegram_id: int, page: int):
     else:
         text = f"Выберите консультацию, которую хотите закрыть для записи 👇\n\nСтраница {current_page} из {total_pages}"
 
-    keyboard_rows: list[list[InlineKeyboardButton]] = []
-    for c in results:
-        title = c.get("title", "Без названия")
-        date_iso = c.get("date")
-        date_human = format_date_verbose(date_iso) if date_iso else "—"
-        keyboard_rows.append([
-            InlineKeyboardButton(
-                text=f"{title} ({date_human})",
-                callback_data=f"teacher_choose_close_{c['id']}_{current_page}"
-            )
-        ])
+    keyboard = build_consultation_choice_keyboard(results, current_page, total_pages, CloseChoose, ClosePage)
 
-    nav_row = []
-    if results and current_page > 1:
-        nav_row.append(InlineKeyboardButton(
-            text="⬅️ Назад",
-            callback_data=f"teacher_close_consultation_{current_page - 1}"
-        ))
-    if results and current_page < total_pages:
-        nav_row.append(InlineKeyboardButton(
-            text="➡️ Вперёд",
-            callback_data=f"teacher_close_consultation_{current_page + 1}"
-        ))
-    if nav_row:
-        keyboard_rows.append(nav_row)
-
-    keyboard_rows.append([InlineKeyboardButton(text="🔙 В главное меню", callback_data="back_to_main_menu")])
-
-    keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
-
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard)
+    await render(callback.message, text, reply_markup=keyboard)
 
 
 @router.callback_query(F.data == "teacher_close_consultation")
@@ -397,68 +378,54 @@ async def teacher_start_close_consultation(callback: CallbackQuery):
     await callback.answer()
 
 
-@router.callback_query(F.data.regexp(r"^teacher_close_consultation_(\d+)$"))
-async def teacher_close_consultation_paginate(callback: CallbackQuery):
+@router.callback_query(ClosePage.filter())
+async def teacher_close_consultation_paginate(callback: CallbackQuery, callback_data: ClosePage):
     telegram_id = callback.from_user.id
     role = await ensure_auth(telegram_id, callback)
     if role != "teacher":
         await callback.answer("Доступно только для преподавателей.", show_alert=True)
         return
 
-    page = int(callback.data.split("_")[-1])
-    await show_close_page(callback, telegram_id, page=page)
+    await show_close_page(callback, telegram_id, page=callback_data.page)
     await callback.answer()
 
 
-@router.callback_query(F.data.regexp(r"^teacher_choose_close_(\d+)_(\d+)$"))
-async def teacher_choose_close(callback: CallbackQuery):
+@router.callback_query(CloseChoose.filter())
+async def teacher_choose_close(callback: CallbackQuery, callback_data: CloseChoose):
     telegram_id = callback.from_user.id
     role = await ensure_auth(telegram_id, callback)
     if role != "teacher":
         await callback.answer("Доступно только для преподавателей.", show_alert=True)
         return
 
-    parts = callback.data.split("_")
-    consultation_id = int(parts[-2])
-    page = int(parts[-1])
-
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🔒 Подтвердить закрытие", callback_data=f"teacher_confirm_close_{consultation_id}_{page}")],
-        [InlineKeyboardButton(text="⬅️ Назад", callback_data=f"teacher_close_consultation_{page}")],
+        [InlineKeyboardButton(text="🔒 Подтвердить закрытие", callback_data=CloseConfirm(**callback_data.model_dump()).pack())],
+        [InlineKeyboardButton(text="⬅️ Назад", callback_data=ClosePage(page=callback_data.page).pack())],
     ])
 
-    try:
-        await callback.message.edit_text(
-            "Вы уверены, что хотите закрыть запись на эту консультацию?",
-            reply_markup=keyboard
-        )
-    except TelegramBadRequest:
-        await callback.message.answer(
-            "Вы уверены, что хотите закрыть запись на эту консультацию?",
-            reply_markup=keyboard
-        )
+    await render(
+        callback.message,
+        "Вы уверены, что хотите закрыть запись на эту консультацию?",
+        reply_markup=keyboard
+    )
     await callback.answer()
 
 
-@router.callback_query(F.data.regexp(r"^teacher_confirm_close_(\d+)_(\d+)$"))
-async def teacher_confirm_close(callback: CallbackQuery):
+@router.callback_query(CloseConfirm.filter())
+async def teacher_confirm_close(callback: CallbackQuery, callback_data: CloseConfirm):
     telegram_id = callback.from_user.id
     role = await ensure_auth(telegram_id, callback)
     if role != "teacher":
         await callback.answer("Доступно только для преподавателей.", show_alert=True)
         return
 
-    parts = callback.data.split("_")
-    consultation_id = int(parts[-2])
-    page = int(parts[-1])
-
-    result = await consultations.close_consultation(telegram_id, consultation_id)
+    result = await consultations.close_consultation(telegram_id, callback_data.consultation_id)
 
     if result == "success":
         await callback.message.edit_text("🔒 Запись на консультацию закрыта.")
         await show_main_menu(callback, role)
     else:
-        await show_close_page(callback, telegram_id, page=page)
+        await show_close_page(callback, telegram_id, page=callback_data.page)
         await callback.answer("❌ Не удалось закрыть запись. Попробуйте позже.", show_alert=True)
         return
 
@@ -504,7 +471,7 @@ async def show_teacher_tasks_page(callback: CallbackQuery, telegram_id: int, pag
     tasks_data = await tasks_service.get_tasks(telegram_id, page=page, page_size=PAGE_SIZE)
 
     results = tasks_data.get("results", [])
-    results = [task for task in results if task.get("status") not in ["deleted", "cancelled", "archived"]]
+    results = [task for task in results if task.is_visible]
 
     current_page = tasks_data.get("current_page", page)
     total_pages = max(tasks_data.get("total_pages", 1), 1)
@@ -514,18 +481,15 @@ async def show_teacher_tasks_page(callback: CallbackQuery, telegram_id: int, pag
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text="🔙 К меню задач", callback_data="teacher_tasks_menu")]
         ])
-        try:
-            await callback.message.edit_text(text, reply_markup=keyboard)
-        except TelegramBadRequest:
-            await callback.message.answer(text, reply_markup=keyboard)
+        await render(callback.message, text, reply_markup=keyboard)
         await callback.answer()
         return
 
     text_lines = [f"📋 <b>Мои задачи — страница {current_page} из {total_pages}</b>"]
 
     for task in results:
-        title = task.get("title", "Без названия")
-        status = task.get("status", "unknown")
+        title = task.title
+        status = task.status
 
         status_text_map = {
             "in progress": "В процессе",
@@ -538,7 +502,7 @@ async def show_teacher_tasks_page(callback: CallbackQuery, telegram_id: int, pag
         }
         status_text = status_text_map.get(status, status.title() if status != 'unknown' else 'Неизвестно')
 
-        deadline = task.get("deadline")
+        deadline = task.deadline
         if deadline:
             try:
                 dt_utc = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
@@ -585,18 +549,12 @@ async def show_teacher_tasks_page(callback: CallbackQuery, telegram_id: int, pag
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(
-            "\n".join(text_lines),
-            reply_markup=keyboard,
-            parse_mode="HTML"
-        )
-    except TelegramBadRequest:
-        await callback.message.answer(
-            "\n".join(text_lines),
-            reply_markup=keyboard,
-            parse_mode="HTML"
-        )
+    await render(
+        callback.message,
+        "\n".join(text_lines),
+        reply_markup=keyboard,
+        parse_mode="HTML"
+    )
     await callback.answer()
 
 
@@ -616,7 +574,7 @@ async def show_teacher_task_selection_page(callback: CallbackQuery, telegram_id:
     tasks_data = await tasks_service.get_tasks(telegram_id, page=page, page_size=PAGE_SIZE)
 
     results = tasks_data.get("results", [])
-    results = [task for task in results if task.get("status") not in ["deleted", "cancelled", "archived"]]
+    results = [task for task in results if task.is_visible]
 
     current_page = tasks_data.get("current_page", page)
     total_pages = max(tasks_data.get("total_pages", 1), 1)
@@ -630,12 +588,12 @@ async def show_teacher_task_selection_page(callback: CallbackQuery, telegram_id:
     keyboard_rows = []
 
     for task in results:
-        title = task.get("title", "Без названия")
+        title = task.title
 
         keyboard_rows.append([
             InlineKeyboardButton(
                 text=title,
-                callback_data=f"teacher_task_detail_{task['id']}_{current_page}"
+                callback_data=f"teacher_task_detail_{task.id}_{current_page}"
             )
         ])
 
@@ -659,10 +617,7 @@ async def show_teacher_task_selection_page(callback: CallbackQuery, telegram_id:
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -676,9 +631,9 @@ async def _show_teacher_task_detail(callback: CallbackQuery, telegram_id: int, t
         await callback.answer("❌ Не удалось загрузить задачу", show_alert=True)
         return
 
-    title = task.get("title", "Без названия")
-    description = task.get("description", "Нет описания")
-    status = task.get("status", "unknown")
+    title = task.title
+    description = task.description or "Нет описания"
+    status = task.status
     status_text_map = {
         "in progress": "В процессе",
         "active": "В процессе",
@@ -690,7 +645,7 @@ async def _show_teacher_task_detail(callback: CallbackQuery, telegram_id: int, t
     }
     status_text = status_text_map.get(status, status.title() if status != 'unknown' else 'Неизвестно')
 
-    deadline = task.get("deadline")
+    deadline = task.deadline
     if deadline:
         try:
             dt_utc = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
@@ -702,23 +657,23 @@ async def _show_teacher_task_detail(callback: CallbackQuery, telegram_id: int, t
     else:
         deadline_text = "Не указан"
 
-    creator = task.get("creator")
+    creator = task.creator
     if creator:
-        creator_name = f"{creator.get('first_name', '')} {creator.get('last_name', '')}".strip()
+        creator_name = creator.full_name
     else:
         creator_name = "Не указан"
 
-    assignee = task.get("assignee")
-    assignee_id = assignee.get("id") if assignee else None
-    creator_id = creator.get("id") if creator else None
+    assignee = task.assignee
+    assignee_id = task.assignee_id
+    creator_id = task.creator_id
 
     user_profile = await profile.get_profile(telegram_id)
-    user_id = user_profile.get("id") if user_profile else None
+    user_id = user_profile.id if user_profile else None
 
     if user_id == creator_id:
-        user_reminders = task.get("reminders", [])
+        user_reminders = task.reminders or ()
     else:
-        user_reminders = task.get("assignee_reminders", []) if assignee_id else task.get("reminders", [])
+        user_reminders = task.assignee_reminders if assignee_id else task.reminders or ()
 
     text_lines = [f"<b>{title}</b>"]
 
@@ -730,15 +685,14 @@ async def _show_teacher_task_detail(callback: CallbackQuery, telegram_id: int, t
     text_lines.append(f"👤 Автор: {creator_name}")
 
     if assignee_id and assignee_id != creator_id:
-        assignee_name = f"{assignee.get('first_name', '')} {assignee.get('last_name', '')}".strip()
+        assignee_name = assignee.full_name
         text_lines.append(f"👨‍🏫 Назначен: {assignee_name}")
 
     if deadline:
         reminders = user_reminders
         if reminders:
             reminder_texts = []
-            for reminder in reminders:
-                minutes = reminder.get("minutes", 0)
+            for minutes in reminders:
                 if minutes == 15:
                     reminder_texts.append("за 15 минут")
                 elif minutes == 30:
@@ -773,10 +727,7 @@ async def _show_teacher_task_detail(callback: CallbackQuery, telegram_id: int, t
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -815,12 +766,17 @@ async def edit_task_menu(callback: CallbackQuery, state: FSMContext):
         return
 
     user_profile = await profile.get_profile(telegram_id)
-    user_id = user_profile.get("id") if user_profile else None
-    creator = task.get("creator")
-    creator_id = creator.get("id") if creator else None
+    user_id = user_profile.id if user_profile else None
+    creator_id = task.creator_id
     is_creator = (user_id == creator_id)
 
-    await state.update_data(task_id=task_id, page=page, task=task, is_creator=is_creator)
+    await state.update_data(
+        task_id=task_id,
+        page=page,
+        is_creator=is_creator,
+        has_description=bool(task.description),
+        has_deadline=bool(task.deadline)
+    )
 
     text = "✏️ <b>Выберите, что вы хотите изменить:</b>"
 
@@ -833,13 +789,13 @@ async def edit_task_menu(callback: CallbackQuery, state: FSMContext):
             [InlineKeyboardButton(text="📊 Статус", callback_data="teacher_edit_task_status")],
             [InlineKeyboardButton(text="📅 Дедлайн", callback_data="teacher_edit_task_deadline")]
         ]
-        if task.get("deadline"):
+        if task.deadline:
             keyboard_rows.append([InlineKeyboardButton(text="🔔 Напоминания", callback_data="teacher_edit_task_reminders")])
     else:
         keyboard_rows = [
             [InlineKeyboardButton(text="📊 Статус", callback_data="teacher_edit_task_status")]
         ]
-        if task.get("deadline"):
+        if task.deadline:
             keyboard_rows.append([InlineKeyboardButton(text="🔔 Напоминания", callback_data="teacher_edit_task_reminders")])
 
     keyboard_rows.append([
@@ -848,10 +804,7 @@ async def edit_task_menu(callback: CallbackQuery, state: FSMContext):
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -881,10 +834,7 @@ async def edit_task_title_start(callback: CallbackQuery, state: FSMContext):
         [InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -899,7 +849,6 @@ async def edit_task_description_start(callback: CallbackQuery, state: FSMContext
 
     data = await state.get_data()
     is_creator = data.get("is_creator", False)
-    task = data.get("task")
 
     if not is_creator:
         await callback.answer("❌ Только создатель может редактировать описание задачи.", show_alert=True)
@@ -911,17 +860,14 @@ async def edit_task_description_start(callback: CallbackQuery, state: FSMContext
 
     keyboard_rows = []
 
-    if task and task.get("description"):
+    if data.get("has_description"):
         keyboard_rows.append([InlineKeyboardButton(text="🗑️ Убрать описание", callback_data="teacher_remove_description")])
 
     keyboard_rows.append([InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")])
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -938,16 +884,9 @@ async def edit_task_status_start(callback: CallbackQuery, state: FSMContext):
 
     text = "✏️ Выберите новый статус задачи:"
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🔄 В процессе", callback_data="teacher_set_status_in_progress")],
-        [InlineKeyboardButton(text="✅ Выполнено", callback_data="teacher_set_status_done")],
-        [InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")]
-    ])
+    keyboard = teacher_task_status_keyboard
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -990,10 +929,7 @@ async def edit_task_status_process(callback: CallbackQuery, state: FSMContext):
         [InlineKeyboardButton(text="⬅️ К задаче", callback_data=f"teacher_task_detail_{task_id}_{page}")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -1010,7 +946,6 @@ async def edit_task_deadline_start(callback: CallbackQuery, state: FSMContext):
         return
 
     data = await state.get_data()
-    task = data.get("task")
 
     await state.set_state(UpdateTaskFSM.waiting_for_deadline_date)
 
@@ -1018,17 +953,14 @@ async def edit_task_deadline_start(callback: CallbackQuery, state: FSMContext):
 
     keyboard_rows = []
 
-    if task and task.get("deadline"):
+    if data.get("has_deadline"):
         keyboard_rows.append([InlineKeyboardButton(text="🗑️ Отменить дедлайн", callback_data="teacher_remove_deadline")])
 
     keyboard_rows.append([InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")])
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1120,16 +1052,9 @@ async def edit_task_reminders_start(callback: CallbackQuery, state: FSMContext):
            "• Настроить: выбрать свои варианты напоминаний\n" \
            "• Без напоминаний: уведомления не будут отправляться"
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="⚙️ Настроить напоминания", callback_data="teacher_edit_reminder_custom")],
-        [InlineKeyboardButton(text="🔕 Без напоминаний", callback_data="teacher_edit_reminder_none")],
-        [InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")]
-    ])
+    keyboard = build_reminders_choice_keyboard("teacher_edit_reminder", with_default=False, cancel_callback="teacher_cancel_edit_task")
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1157,10 +1082,7 @@ async def teacher_edit_task_reminders_none(callback: CallbackQuery, state: FSMCo
         [InlineKeyboardButton(text="⬅️ К задаче", callback_data=f"teacher_task_detail_{task_id}_{page}") ]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -1184,35 +1106,7 @@ async def teacher_show_edit_reminders_selection(callback: CallbackQuery, state:
     data = await state.get_data()
     selected_reminders = data.get("selected_reminders", [])
 
-    reminder_options = [
-        (15, "15 минут"),
-        (30, "30 минут"),
-        (60, "1 час"),
-        (1440, "1 день")
-    ]
-
-    keyboard_rows = []
-
-    for minutes, label in reminder_options:
-        is_selected = minutes in selected_reminders
-        button_text = f"{'✅' if is_selected else '⬜'} За {label}"
-        keyboard_rows.append([
-            InlineKeyboardButton(
-                text=button_text,
-                callback_data=f"teacher_edit_reminder_toggle_{minutes}"
-            )
-        ])
-
-    if selected_reminders:
-        keyboard_rows.append([
-            InlineKeyboardButton(text="✅ Подтвердить выбор", callback_data="teacher_edit_reminder_confirm")
-        ])
-
-    keyboard_rows.append([
-        InlineKeyboardButton(text="🔙 Назад", callback_data="teacher_edit_reminder_back")
-    ])
-
-    keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
+    keyboard = build_reminders_keyboard("teacher_edit_reminder", selected_reminders)
 
     selected_count = len(selected_reminders)
     text = "Выберите время для напоминаний 👇\n\n"
@@ -1220,10 +1114,7 @@ async def teacher_show_edit_reminders_selection(callback: CallbackQuery, state:
         text += f"Выбрано: {selected_count}\n\n"
     text += "Вы можете выбрать несколько вариантов"
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard)
+    await render(callback.message, text, reply_markup=keyboard)
 
 
 @router.callback_query(F.data.regexp(r"^teacher_edit_reminder_toggle_(\d+)$"))
@@ -1281,10 +1172,7 @@ async def teacher_handle_edit_reminder_confirm(callback: CallbackQuery, state: F
         [InlineKeyboardButton(text="⬅️ К задаче", callback_data=f"teacher_task_detail_{task_id}_{page}")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -1304,16 +1192,9 @@ async def teacher_handle_edit_reminder_back(callback: CallbackQuery, state: FSMC
            "• Настроить: выбрать свои варианты напоминаний\n" \
            "• Без напоминаний: уведомления не будут отправляться"
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="⚙️ Настроить напоминания", callback_data="teacher_edit_reminder_custom")],
-        [InlineKeyboardButton(text="🔕 Без напоминаний", callback_data="teacher_edit_reminder_none")],
-        [InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")]
-    ])
+    keyboard = build_reminders_choice_keyboard("teacher_edit_reminder", with_default=False, cancel_callback="teacher_cancel_edit_task")
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1351,10 +1232,7 @@ async def teacher_remove_description(callback: CallbackQuery, state: FSMContext)
         [InlineKeyboardButton(text="⬅️ К задаче", callback_data=f"teacher_task_detail_{task_id}_{page}")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -1388,10 +1266,7 @@ async def teacher_remove_deadline(callback: CallbackQuery, state: FSMContext):
         [InlineKeyboardButton(text="⬅️ К задаче", callback_data=f"teacher_task_detail_{task_id}_{page}")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -1418,10 +1293,7 @@ async def cancel_edit_task(callback: CallbackQuery, state: FSMContext):
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text="🔙 В главное меню", callback_data="teacher_tasks_menu")]
         ])
-        try:
-            await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-        except TelegramBadRequest:
-            await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+        await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
         await callback.answer()
 
 
@@ -1452,7 +1324,7 @@ async def teacher_show_task_deletion_page(callback: CallbackQuery, telegram_id:
     tasks_data = await tasks_service.get_tasks(telegram_id, page=page, page_size=PAGE_SIZE)
 
     results = tasks_data.get("results", [])
-    results = [task for task in results if task.get("status") not in ["deleted", "cancelled", "archived"]]
+    results = [task for task in results if task.is_visible]
 
     current_page = tasks_data.get("current_page", page)
     total_pages = max(tasks_data.get("total_pages", 1), 1)
@@ -1462,22 +1334,21 @@ async def teacher_show_task_deletion_page(callback: CallbackQuery, telegram_id:
         return
 
     user_profile = await profile.get_profile(telegram_id)
-    user_id = user_profile.get("id") if user_profile else None
+    user_id = user_profile.id if user_profile else None
 
     text = f"🗑 <b>Выберите задачу для удаления</b>\n\nСтраница {current_page} из {total_pages}"
 
     keyboard_rows = []
 
     for task in results:
-        title = task.get("title", "Без названия")
-        creator = task.get("creator")
-        creator_id = creator.get("id") if creator else None
+        title = task.title
+        creator_id = task.creator_id
 
         if user_id == creator_id:
             keyboard_rows.append([
                 InlineKeyboardButton(
                     text=title,
-                    callback_data=f"teacher_delete_task_confirm_{task['id']}_{current_page}"
+                    callback_data=f"teacher_delete_task_confirm_{task.id}_{current_page}"
                 )
             ])
 
@@ -1505,10 +1376,7 @@ async def teacher_show_task_deletion_page(callback: CallbackQuery, telegram_id:
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1532,15 +1400,14 @@ async def teacher_confirm_task_deletion(callback: CallbackQuery):
         return
 
     user_profile = await profile.get_profile(telegram_id)
-    user_id = user_profile.get("id") if user_profile else None
-    creator = task.get("creator")
-    creator_id = creator.get("id") if creator else None
+    user_id = user_profile.id if user_profile else None
+    creator_id = task.creator_id
 
     if user_id != creator_id:
         await callback.answer("❌ Только создатель может удалить задачу", show_alert=True)
         return
 
-    title = task.get("title", "Без названия")
+    title = task.title
     text = f"⚠️ <b>Подтверждение удаления</b>\n\nВы уверены, что хотите удалить задачу: <b>{title}</b>?"
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
@@ -1550,10 +1417,7 @@ async def teacher_confirm_task_deletion(callback: CallbackQuery):
         ]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1573,9 +1437,8 @@ async def teacher_delete_task(callback: CallbackQuery):
     task = await tasks_service.get_task_details(telegram_id, task_id)
     if task:
         user_profile = await profile.get_profile(telegram_id)
-        user_id = user_profile.get("id") if user_profile else None
-        creator = task.get("creator")
-        creator_id = creator.get("id") if creator else None
+        user_id = user_profile.id if user_profile else None
+        creator_id = task.creator_id
 
         if user_id != creator_id:
             await callback.answer("❌ Только создатель может удалить задачу", show_alert=True)
@@ -1592,10 +1455,7 @@ async def teacher_delete_task(callback: CallbackQuery):
         [InlineKeyboardButton(text="🔙 К меню задач", callback_data="teacher_tasks_menu")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -1611,12 +1471,7 @@ async def teacher_start_create_task(callback: CallbackQuery, state: FSMContext):
     await state.clear()
     await state.set_state(CreateTeacherTaskFSM.waiting_for_title)
 
-    try:
-        await callback.message.delete()
-    except TelegramBadRequest:
-        pass
-
-    await callback.message.answer("Введите название задачи 👇")
+    await render(callback.message, "Введите название задачи 👇")
     await callback.answer()
 
 
@@ -1641,15 +1496,11 @@ async def teacher_skip_task_description(callback: CallbackQuery, state: FSMConte
     await state.update_data(description="")
     await state.set_state(CreateTeacherTaskFSM.waiting_for_deadline_date)
 
-    try:
-        await callback.message.delete()
-    except TelegramBadRequest:
-        pass
-
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="⏭️ Пропустить", callback_data="teacher_task_skip_deadline")]
     ])
-    await callback.message.answer(
+    await render(
+        callback.message,
         "Введите дату дедлайна в формате ДД-ММ-ГГГГ (например, 16-12-2025) 👇",
         reply_markup=keyboard
     )
@@ -1754,11 +1605,7 @@ async def teacher_handle_task_deadline_time(message: Message, state: FSMContext)
     await state.update_data(deadline=deadline_iso)
     await state.set_state(CreateTeacherTaskFSM.waiting_for_reminders_choice)
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="✅ Использовать напоминания по умолчанию", callback_data="teacher_task_reminders_default")],
-        [InlineKeyboardButton(text="⚙️ Настроить напоминания", callback_data="teacher_task_reminders_custom")],
-        [InlineKeyboardButton(text="🔕 Без напоминаний", callback_data="teacher_task_reminders_none")]
-    ])
+    keyboard = build_reminders_choice_keyboard("teacher_task_reminders")
 
     await message.answer(
         "Выберите настройку напоминаний 👇\n\n"
@@ -1795,35 +1642,7 @@ async def teacher_show_reminders_selection(callback: CallbackQuery, state: FSMCo
     data = await state.get_data()
     selected_reminders = data.get("selected_reminders", [])
 
-    reminder_options = [
-        (15, "15 минут"),
-        (30, "30 минут"),
-        (60, "1 час"),
-        (1440, "1 день")
-    ]
-
-    keyboard_rows = []
-
-    for minutes, label in reminder_options:
-        is_selected = minutes in selected_reminders
-        button_text = f"{'✅' if is_selected else '⬜'} За {label}"
-        keyboard_rows.append([
-            InlineKeyboardButton(
-                text=button_text,
-                callback_data=f"teacher_task_reminder_toggle_{minutes}"
-            )
-        ])
-
-    if selected_reminders:
-        keyboard_rows.append([
-            InlineKeyboardButton(text="✅ Подтвердить выбор", callback_data="teacher_task_reminder_confirm")
-        ])
-
-    keyboard_rows.append([
-        InlineKeyboardButton(text="🔙 Назад", callback_data="teacher_task_reminder_back")
-    ])
-
-    keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
+    keyboard = build_reminders_keyboard("teacher_task_reminder", selected_reminders)
 
     selected_count = len(selected_reminders)
     text = "Выберите время для напоминаний 👇\n\n"
@@ -1831,10 +1650,7 @@ async def teacher_show_reminders_selection(callback: CallbackQuery, state: FSMCo
         text += f"Выбрано: {selected_count}\n\n"
     text += "Вы можете выбрать несколько вариантов"
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard)
+    await render(callback.message, text, reply_markup=keyboard)
 
 
 @router.callback_query(F.data.regexp(r"^teacher_task_reminder_toggle_(\d+)$"), CreateTeacherTaskFSM.waiting_for_custom_reminders)
@@ -1894,28 +1710,16 @@ async def teacher_handle_reminder_back(callback: CallbackQuery, state: FSMContex
 
     await state.set_state(CreateTeacherTaskFSM.waiting_for_reminders_choice)
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="✅ Использовать напоминания по умолчанию", callback_data="teacher_task_reminders_default")],
-        [InlineKeyboardButton(text="⚙️ Настроить напоминания", callback_data="teacher_task_reminders_custom")],
-        [InlineKeyboardButton(text="🔕 Без напоминаний", callback_data="teacher_task_reminders_none")]
-    ])
+    keyboard = build_reminders_choice_keyboard("teacher_task_reminders")
 
-    try:
-        await callback.message.edit_text(
-            "Выберите настройку напоминаний 👇\n\n"
-            "• По умолчанию: за 15 минут до дедлайна\n"
-            "• Настроить: выбрать свои варианты напоминаний\n"
-            "• Без напоминаний: уведомления не будут отправляться",
-            reply_markup=keyboard
-        )
-    except TelegramBadRequest:
-        await callback.message.answer(
-            "Выберите настройку напоминаний 👇\n\n"
-            "• По умолчанию: за 15 минут до дедлайна\n"
-            "• Настроить: выбрать свои варианты напоминаний\n"
-            "• Без напоминаний: уведомления не будут отправляться",
-            reply_markup=keyboard
-        )
+    await render(
+        callback.message,
+        "Выберите настройку напоминаний 👇\n\n"
+        "• По умолчанию: за 15 минут до дедлайна\n"
+        "• Настроить: выбрать свои варианты напоминаний\n"
+        "• Без напоминаний: уведомления не будут отправляться",
+        reply_markup=keyboard
+    )
 
     await callback.answer()
 
@@ -1977,10 +1781,7 @@ async def teacher_show_task_confirmation(callback: CallbackQuery, state: FSMCont
 
     await state.set_state(CreateTeacherTaskFSM.confirming)
 
-    try:
-        await callback.message.edit_text(summary, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(summary, reply_markup=keyboard)
+    await render(callback.message, summary, reply_markup=keyboard)
 
 
 @router.callback_query(F.data == "teacher_cancel_create_task")
@@ -1994,16 +1795,10 @@ async def teacher_cancel_create_task(callback: CallbackQuery, state: FSMContext)
     except TelegramBadRequest:
         pass
 
-    cancel_message = await callback.message.answer("❌ Создание задачи отменено.")
+    await answer_and_delete(callback.message, "❌ Создание задачи отменено.", delay=5)
 
     await show_teacher_tasks_menu(callback)
 
-    await asyncio.sleep(5)
-    try:
-        await cancel_message.delete()
-    except TelegramBadRequest:
-        pass
-
     await callback.answer()
 
 
@@ -2074,7 +1869,7 @@ async def show_teacher_tasks_page(callback: CallbackQuery, telegram_id: int, pag
     tasks_data = await tasks_service.get_tasks(telegram_id, page=page, page_size=PAGE_SIZE)
 
     results = tasks_data.get("results", [])
-    results = [task for task in results if task.get("status") not in ["deleted", "cancelled", "archived"]]
+    results = [task for task in results if task.is_visible]
 
     current_page = tasks_data.get("current_page", page)
     total_pages = max(tasks_data.get("total_pages", 1), 1)
@@ -2084,18 +1879,15 @@ async def show_teacher_tasks_page(callback: CallbackQuery, telegram_id: int, pag
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text="🔙 К меню задач", callback_data="teacher_tasks_menu")]
         ])
-        try:
-            await callback.message.edit_text(text, reply_markup=keyboard)
-        except TelegramBadRequest:
-            await callback.message.answer(text, reply_markup=keyboard)
+        await render(callback.message, text, reply_markup=keyboard)
         await callback.answer()
         return
 
     text_lines = [f"📋 <b>Мои задачи — страница {current_page} из {total_pages}</b>"]
 
     for task in results:
-        title = task.get("title", "Без названия")
-        status = task.get("status", "unknown")
+        title = task.title
+        status = task.status
 
         status_text_map = {
             "in progress": "В процессе",
@@ -2108,7 +1900,7 @@ async def show_teacher_tasks_page(callback: CallbackQuery, telegram_id: int, pag
         }
         status_text = status_text_map.get(status, status.title() if status != 'unknown' else 'Неизвестно')
 
-        deadline = task.get("deadline")
+        deadline = task.deadline
         if deadline:
             try:
                 dt_utc = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
@@ -2155,18 +1947,12 @@ async def show_teacher_tasks_page(callback: CallbackQuery, telegram_id: int, pag
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(
-            "\n".join(text_lines),
-            reply_markup=keyboard,
-            parse_mode="HTML"
-        )
-    except TelegramBadRequest:
-        await callback.message.answer(
-            "\n".join(text_lines),
-            reply_markup=keyboard,
-            parse_mode="HTML"
-        )
+    await render(
+        callback.message,
+        "\n".join(text_lines),
+        reply_markup=keyboard,
+        parse_mode="HTML"
+    )
     await callback.answer()
 
 
@@ -2186,7 +1972,7 @@ async def show_teacher_task_selection_page(callback: CallbackQuery, telegram_id:
     tasks_data = await tasks_service.get_tasks(telegram_id, page=page, page_size=PAGE_SIZE)
 
     results = tasks_data.get("results", [])
-    results = [task for task in results if task.get("status") not in ["deleted", "cancelled", "archived"]]
+    results = [task for task in results if task.is_visible]
 
     current_page = tasks_data.get("current_page", page)
     total_pages = max(tasks_data.get("total_pages", 1), 1)
@@ -2200,12 +1986,12 @@ async def show_teacher_task_selection_page(callback: CallbackQuery, telegram_id:
     keyboard_rows = []
 
     for task in results:
-        title = task.get("title", "Без названия")
+        title = task.title
 
         keyboard_rows.append([
             InlineKeyboardButton(
                 text=title,
-                callback_data=f"teacher_task_detail_{task['id']}_{current_page}"
+                callback_data=f"teacher_task_detail_{task.id}_{current_page}"
             )
         ])
 
@@ -2229,10 +2015,7 @@ async def show_teacher_task_selection_page(callback: CallbackQuery, telegram_id:
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -2271,12 +2054,17 @@ async def edit_task_menu(callback: CallbackQuery, state: FSMContext):
         return
 
     user_profile = await profile.get_profile(telegram_id)
-    user_id = user_profile.get("id") if user_profile else None
-    creator = task.get("creator")
-    creator_id = creator.get("id") if creator else None
+    user_id = user_profile.id if user_profile else None
+    creator_id = task.creator_id
     is_creator = (user_id == creator_id)
 
-    await state.update_data(task_id=task_id, page=page, task=task, is_creator=is_creator)
+    await state.update_data(
+        task_id=task_id,
+        page=page,
+        is_creator=is_creator,
+        has_description=bool(task.description),
+        has_deadline=bool(task.deadline)
+    )
 
     text = "✏️ <b>Выберите, что вы хотите изменить:</b>"
 
@@ -2289,13 +2077,13 @@ async def edit_task_menu(callback: CallbackQuery, state: FSMContext):
             [InlineKeyboardButton(text="📊 Статус", callback_data="teacher_edit_task_status")],
             [InlineKeyboardButton(text="📅 Дедлайн", callback_data="teacher_edit_task_deadline")]
         ]
-        if task.get("deadline"):
+        if task.deadline:
             keyboard_rows.append([InlineKeyboardButton(text="🔔 Напоминания", callback_data="teacher_edit_task_reminders")])
     else:
         keyboard_rows = [
             [InlineKeyboardButton(text="📊 Статус", callback_data="teacher_edit_task_status")]
         ]
-        if task.get("deadline"):
+        if task.deadline:
             keyboard_rows.append([InlineKeyboardButton(text="🔔 Напоминания", callback_data="teacher_edit_task_reminders")])
 
     keyboard_rows.append([
@@ -2304,10 +2092,7 @@ async def edit_task_menu(callback: CallbackQuery, state: FSMContext):
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -2337,10 +2122,7 @@ async def edit_task_title_start(callback: CallbackQuery, state: FSMContext):
         [InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -2355,7 +2137,6 @@ async def edit_task_description_start(callback: CallbackQuery, state: FSMContext
 
     data = await state.get_data()
     is_creator = data.get("is_creator", False)
-    task = data.get("task")
 
     if not is_creator:
         await callback.answer("❌ Только создатель может редактировать описание задачи.", show_alert=True)
@@ -2367,17 +2148,14 @@ async def edit_task_description_start(callback: CallbackQuery, state: FSMContext
 
     keyboard_rows = []
 
-    if task and task.get("description"):
+    if data.get("has_description"):
         keyboard_rows.append([InlineKeyboardButton(text="🗑️ Убрать описание", callback_data="teacher_remove_description")])
 
     keyboard_rows.append([InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")])
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -2394,16 +2172,9 @@ async def edit_task_status_start(callback: CallbackQuery, state: FSMContext):
 
     text = "✏️ Выберите новый статус задачи:"
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="🔄 В процессе", callback_data="teacher_set_status_in_progress")],
-        [InlineKeyboardButton(text="✅ Выполнено", callback_data="teacher_set_status_done")],
-        [InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")]
-    ])
+    keyboard = teacher_task_status_keyboard
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -2446,10 +2217,7 @@ async def edit_task_status_process(callback: CallbackQuery, state: FSMContext):
         [InlineKeyboardButton(text="⬅️ К задаче", callback_data=f"teacher_task_detail_{task_id}_{page}")]
     ])
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
     await state.clear()
@@ -2466,7 +2234,6 @@ async def edit_task_deadline_start(callback: CallbackQuery, state: FSMContext):
         return
 
     data = await state.get_data()
-    task = data.get("task")
 
     await state.set_state(UpdateTaskFSM.waiting_for_deadline_date)
 
@@ -2474,17 +2241,14 @@ async def edit_task_deadline_start(callback: CallbackQuery, state: FSMContext):
 
     keyboard_rows = []
 
-    if task and task.get("deadline"):
+    if data.get("has_deadline"):
         keyboard_rows.append([InlineKeyboardButton(text="🗑️ Отменить дедлайн", callback_data="teacher_remove_deadline")])
 
     keyboard_rows.append([InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")])
 
     keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+    await render(callback.message, text, reply_markup=keyboard, parse_mode="HTML")
 
     await callback.answer()
 
@@ -2588,35 +2352,7 @@ async def teacher_show_reminders_selection(callback: CallbackQuery, state: FSMCo
     data = await state.get_data()
     selected_reminders = data.get("selected_reminders", [])
 
-    reminder_options = [
-        (15, "15 минут"),
-        (30, "30 минут"),
-        (60, "1 час"),
-        (1440, "1 день")
-    ]
-
-    keyboard_rows = []
-
-    for minutes, label in reminder_options:
-        is_selected = minutes in selected_reminders
-        button_text = f"{'✅' if is_selected else '⬜'} За {label}"
-        keyboard_rows.append([
-            InlineKeyboardButton(
-                text=button_text,
-                callback_data=f"teacher_task_reminder_toggle_{minutes}"
-            )
-        ])
-
-    if selected_reminders:
-        keyboard_rows.append([
-            InlineKeyboardButton(text="✅ Подтвердить выбор", callback_data="teacher_task_reminder_confirm")
-        ])
-
-    keyboard_rows.append([
-        InlineKeyboardButton(text="🔙 Назад", callback_data="teacher_task_reminder_back")
-    ])
-
-    keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
+    keyboard = build_reminders_keyboard("teacher_task_reminder", selected_reminders)
 
     selected_count = len(selected_reminders)
     text = "Выберите время для напоминаний 👇\n\n"
@@ -2624,10 +2360,7 @@ async def teacher_show_reminders_selection(callback: CallbackQuery, state: FSMCo
         text += f"Выбрано: {selected_count}\n\n"
     text += "Вы можете выбрать несколько вариантов"
 
-    try:
-        await callback.message.edit_text(text, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(text, reply_markup=keyboard)
+    await render(callback.message, text, reply_markup=keyboard)
 
 
 @router.callback_query(F.data.regexp(r"^teacher_task_reminder_toggle_(\d+)$"), CreateTeacherTaskFSM.waiting_for_custom_reminders)
@@ -2687,28 +2420,16 @@ async def teacher_handle_reminder_back(callback: CallbackQuery, state: FSMContex
 
     await state.set_state(CreateTeacherTaskFSM.waiting_for_reminders_choice)
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
-        [InlineKeyboardButton(text="✅ Использовать напоминания по умолчанию", callback_data="teacher_task_reminders_default")],
-        [InlineKeyboardButton(text="⚙️ Настроить напоминания", callback_data="teacher_task_reminders_custom")],
-        [InlineKeyboardButton(text="🔕 Без напоминаний", callback_data="teacher_task_reminders_none")]
-    ])
+    keyboard = build_reminders_choice_keyboard("teacher_task_reminders")
 
-    try:
-        await callback.message.edit_text(
-            "Выберите настройку напоминаний 👇\n\n"
-            "• По умолчанию: за 15 минут до дедлайна\n"
-            "• Настроить: выбрать свои варианты напоминаний\n"
-            "• Без напоминаний: уведомления не будут отправляться",
-            reply_markup=keyboard
-        )
-    except TelegramBadRequest:
-        await callback.message.answer(
-            "Выберите настройку напоминаний 👇\n\n"
-            "• По умолчанию: за 15 минут до дедлайна\n"
-            "• Настроить: выбрать свои варианты напоминаний\n"
-            "• Без напоминаний: уведомления не будут отправляться",
-            reply_markup=keyboard
-        )
+    await render(
+        callback.message,
+        "Выберите настройку напоминаний 👇\n\n"
+        "• По умолчанию: за 15 минут до дедлайна\n"
+        "• Настроить: выбрать свои варианты напоминаний\n"
+        "• Без напоминаний: уведомления не будут отправляться",
+        reply_markup=keyboard
+    )
 
     await callback.answer()
 
@@ -2770,10 +2491,7 @@ async def teacher_show_task_confirmation(callback: CallbackQuery, state: FSMCont
 
     await state.set_state(CreateTeacherTaskFSM.confirming)
 
-    try:
-        await callback.message.edit_text(summary, reply_markup=keyboard)
-    except TelegramBadRequest:
-        await callback.message.answer(summary, reply_markup=keyboard)
+    await render(callback.message, summary, reply_markup=keyboard)
 
 
 @router.callback_query(F.data == "teacher_cancel_create_task")
@@ -2787,16 +2505,10 @@ async def teacher_cancel_create_task(callback: CallbackQuery, state: FSMContext)
     except TelegramBadRequest:
         pass
 
-    cancel_message = await callback.message.answer("❌ Создание задачи отменено.")
+    await answer_and_delete(callback.message, "❌ Создание задачи отменено.", delay=5)
 
     await show_teacher_tasks_menu(callback)
 
-    await asyncio.sleep(5)
-    try:
-        await cancel_message.delete()
-    except TelegramBadRequest:
-        pass
-
     await callback.answer()
 
 
@@ -3,6 +3,7 @@ from aiogram import types
 import config
 from services.profile import profile
 from services.auth import auth
+from utils.messages import render
 
 student_menu = types.InlineKeyboardMarkup(
     inline_keyboard=[
@@ -154,8 +155,7 @@ async def show_main_menu(obj: types.Message | types.CallbackQuery, role: str | N
         greeting = "👋 Привет!\n\nЧтобы продолжить, зарегистрируйтесь или войдите в систему 👇"
         keyboard = guest_menu
 
-    target_message = edit_message or base_message
     if edit_message:
-        await target_message.edit_text(greeting, reply_markup=keyboard)
+        await render(edit_message, greeting, reply_markup=keyboard)
     else:
-        await target_message.answer(greeting, reply_markup=keyboard)
+        await base_message.answer(greeting, reply_markup=keyboard)
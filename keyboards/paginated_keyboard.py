@@ -1,13 +1,21 @@
-﻿from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+﻿from functools import lru_cache
 
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
-def build_paginated_keyboard(data_list: list, page: int, total_pages: int, callback_prefix: str) -> InlineKeyboardMarkup:
+from models.user import Teacher
+
+KEYBOARD_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=KEYBOARD_CACHE_SIZE)
+def _paginated_rows(items: tuple[tuple[int, str], ...], page: int, total_pages: int,
+                    callback_prefix: str) -> tuple[tuple[InlineKeyboardButton, ...], ...]:
     buttons = [
-        [InlineKeyboardButton(
-            text=f"{item.get('first_name', '')} {item.get('last_name', '')}".strip(),
-            callback_data=f"{callback_prefix}_{item['id']}"
-        )]
-        for item in data_list
+        (InlineKeyboardButton(
+            text=text,
+            callback_data=f"{callback_prefix}_{item_id}"
+        ),)
+        for item_id, text in items
     ]
 
     nav_buttons = []
@@ -21,6 +29,13 @@ def build_paginated_keyboard(data_list: list, page: int, total_pages: int, callb
         ))
 
     if nav_buttons:
-        buttons.append(nav_buttons)
+        buttons.append(tuple(nav_buttons))
+
+    return tuple(buttons)
+
 
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
+def build_paginated_keyboard(data_list: list[Teacher], page: int, total_pages: int,
+                             callback_prefix: str) -> InlineKeyboardMarkup:
+    items = tuple((item.id, item.full_name) for item in data_list)
+    rows = _paginated_rows(items, page, total_pages, callback_prefix)
+    return InlineKeyboardMarkup(inline_keyboard=[list(row) for row in rows])
@@ -0,0 +1,90 @@
+﻿from functools import lru_cache
+from typing import Iterable
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+KEYBOARD_CACHE_SIZE = 256
+
+REMINDER_OPTIONS = (
+    (15, "15 минут"),
+    (30, "30 минут"),
+    (60, "1 час"),
+    (1440, "1 день")
+)
+
+teacher_tasks_menu = InlineKeyboardMarkup(inline_keyboard=[
+    [
+        InlineKeyboardButton(text="➕ Создать задачу", callback_data="teacher_create_task"),
+        InlineKeyboardButton(text="🗑 Удалить задачу", callback_data="teacher_delete_task_from_menu")
+    ],
+    [
+        InlineKeyboardButton(text="📋 Мои задачи", callback_data="teacher_view_tasks")
+    ],
+    [
+        InlineKeyboardButton(text="👤 Профиль", callback_data="menu_profile:tasks_menu"),
+        InlineKeyboardButton(text="🚪 Выйти", callback_data="menu_logout")
+    ],
+    [
+        InlineKeyboardButton(text="❓ Справка", callback_data="menu_help:tasks_menu")
+    ]
+])
+
+teacher_task_status_keyboard = InlineKeyboardMarkup(inline_keyboard=[
+    [InlineKeyboardButton(text="🔄 В процессе", callback_data="teacher_set_status_in_progress")],
+    [InlineKeyboardButton(text="✅ Выполнено", callback_data="teacher_set_status_done")],
+    [InlineKeyboardButton(text="❌ Отмена", callback_data="teacher_cancel_edit_task")]
+])
+
+
+def _markup(rows: tuple[tuple[InlineKeyboardButton, ...], ...]) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[list(row) for row in rows])
+
+
+@lru_cache(maxsize=KEYBOARD_CACHE_SIZE)
+def _reminders_rows(callback_prefix: str, selected: frozenset[int]) -> tuple[tuple[InlineKeyboardButton, ...], ...]:
+    keyboard_rows = []
+
+    for minutes, label in REMINDER_OPTIONS:
+        is_selected = minutes in selected
+        button_text = f"{'✅' if is_selected else '⬜'} За {label}"
+        keyboard_rows.append((
+            InlineKeyboardButton(
+                text=button_text,
+                callback_data=f"{callback_prefix}_toggle_{minutes}"
+            ),
+        ))
+
+    if selected:
+        keyboard_rows.append((
+            InlineKeyboardButton(text="✅ Подтвердить выбор", callback_data=f"{callback_prefix}_confirm"),
+        ))
+
+    keyboard_rows.append((
+        InlineKeyboardButton(text="🔙 Назад", callback_data=f"{callback_prefix}_back"),
+    ))
+
+    return tuple(keyboard_rows)
+
+
+def build_reminders_keyboard(callback_prefix: str, selected_reminders: Iterable[int]) -> InlineKeyboardMarkup:
+    return _markup(_reminders_rows(callback_prefix, frozenset(selected_reminders)))
+
+
+@lru_cache(maxsize=KEYBOARD_CACHE_SIZE)
+def _reminders_choice_rows(callback_prefix: str, with_default: bool,
+                           cancel_callback: str | None) -> tuple[tuple[InlineKeyboardButton, ...], ...]:
+    keyboard_rows = []
+    if with_default:
+        keyboard_rows.append((
+            InlineKeyboardButton(text="✅ Использовать напоминания по умолчанию", callback_data=f"{callback_prefix}_default"),
+        ))
+    keyboard_rows.append((InlineKeyboardButton(text="⚙️ Настроить напоминания", callback_data=f"{callback_prefix}_custom"),))
+    keyboard_rows.append((InlineKeyboardButton(text="🔕 Без напоминаний", callback_data=f"{callback_prefix}_none"),))
+    if cancel_callback:
+        keyboard_rows.append((InlineKeyboardButton(text="❌ Отмена", callback_data=cancel_callback),))
+    return tuple(keyboard_rows)
+
+
+def build_reminders_choice_keyboard(callback_prefix: str, with_default: bool = True,
+                                    cancel_callback: str | None = None) -> InlineKeyboardMarkup:
+    return _markup(_reminders_choice_rows(callback_prefix, with_default, cancel_callback))
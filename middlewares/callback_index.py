@@ -0,0 +1,243 @@
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, Iterable
+
+from aiogram import BaseMiddleware, Router
+from aiogram.dispatcher.event.bases import REJECTED, UNHANDLED, SkipHandler
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import CallbackQuery, TelegramObject
+
+logger = logging.getLogger(__name__)
+
+_REGEX_META = set(".^$*+?{}[]\\|()")
+_QUANTIFIERS = set("*?{")
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+
+def regex_literal_prefix(pattern: str) -> str:
+    if _has_top_level_alternation(pattern):
+        return ""
+    if pattern.startswith("^"):
+        pattern = pattern[1:]
+
+    prefix = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        step = 1
+        if char == "\\":
+            escaped = pattern[i + 1:i + 2]
+            if not escaped or escaped.isalnum():
+                break
+            char, step = escaped, 2
+        elif char in _REGEX_META:
+            break
+
+        following = pattern[i + step:i + step + 1]
+        if following in _QUANTIFIERS:
+            break
+        prefix.append(char)
+        if following == "+":
+            break
+        i += step
+    return "".join(prefix)
+
+
+def callback_data_key(handler: HandlerObject) -> tuple[str, str] | None:
+    for filter_object in handler.filters or ():
+        callback_data = getattr(filter_object.callback, "callback_data", None)
+        prefix = getattr(callback_data, "__prefix__", None)
+        if isinstance(prefix, str):
+            return "prefix", f"{prefix}{callback_data.__separator__}"
+        magic = getattr(filter_object, "magic", None)
+        if magic is None:
+            continue
+        key = _magic_data_key(getattr(magic, "_operations", ()))
+        if key:
+            return key
+    return None
+
+
+def _magic_data_key(operations: tuple) -> tuple[str, str] | None:
+    if not operations or type(operations[0]).__name__ != "GetAttributeOperation":
+        return None
+    if getattr(operations[0], "name", None) != "data":
+        return None
+    rest = operations[1:]
+
+    if len(rest) == 1 and type(rest[0]).__name__ == "ComparatorOperation":
+        right = getattr(rest[0], "right", None)
+        if getattr(rest[0].comparator, "__name__", "") == "eq" and isinstance(right, str):
+            return "exact", right
+
+    if len(rest) == 1 and type(rest[0]).__name__ == "FunctionOperation":
+        function = getattr(rest[0], "function", None)
+        pattern = getattr(function, "__self__", None)
+        if isinstance(pattern, re.Pattern) and function.__name__ in ("match", "fullmatch"):
+            if pattern.flags & re.IGNORECASE:
+                return None
+            return "prefix", regex_literal_prefix(pattern.pattern)
+
+    if (
+        len(rest) == 2
+        and type(rest[0]).__name__ == "GetAttributeOperation"
+        and getattr(rest[0], "name", None) == "startswith"
+        and type(rest[1]).__name__ == "CallOperation"
+    ):
+        args = getattr(rest[1], "args", ())
+        if len(args) == 1 and isinstance(args[0], str) and not getattr(rest[1], "kwargs", None):
+            return "prefix", args[0]
+
+    return None
+
+
+class _TrieNode:
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children: dict[str, "_TrieNode"] = {}
+        self.entries: list[tuple[int, Router, HandlerObject]] = []
+
+
+class CallbackIndex:
+    def __init__(self, routers: Iterable[Router]):
+        self._exact: dict[str, list[tuple[int, Router, HandlerObject]]] = {}
+        self._root = _TrieNode()
+        self._always: list[tuple[int, Router, HandlerObject]] = []
+        self.size = 0
+
+        order = 0
+        for router in routers:
+            for handler in router.callback_query.handlers:
+                entry = (order, router, handler)
+                order += 1
+                key = callback_data_key(handler)
+                if key is None or not key[1]:
+                    self._always.append(entry)
+                elif key[0] == "exact":
+                    self._exact.setdefault(key[1], []).append(entry)
+                else:
+                    node = self._root
+                    for char in key[1]:
+                        node = node.children.setdefault(char, _TrieNode())
+                    node.entries.append(entry)
+        self.size = order
+
+    @classmethod
+    def from_router(cls, router: Router) -> "CallbackIndex":
+        return cls(router.chain_tail)
+
+    def candidates(self, data: str) -> list[tuple[int, Router, HandlerObject]]:
+        found = list(self._always)
+        found.extend(self._exact.get(data, ()))
+        node = self._root
+        for char in data:
+            node = node.children.get(char)
+            if node is None:
+                break
+            found.extend(node.entries)
+        found.sort(key=lambda entry: entry[0])
+        return found
+
+
+class CallbackIndexMiddleware(BaseMiddleware):
+    def __init__(self, router: Router):
+        self.router = router
+        self._index: CallbackIndex | None = None
+        self._enabled: bool | None = None
+
+    @property
+    def index(self) -> CallbackIndex:
+        if self._index is None:
+            self._index = CallbackIndex.from_router(self.router)
+            logger.info(f"Callback index built for {self._index.size} handlers")
+        return self._index
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is None:
+            reason = self._bypass_conflict()
+            if reason:
+                logger.warning(f"Callback index disabled, falling back to full propagation: {reason}")
+            self._enabled = reason is None
+        return self._enabled
+
+    def _bypass_conflict(self) -> str | None:
+        outer = list(self.router.callback_query.outer_middleware)
+        if self in outer and outer.index(self) < len(outer) - 1:
+            return "outer middlewares are registered after the index on the root router"
+        for router in self.router.chain_tail:
+            if router is not self.router and len(router.callback_query.outer_middleware):
+                return f"router {router.name!r} has callback_query outer middlewares"
+        return None
+
+    async def _router_data(self, router: Router, event: CallbackQuery, data: Dict[str, Any],
+                           entered: dict[Router, Dict[str, Any] | None]) -> Dict[str, Any] | None:
+        if router in entered:
+            return entered[router]
+        base = data
+        if router is not self.router:
+            base = await self._router_data(router.parent_router, event, data, entered)
+        kwargs = None
+        if base is not None:
+            kwargs = {**base, "event_router": router}
+            result, filter_data = await router.callback_query.check_root_filters(event, **kwargs)
+            kwargs = {**kwargs, **filter_data} if result else None
+        entered[router] = kwargs
+        return kwargs
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        if not isinstance(event, CallbackQuery) or event.data is None or not self.enabled:
+            return await handler(event, data)
+
+        entered: dict[Router, Dict[str, Any] | None] = {}
+        for _, router, handler_object in self.index.candidates(event.data):
+            router_data = await self._router_data(router, event, data, entered)
+            if router_data is None:
+                continue
+            kwargs = {**router_data, "handler": handler_object}
+            result, filter_data = await handler_object.check(event, **kwargs)
+            if not result:
+                continue
+            kwargs.update(filter_data)
+            observer = router.callback_query
+            try:
+                wrapped = observer.outer_middleware.wrap_middlewares(
+                    observer._resolve_middlewares(),
+                    handler_object.call
+                )
+                response = await wrapped(event, kwargs)
+            except SkipHandler:
+                continue
+            if response is REJECTED:
+                entered[router] = None
+                continue
+            return response
+
+        return UNHANDLED
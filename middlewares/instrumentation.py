@@ -0,0 +1,44 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from services.instrumentation import operation
+
+
+def handler_labels(data: Dict[str, Any]) -> tuple[str, str]:
+    callback = getattr(data.get("handler"), "callback", None)
+    module = getattr(callback, "__module__", "") or ""
+    return module.rsplit(".", 1)[-1], getattr(callback, "__name__", "unknown")
+
+
+class UpdateInstrumentationMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        if not isinstance(event, Update):
+            return await handler(event, data)
+        user = data.get("event_from_user")
+        with operation("update", event.event_type, update_id=event.update_id, user_id=user.id if user else None):
+            return await handler(event, data)
+
+
+class HandlerInstrumentationMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        router, action = handler_labels(data)
+        with operation("handler", action, router=router, event=type(event).__name__):
+            return await handler(event, data)
+
+
+class TelegramRequestInstrumentation:
+    async def __call__(self, make_request: Callable[..., Awaitable[Any]], bot, method) -> Any:
+        with operation("telegram", type(method).__name__):
+            return await make_request(bot, method)
@@ -0,0 +1,40 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from services.api_limiter import BackendOverloaded, close_scope, open_scope
+from utils.messages import answer_and_delete
+
+BUSY_TEXT = "⏳ Сервис сейчас перегружен. Попробуйте ещё раз через минуту."
+
+
+class LoadSheddingMiddleware(BaseMiddleware):
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        scope, token = open_scope()
+        try:
+            result = await handler(event, data)
+        except BackendOverloaded:
+            result = None
+        finally:
+            close_scope(token)
+        if scope.shed:
+            await self._notify(event)
+        return result
+
+    @staticmethod
+    async def _notify(event: TelegramObject):
+        if isinstance(event, CallbackQuery):
+            try:
+                await event.answer(BUSY_TEXT, show_alert=True)
+                return
+            except TelegramBadRequest:
+                event = event.message
+        if isinstance(event, Message):
+            await answer_and_delete(event, BUSY_TEXT, delay=10)
@@ -0,0 +1,23 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from middlewares.instrumentation import handler_labels
+from services.profiler import HandlerProfiler
+
+
+class ProfilerMiddleware(BaseMiddleware):
+    def __init__(self, profiler: HandlerProfiler):
+        self.profiler = profiler
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        if not self.profiler.sample_rate or not self.profiler.should_sample():
+            return await handler(event, data)
+        router, action = handler_labels(data)
+        return await self.profiler.run(f"{router}.{action}", handler, event, data)
@@ -0,0 +1,144 @@
+import asyncio
+import gzip
+import logging
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+ID_PLACEHOLDER = "{id}"
+MAX_PLAIN_NUMBER = 99
+
+_NUMBER = re.compile(r"\d+")
+_DATE = re.compile(r"^\d{1,2}[-.]\d{1,2}[-.]\d{4}$")
+_TIME = re.compile(r"^\d{1,2}:\d{2}$")
+_EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _anonymize_number(value: int) -> str:
+    return str(value) if 0 <= value <= MAX_PLAIN_NUMBER else ID_PLACEHOLDER
+
+
+def callback_shape(data: str | None) -> str:
+    if not data:
+        return ""
+    return _NUMBER.sub(lambda m: _anonymize_number(int(m.group())), data)
+
+
+def text_shape(text: str | None) -> str:
+    text = (text or "").strip()
+    if not text:
+        return ""
+    if text.startswith("/"):
+        return text.split(maxsplit=1)[0]
+    if _DATE.match(text):
+        return "{date}"
+    if _TIME.match(text):
+        return "{time}"
+    if text.isdigit():
+        return _anonymize_number(int(text))
+    if _EMAIL.match(text):
+        return "{email}"
+    return f"{{text:{len(text)}}}"
+
+
+class UpdateRecorder(BaseMiddleware):
+    def __init__(self, path: str, flush_interval: float = 5.0):
+        self.path = path
+        self.flush_interval = float(flush_interval)
+        self._users: dict[int, int] = {}
+        self._pending: list[list] = []
+        self._origin: float | None = None
+        self._task: asyncio.Task | None = None
+
+    def _user(self, user_id: int | None) -> int:
+        if user_id is None:
+            return -1
+        index = self._users.get(user_id)
+        if index is None:
+            index = self._users[user_id] = len(self._users)
+        return index
+
+    def record(self, event: Update, user_id: int | None):
+        now = time.monotonic()
+        if self._origin is None:
+            self._origin = now
+        kind = event.event_type
+        if kind == "callback_query":
+            shape = callback_shape(event.callback_query.data)
+        elif kind == "message":
+            shape = text_shape(event.message.text)
+        else:
+            shape = ""
+        self._pending.append([round((now - self._origin) * 1000), self._user(user_id), kind, shape])
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        if isinstance(event, Update):
+            user = data.get("event_from_user")
+            try:
+                self.record(event, user.id if user else None)
+            except Exception as e:
+                logger.warning(f"Failed to record update {event.update_id}: {e}")
+        return await handler(event, data)
+
+    def _write(self, records: list[list]):
+        opener = gzip.open if self.path.endswith(".gz") else open
+        with opener(self.path, "at", encoding="utf-8") as f:
+            for record in records:
+                f.write(json_codec.dumps(record) + "\n")
+
+    async def flush(self):
+        records, self._pending = self._pending, []
+        if not records:
+            return
+        try:
+            await asyncio.to_thread(self._write, records)
+        except OSError as e:
+            logger.warning(f"Failed to write {len(records)} recorded updates to {self.path}: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        if self._task:
+            return
+        self._task = asyncio.create_task(self._run(), name="update-recorder-flush")
+        logger.info(f"Recording anonymized updates to {self.path}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+
+def load_recording(path: str) -> list[list]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        records = [json_codec.loads(line) for line in f if line.strip()]
+    shift = last = 0
+    users = user_base = 0
+    for record in records:
+        if record[0] + shift < last:
+            shift = last - record[0]
+            user_base = users
+        record[0] += shift
+        last = record[0]
+        if record[1] >= 0:
+            record[1] += user_base
+            users = max(users, record[1] + 1)
+    return records
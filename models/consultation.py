@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+from typing import Any
+
+from models.user import Person
+
+
+@dataclass(slots=True)
+class Consultation:
+    id: int
+    title: str = "Без названия"
+    date: str | None = None
+    start_time: str | None = None
+    end_time: str | None = None
+    max_students: int = 0
+    is_closed: bool = False
+    status: str = ""
+    teacher_name: str = ""
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> "Consultation":
+        return cls(
+            id=data["id"],
+            title=data.get("title") or "Без названия",
+            date=data.get("date"),
+            start_time=data.get("start_time"),
+            end_time=data.get("end_time"),
+            max_students=data.get("max_students") or 0,
+            is_closed=bool(data.get("is_closed")),
+            status=data.get("status") or "",
+            teacher_name=data.get("teacher_name") or ""
+        )
+
+
+@dataclass(slots=True)
+class ConsultationRequest:
+    id: int
+    title: str = "Без названия"
+    description: str = ""
+    status: str = ""
+    created_at: str | None = None
+    student: Person | None = None
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> "ConsultationRequest":
+        return cls(
+            id=data["id"],
+            title=data.get("title") or "Без названия",
+            description=data.get("description") or "",
+            status=data.get("status") or "",
+            created_at=data.get("created_at"),
+            student=Person.from_api(data.get("student"))
+        )
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Any
+
+from models.user import Person
+
+CLOSED_STATUSES = ("deleted", "cancelled", "archived")
+
+
+def _reminder_minutes(reminders: list | None) -> tuple[int, ...] | None:
+    if reminders is None:
+        return None
+    minutes = []
+    for reminder in reminders:
+        try:
+            minutes.append(int(reminder.get("minutes", 0)))
+        except (AttributeError, TypeError, ValueError):
+            continue
+    return tuple(minutes)
+
+
+@dataclass(slots=True)
+class Task:
+    id: int
+    title: str = "Без названия"
+    description: str = ""
+    status: str = "unknown"
+    deadline: str | None = None
+    creator: Person | None = None
+    assignee: Person | None = None
+    reminders: tuple[int, ...] | None = None
+    assignee_reminders: tuple[int, ...] = ()
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> "Task":
+        return cls(
+            id=data["id"],
+            title=data.get("title") or "Без названия",
+            description=data.get("description") or "",
+            status=data.get("status") or "unknown",
+            deadline=data.get("deadline"),
+            creator=Person.from_api(data.get("creator")),
+            assignee=Person.from_api(data.get("assignee")),
+            reminders=_reminder_minutes(data.get("reminders")),
+            assignee_reminders=_reminder_minutes(data.get("assignee_reminders")) or ()
+        )
+
+    @property
+    def is_visible(self) -> bool:
+        return self.status not in CLOSED_STATUSES
+
+    @property
+    def creator_id(self) -> int | None:
+        return self.creator.id if self.creator else None
+
+    @property
+    def assignee_id(self) -> int | None:
+        return self.assignee.id if self.assignee else None
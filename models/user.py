@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class Person:
+    id: int | None = None
+    telegram_id: int | None = None
+    username: str = ""
+    first_name: str = ""
+    last_name: str = ""
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any] | None) -> "Person | None":
+        if not isinstance(data, dict):
+            return None
+        return cls(
+            id=data.get("id"),
+            telegram_id=data.get("telegram_id"),
+            username=data.get("username") or "",
+            first_name=data.get("first_name") or "",
+            last_name=data.get("last_name") or ""
+        )
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}".strip()
+
+
+@dataclass(slots=True)
+class Teacher:
+    id: int
+    first_name: str = ""
+    last_name: str = ""
+    username: str = ""
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> "Teacher":
+        return cls(
+            id=data["id"],
+            first_name=data.get("first_name") or "",
+            last_name=data.get("last_name") or "",
+            username=data.get("username") or ""
+        )
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}".strip()
+
+
+@dataclass(slots=True)
+class Profile:
+    role: str
+    id: int | None = None
+    username: str = ""
+    first_name: str = ""
+    last_name: str = ""
+    phone_number: str = ""
+    status: str = ""
+    email: str = ""
+
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> "Profile":
+        return cls(
+            role=data["role"],
+            id=data.get("id"),
+            username=data.get("username") or "",
+            first_name=data.get("first_name") or "",
+            last_name=data.get("last_name") or "",
+            phone_number=data.get("phone_number") or "",
+            status=data.get("status") or "",
+            email=data.get("email") or ""
+        )
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.first_name} {self.last_name}".strip()
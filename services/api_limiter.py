@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from contextvars import ContextVar, Token
+
+import config
+from services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLASS = "default"
+ENDPOINT_CLASSES = (
+    ("booking", re.compile(r"^consultations/\{id\}/(book|cancel)/$")),
+    ("tasks", re.compile(r"^todo/")),
+    ("teachers", re.compile(r"^teachers/")),
+    ("consultations", re.compile(r"^consultations/")),
+)
+
+
+class BackendOverloaded(Exception):
+    def __init__(self, endpoint_class: str, reason: str):
+        super().__init__(f"TSU API queue for {endpoint_class} is overloaded ({reason})")
+        self.endpoint_class = endpoint_class
+        self.reason = reason
+
+
+class SheddingScope:
+    __slots__ = ("shed",)
+
+    def __init__(self):
+        self.shed: list[str] = []
+
+
+_scope: ContextVar[SheddingScope | None] = ContextVar("shedding_scope", default=None)
+
+
+def open_scope() -> tuple[SheddingScope, Token]:
+    scope = SheddingScope()
+    return scope, _scope.set(scope)
+
+
+def close_scope(token: Token):
+    _scope.reset(token)
+
+
+def endpoint_class(template: str) -> str:
+    for name, pattern in ENDPOINT_CLASSES:
+        if pattern.match(template):
+            return name
+    return DEFAULT_CLASS
+
+
+class EndpointLimiter:
+    def __init__(self, limits: dict[str, int], queue_limit: int, queue_timeout: float):
+        self.limits = dict(limits)
+        self.queue_limit = int(queue_limit)
+        self.queue_timeout = float(queue_timeout)
+        self.waiting: Counter = Counter()
+        self.active: Counter = Counter()
+        self._semaphores: dict[str, asyncio.Semaphore | None] = {}
+
+    def _semaphore(self, name: str) -> asyncio.Semaphore | None:
+        if name not in self._semaphores:
+            limit = self.limits.get(name, self.limits.get(DEFAULT_CLASS, 0))
+            self._semaphores[name] = asyncio.Semaphore(limit) if limit > 0 else None
+        return self._semaphores[name]
+
+    def _shed(self, scope: SheddingScope, name: str, reason: str):
+        scope.shed.append(name)
+        metrics.api_shed.inc(endpoint_class=name, reason=reason)
+        logger.warning(
+            f"Shedding TSU API request ({name}, {reason}): "
+            f"{self.active[name]} in flight, {self.waiting[name]} queued"
+        )
+        raise BackendOverloaded(name, reason)
+
+    @asynccontextmanager
+    async def slot(self, template: str):
+        name = endpoint_class(template)
+        semaphore = self._semaphore(name)
+        if semaphore is None:
+            yield
+            return
+
+        scope = _scope.get()
+        if scope is not None and semaphore.locked() and self.waiting[name] >= self.queue_limit:
+            self._shed(scope, name, "queue_full")
+
+        queued = time.perf_counter()
+        self.waiting[name] += 1
+        try:
+            if scope is None or self.queue_timeout <= 0 or not semaphore.locked():
+                await semaphore.acquire()
+            else:
+                try:
+                    await asyncio.wait_for(semaphore.acquire(), self.queue_timeout)
+                except TimeoutError:
+                    self._shed(scope, name, "timeout")
+        finally:
+            self.waiting[name] -= 1
+        metrics.api_queue_time.observe(time.perf_counter() - queued, endpoint_class=name)
+
+        self.active[name] += 1
+        try:
+            yield
+        finally:
+            self.active[name] -= 1
+            semaphore.release()
+
+    def collect(self) -> list[tuple[tuple, float]]:
+        return [
+            *(((name, "queued"), count) for name, count in self.waiting.items()),
+            *(((name, "in_flight"), count) for name, count in self.active.items())
+        ]
+
+
+api_limiter = EndpointLimiter(config.API_CONCURRENCY, config.API_QUEUE_LIMIT, config.API_QUEUE_TIMEOUT)
+metrics.track_limiter(api_limiter)
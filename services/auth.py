@@ -4,6 +4,12 @@ import config
 from typing import Optional, Tuple
 from redis import asyncio as aioredis
 
+from services.api_limiter import BackendOverloaded, api_limiter
+from services.instrumentation import InstrumentedRedis, endpoint_template, http_trace_config, operation
+from utils import json_codec
+from utils.json_codec import decode_response
+from utils.runtime import create_resolver
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s"
@@ -29,30 +35,34 @@ class TSUAuth:
     async def init_redis(self):
         if self.redis_tokens is None:
             if config.DEBUG is False:
-                self.redis_tokens = aioredis.from_url(
+                self.redis_tokens = InstrumentedRedis.from_url(
                     f"redis://:{config.REDIS_PASSWORD}@{config.REDIS_HOST}:{config.REDIS_PORT}/{config.REDIS_DB}",
                     decode_responses=True
                 )
             else:
-                self.redis_tokens = aioredis.from_url(
+                self.redis_tokens = InstrumentedRedis.from_url(
                     f"redis://{config.REDIS_HOST}:{config.REDIS_PORT}/{config.REDIS_DB}",
                     decode_responses=True
                 )
         if self.redis_flags is None:
             if config.DEBUG is False:
-                self.redis_flags = aioredis.from_url(
+                self.redis_flags = InstrumentedRedis.from_url(
                     f"redis://:{config.REDIS_PASSWORD}@{config.REDIS_HOST}:{config.REDIS_PORT}/{config.REDIS_DB + 1}",
                     decode_responses=True
                 )
             else:
-                self.redis_flags = aioredis.from_url(
+                self.redis_flags = InstrumentedRedis.from_url(
                     f"redis://{config.REDIS_HOST}:{config.REDIS_PORT}/{config.REDIS_DB + 1}",
                     decode_responses=True
                 )
 
     async def init_session(self):
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(resolver=create_resolver(config.DNS_RESOLVER)),
+                trace_configs=[http_trace_config()],
+                json_serialize=json_codec.dumps
+            )
 
     async def close_session(self):
         if self.session and not self.session.closed:
@@ -152,6 +162,8 @@ class TSUAuth:
         except aiohttp.ClientResponseError as e:
             if e.status == 401:
                 await self._delete_tokens()
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.warning(f"Failed to get role for {telegram_id}: {e}")
         return None
@@ -171,12 +183,20 @@ class TSUAuth:
             if e.status == 401:
                 await self._delete_tokens()
             logger.warning(f"Failed to get user name for {telegram_id}: {e}")
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.warning(f"Unexpected error while getting user name for {telegram_id}: {e}")
 
         return "", ""
 
     async def api_request(self, method: str, endpoint: str, **kwargs):
+        template = endpoint_template(endpoint)
+        with operation("tsu_call", template, method=method):
+            async with api_limiter.slot(template):
+                return await self._api_request(method, endpoint, **kwargs)
+
+    async def _api_request(self, method: str, endpoint: str, **kwargs):
         await self.load_tokens_if_needed()
         await self.init_session()
 
@@ -194,7 +214,7 @@ class TSUAuth:
                 return {}
             if resp.status in (200, 201):
                 try:
-                    return await resp.json()
+                    return await decode_response(resp)
                 except Exception:
                     return {}
             if resp.status == 401 and local_refresh:
@@ -210,19 +230,25 @@ class TSUAuth:
                         return {}
                     if retry_resp.status in (200, 201):
                         try:
-                            return await retry_resp.json()
+                            return await decode_response(retry_resp)
                         except Exception:
                             return {}
                     try:
-                        return await retry_resp.json()
+                        return await decode_response(retry_resp)
                     except Exception:
                         return {}
             try:
-                return await resp.json()
+                return await decode_response(resp)
             except Exception:
                 return {}
 
     async def api_request_with_status(self, method: str, endpoint: str, **kwargs) -> tuple[int, dict | list | str | None]:
+        template = endpoint_template(endpoint)
+        with operation("tsu_call", template, method=method):
+            async with api_limiter.slot(template):
+                return await self._api_request_with_status(method, endpoint, **kwargs)
+
+    async def _api_request_with_status(self, method: str, endpoint: str, **kwargs) -> tuple[int, dict | list | str | None]:
         await self.load_tokens_if_needed()
         await self.init_session()
 
@@ -241,7 +267,7 @@ class TSUAuth:
                 return status, {}
             if status in (200, 201):
                 try:
-                    return status, await resp.json()
+                    return status, await decode_response(resp)
                 except Exception:
                     return status, None
             if status == 401 and local_refresh:
@@ -257,11 +283,11 @@ class TSUAuth:
                     if retry_status == 204:
                         return retry_status, {}
                     try:
-                        return retry_status, await retry_resp.json()
+                        return retry_status, await decode_response(retry_resp)
                     except Exception:
                         return retry_status, await retry_resp.text()
             try:
-                return status, await resp.json()
+                return status, await decode_response(resp)
             except Exception:
                 return status, await resp.text()
 
@@ -274,7 +300,7 @@ class TSUAuth:
             if resp.status == 404:
                 await self._delete_tokens()
                 raise ValueError("User not registered")
-            data = await resp.json()
+            data = await decode_response(resp)
             access = data.get("access")
             refresh = data.get("refresh")
             await self._save_tokens_for(self.telegram_id, access, refresh)
@@ -293,7 +319,7 @@ class TSUAuth:
         await self.init_session()
         async with self.session.post(f"{self.BASE_URL}auth/refresh/", json={"refresh": token_to_use}) as resp:
             if resp.status == 200:
-                data = await resp.json()
+                data = await decode_response(resp)
                 new_access = data.get("access")
                 await self._save_tokens_for(owner_id or self.telegram_id, new_access)
             elif resp.status in (400, 404):
@@ -320,7 +346,7 @@ class TSUAuth:
             if resp.status not in (200, 201):
                 data = await resp.text()
                 raise ValueError(f"Registration error: {data}")
-            data = await resp.json()
+            data = await decode_response(resp)
             access = data.get("access")
             refresh = data.get("refresh")
             await self._save_tokens_for(self.telegram_id, access, refresh)
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from collections import Counter
+from contextvars import ContextVar
+
+from services import instrumentation
+from services.instrumentation import Operation
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateCalls:
+    __slots__ = ("handler", "backend", "redis")
+
+    def __init__(self):
+        self.handler = "unhandled"
+        self.backend: list[str] = []
+        self.redis: list[str] = []
+
+
+class HandlerStats:
+    __slots__ = ("updates", "backend", "redis", "max_backend", "max_redis", "over_budget")
+
+    def __init__(self):
+        self.updates = 0
+        self.backend = 0
+        self.redis = 0
+        self.max_backend = 0
+        self.max_redis = 0
+        self.over_budget = 0
+
+
+_current: ContextVar[UpdateCalls | None] = ContextVar("update_calls", default=None)
+
+
+class CallBudget:
+    def __init__(self, backend_budget: int, redis_budget: int, repeat_threshold: int = 2,
+                 report_interval: float = 300.0):
+        self.backend_budget = int(backend_budget)
+        self.redis_budget = int(redis_budget)
+        self.repeat_threshold = int(repeat_threshold)
+        self.report_interval = float(report_interval)
+        self.stats: dict[str, HandlerStats] = {}
+        self._task: asyncio.Task | None = None
+
+    def started(self, operation: Operation):
+        if operation.kind == "update":
+            operation.context["calls_token"] = _current.set(UpdateCalls())
+
+    def finished(self, operation: Operation):
+        calls = _current.get()
+        if calls is None:
+            return
+        if operation.kind == "tsu_api":
+            calls.backend.append(f"{operation.labels.get('method', '')} {operation.name}")
+        elif operation.kind == "redis":
+            calls.redis.append(operation.name)
+        elif operation.kind == "handler":
+            calls.handler = f"{operation.labels.get('router', '')}.{operation.name}"
+        elif operation.kind == "update":
+            try:
+                _current.reset(operation.context.pop("calls_token"))
+            except (KeyError, ValueError):
+                pass
+            self._account(calls)
+
+    def _account(self, calls: UpdateCalls):
+        stats = self.stats.get(calls.handler)
+        if stats is None:
+            stats = self.stats[calls.handler] = HandlerStats()
+        backend, redis = len(calls.backend), len(calls.redis)
+        stats.updates += 1
+        stats.backend += backend
+        stats.redis += redis
+        stats.max_backend = max(stats.max_backend, backend)
+        stats.max_redis = max(stats.max_redis, redis)
+
+        repeated = {call: n for call, n in Counter(calls.backend).items() if n >= self.repeat_threshold}
+        if repeated:
+            summary = ", ".join(f"{call} x{n}" for call, n in repeated.items())
+            logger.warning(f"Repeated backend calls in {calls.handler}: {summary}")
+
+        if backend > self.backend_budget or redis > self.redis_budget:
+            stats.over_budget += 1
+            logger.warning(
+                f"Call budget exceeded in {calls.handler}: "
+                f"{backend} backend calls (budget {self.backend_budget}), "
+                f"{redis} redis calls (budget {self.redis_budget})\n"
+                f"  backend: {', '.join(calls.backend) or '—'}\n"
+                f"  redis: {', '.join(calls.redis) or '—'}"
+            )
+
+    def report(self) -> str:
+        lines = [f"{'handler':<50}{'updates':>8}{'api avg':>9}{'api max':>9}{'redis avg':>11}{'redis max':>11}{'over':>6}"]
+        ordered = sorted(self.stats.items(), key=lambda item: item[1].backend / item[1].updates, reverse=True)
+        for handler, stats in ordered:
+            lines.append(
+                f"{handler:<50}{stats.updates:>8}{stats.backend / stats.updates:>9.1f}{stats.max_backend:>9}"
+                f"{stats.redis / stats.updates:>11.1f}{stats.max_redis:>11}{stats.over_budget:>6}"
+            )
+        return "\n".join(lines)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            if self.stats:
+                logger.info("Call budget report:\n" + self.report())
+
+    async def start(self):
+        if self._task:
+            return
+        instrumentation.add_listener(self)
+        self._task = asyncio.create_task(self._run(), name="call-budget-report")
+        logger.info(f"Call budget accounting enabled (backend {self.backend_budget}, redis {self.redis_budget})")
+
+    async def stop(self):
+        instrumentation.remove_listener(self)
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.stats:
+            logger.info("Call budget report:\n" + self.report())
@@ -1,7 +1,12 @@
 ﻿import logging
+from typing import AsyncIterator
 import aiohttp
 import config
+from models.consultation import Consultation, ConsultationRequest
+from services.api_limiter import BackendOverloaded
 from services.auth import auth
+from services.pagination import iterate_pages
+from services.reminders import consultation_reminders
 
 logger = logging.getLogger(__name__)
 
@@ -10,7 +15,7 @@ class TSUConsultations:
     BASE_URL = config.API_URL
 
     @staticmethod
-    async def book_consultation(telegram_id: int, consultation_id: int, request_text: str) -> str:
+    async def book_consultation(telegram_id: int, consultation_id: int, request_text: str, consultation: dict | None = None) -> str:
         auth.telegram_id = telegram_id
         await auth.init_redis()
         await auth.init_session()
@@ -24,6 +29,10 @@ class TSUConsultations:
                 json=payload
             )
             if status in (200, 201):
+                details = consultation or (data if isinstance(data, dict) else {})
+                await consultation_reminders.schedule(
+                    telegram_id, consultation_id, Consultation.from_api({**details, "id": consultation_id})
+                )
                 return "success"
             if status == 409:
                 return "conflict"
@@ -32,6 +41,8 @@ class TSUConsultations:
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error booking consultation {consultation_id}: {e}")
             return "error"
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error booking consultation {consultation_id}: {e}")
             return "error"
@@ -59,17 +70,30 @@ class TSUConsultations:
                     "current_page": data.get("current_page", 0),
                     "next": data.get("next"),
                     "previous": data.get("previous"),
-                    "results": data.get("results", [])
+                    "results": [Consultation.from_api(c) for c in data.get("results", [])]
                 }
             logger.error(f"Error getting consultations: HTTP {status} - {data}")
             return {"count": 0, "total_pages": 0, "current_page": 0, "next": None, "previous": None, "results": []}
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error getting consultations: {e}")
             return {"count": 0, "total_pages": 0, "current_page": 0, "next": None, "previous": None, "results": []}
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error getting consultations: {e}")
             return {"count": 0, "total_pages": 0, "current_page": 0, "next": None, "previous": None, "results": []}
 
+    @staticmethod
+    def iter_consultations(telegram_id: int, page_size: int = 50, is_closed: bool | None = None,
+                           limit: int | None = None, prefetch: bool = True) -> AsyncIterator[Consultation]:
+        return iterate_pages(
+            lambda page: TSUConsultations.get_consultations(telegram_id, page=page, page_size=page_size,
+                                                            is_closed=is_closed),
+            first_page=1,
+            limit=limit,
+            prefetch=prefetch
+        )
+
     async def cancel_booking(self, telegram_id: int, consultation_id: int) -> bool:
         auth.telegram_id = telegram_id
         await auth.init_redis()
@@ -81,13 +105,17 @@ class TSUConsultations:
                 "DELETE",
                 f"consultations/{consultation_id}/cancel/"
             )
+            if status == 204:
+                await consultation_reminders.cancel_booking(telegram_id, consultation_id)
             return status == 204
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error cancelling consultation {consultation_id}: {e}")
             return False
 
     @staticmethod
-    async def create_request(telegram_id: int, title: str, description: str) -> dict | None:
+    async def create_request(telegram_id: int, title: str, description: str) -> ConsultationRequest | None:
         auth.telegram_id = telegram_id
         await auth.init_redis()
         await auth.init_session()
@@ -105,12 +133,14 @@ class TSUConsultations:
                 json=payload
             )
             if status in (200, 201) and isinstance(data, dict):
-                return data
+                return ConsultationRequest.from_api(data)
             logger.error(f"Error creating consultation request: HTTP {status} - {data}")
             return None
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error creating consultation request: {e}")
             return None
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error creating consultation request: {e}")
             return None
@@ -136,17 +166,29 @@ class TSUConsultations:
                     "current_page": data.get("current_page", 0),
                     "next": data.get("next"),
                     "previous": data.get("previous"),
-                    "results": data.get("results", [])
+                    "results": [ConsultationRequest.from_api(r) for r in data.get("results", [])]
                 }
             logger.error(f"Error getting consultation requests: HTTP {status} - {data}")
             return {"count": 0, "total_pages": 0, "current_page": 0, "next": None, "previous": None, "results": []}
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error getting consultation requests: {e}")
             return {"count": 0, "total_pages": 0, "current_page": 0, "next": None, "previous": None, "results": []}
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error getting consultation requests: {e}")
             return {"count": 0, "total_pages": 0, "current_page": 0, "next": None, "previous": None, "results": []}
 
+    @staticmethod
+    def iter_requests(telegram_id: int, page_size: int = 50,
+                      limit: int | None = None, prefetch: bool = True) -> AsyncIterator[ConsultationRequest]:
+        return iterate_pages(
+            lambda page: TSUConsultations.get_requests(telegram_id, page=page, page_size=page_size),
+            first_page=1,
+            limit=limit,
+            prefetch=prefetch
+        )
+
     @staticmethod
     async def subscribe_request(telegram_id: int, request_id: int) -> bool:
         auth.telegram_id = telegram_id
@@ -163,6 +205,8 @@ class TSUConsultations:
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error subscribing to request {request_id}: {e}")
             return False
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error subscribing to request {request_id}: {e}")
             return False
@@ -183,6 +227,8 @@ class TSUConsultations:
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error unsubscribing from request {request_id}: {e}")
             return False
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error unsubscribing from request {request_id}: {e}")
             return False
@@ -195,7 +241,7 @@ class TSUConsultations:
         start_time: str,
         end_time: str,
         max_students: int
-    ) -> dict | None:
+    ) -> Consultation | None:
         auth.telegram_id = telegram_id
         await auth.init_redis()
         await auth.init_session()
@@ -216,12 +262,14 @@ class TSUConsultations:
                 json=payload
             )
             if status in (200, 201) and isinstance(data, dict):
-                return data
+                return Consultation.from_api(data)
             logger.error(f"Error creating consultation: HTTP {status} - {data}")
             return None
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error creating consultation: {e}")
             return None
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error creating consultation: {e}")
             return None
@@ -235,7 +283,7 @@ class TSUConsultations:
             start_time: str,
             end_time: str,
             max_students: int
-    ) -> dict | None:
+    ) -> Consultation | None:
         auth.telegram_id = telegram_id
         await auth.init_redis()
         await auth.init_session()
@@ -257,12 +305,14 @@ class TSUConsultations:
                 json=payload
             )
             if status in (200, 201) and isinstance(data, dict):
-                return data
+                return Consultation.from_api(data)
             logger.error(f"Error creating consultation from request {request_id}: HTTP {status} - {data}")
             return None
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error creating consultation from request {request_id}: {e}")
             return None
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error creating consultation from request {request_id}: {e}")
             return None
@@ -279,12 +329,15 @@ class TSUConsultations:
                 f"consultations/{consultation_id}/delete/"
             )
             if status in (200, 204):
+                await consultation_reminders.cancel_consultation(consultation_id)
                 return "success"
             logger.error(f"Error cancelling consultation {consultation_id}: HTTP {status} - {data}")
             return "error"
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error cancelling consultation {consultation_id}: {e}")
             return "error"
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error cancelling consultation {consultation_id}: {e}")
             return "error"
@@ -307,6 +360,8 @@ class TSUConsultations:
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error closing consultation {consultation_id}: {e}")
             return "error"
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error closing consultation {consultation_id}: {e}")
             return "error"
@@ -331,6 +386,8 @@ class TSUConsultations:
         except aiohttp.ClientError as e:
             logger.error(f"HTTP error getting consultation students {consultation_id}: {e}")
             return []
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Unexpected error getting consultation students {consultation_id}: {e}")
             return []
@@ -1,4 +1,5 @@
 ﻿import logging
+from services.api_limiter import BackendOverloaded
 from services.auth import auth
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,8 @@ class DeanCredentials:
                 logger.error(f"Unexpected status {status} when adding credentials for telegram_id={telegram_id}")
                 return False, "Ошибка при добавлении учетных данных"
 
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error adding credentials for telegram_id={telegram_id}: {e}")
             return False, "Произошла ошибка при добавлении учетных данных"
@@ -62,6 +65,8 @@ class DeanCredentials:
                 logger.error(f"Unexpected status {status} when changing email for telegram_id={telegram_id}")
                 return False, "Ошибка при изменении email"
 
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error changing email for telegram_id={telegram_id}: {e}")
             return False, "Произошла ошибка при изменении email"
@@ -94,6 +99,8 @@ class DeanCredentials:
                 logger.error(f"Unexpected status {status} when changing password for telegram_id={telegram_id}")
                 return False, "Ошибка при изменении пароля"
 
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error changing password for telegram_id={telegram_id}: {e}")
             return False, "Произошла ошибка при изменении пароля"
@@ -111,6 +118,8 @@ class DeanCredentials:
 
             return email and not email.endswith("@telegram.local")
 
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error checking credentials for telegram_id={telegram_id}: {e}")
             return False
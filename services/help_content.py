@@ -1,82 +1,270 @@
 ﻿import asyncio
-import json
-import time
+import hashlib
+import os
+import signal
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 
+import config
+from services.auth import auth
+from utils import json_codec
+
+PUBLISH_SCRIPT = """
+if ARGV[4] == '1' and redis.call('HEXISTS', KEYS[1], 'data') == 1 then
+    return 0
+end
+local version = redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('HSET', KEYS[1], 'data', ARGV[1], 'hash', ARGV[3])
+redis.call('PUBLISH', ARGV[2], version)
+return version
+"""
+
+EMPTY_CONTENT: Dict[str, Any] = {"sections": [], "content": {}}
+
+KNOWN_AUDIENCES = (
+    (None, None),
+    ("student", None),
+    ("dean", None),
+    ("teacher", None),
+    ("teacher", "active"),
+    ("teacher", "pending")
+)
+
+
+class HelpSnapshot:
+    def __init__(self, raw: Dict[str, Any], mtime: float | None = None, version: int = 0, digest: str | None = None):
+        self.raw = raw
+        self.mtime = mtime
+        self.version = version
+        self.digest = digest
+        self.content: Dict[str, str] = raw.get("content", {})
+        self.sections: Dict[Tuple[str | None, str | None], List[Tuple[str, str]]] = {}
+        self.flow_steps: Dict[str, int] = {}
+        for key in self.content:
+            scenario, sep, step = key.partition("_step_")
+            if sep and step.isdigit():
+                self.flow_steps[scenario] = max(self.flow_steps.get(scenario, 0), int(step))
+        for role, teacher_status in KNOWN_AUDIENCES:
+            self.get_sections(role, teacher_status)
+
+    @staticmethod
+    def audience(role: str | None, teacher_status: str | None) -> Tuple[str | None, str | None]:
+        return role, teacher_status if role == "teacher" else None
+
+    def get_sections(self, role: str | None, teacher_status: str | None = None) -> List[Tuple[str, str]]:
+        audience = self.audience(role, teacher_status)
+        sections = self.sections.get(audience)
+        if sections is None:
+            sections = []
+            for sec in self.raw.get("sections", []):
+                key = sec.get("key")
+                title = sec.get("title", key)
+                visibility = sec.get("visible", ["all"]) or ["all"]
+                if _is_visible(visibility, *audience):
+                    sections.append((key, title))
+            self.sections[audience] = sections
+        return sections
+
+
+def _is_visible(visibility: List[str], role: str | None, teacher_status: str | None) -> bool:
+    for token in visibility:
+        if token == "all":
+            return True
+        if token == "guest" and role is None:
+            return True
+        if token == "student" and role == "student":
+            return True
+        if token == "teacher" and role == "teacher":
+            return True
+        if token == "teacher_active" and role == "teacher" and teacher_status == "active":
+            return True
+        if token == "non_teacher" and role is not None and role != "teacher":
+            return True
+    return False
+
 
 class HelpContent:
-    def __init__(self, file_path: str | None = None, ttl: float = 2.0):
+    def __init__(
+        self,
+        file_path: str | None = None,
+        watch_interval: float = 0.0,
+        sync: bool = True,
+        key: str = "help_content"
+    ):
         root = Path(__file__).resolve().parents[1]
         self.file_path = Path(file_path) if file_path else root / "data" / "help_content.json"
-        self._ttl = float(ttl)
-        self._cache: Dict[str, Any] | None = None
-        self._cache_time: float = 0.0
+        self._watch_interval = float(watch_interval)
+        self.sync = sync
+        self.key = key
+        self.channel = f"{key}:updates"
+        self._snapshot: HelpSnapshot | None = None
         self._lock = asyncio.Lock()
-        self._last_good: Dict[str, Any] | None = None
+        self._task: asyncio.Task | None = None
+        self._subscriber: asyncio.Task | None = None
 
-    def _read_file(self) -> Dict[str, Any]:
-        if not self.file_path.exists():
-            return {"sections": [], "content": {}}
-        with open(self.file_path, "r", encoding="utf-8-sig") as f:
-            return json.load(f)
+    def _mtime(self) -> float | None:
+        try:
+            return os.stat(self.file_path).st_mtime
+        except OSError:
+            return None
 
-    async def _load_and_cache(self) -> Dict[str, Any]:
+    def _read_file(self) -> HelpSnapshot:
+        mtime = self._mtime()
+        if mtime is None:
+            return HelpSnapshot(EMPTY_CONTENT, None)
+        with open(self.file_path, "rb") as f:
+            content = f.read()
+        digest = hashlib.sha256(content).hexdigest()
+        return HelpSnapshot(json_codec.loads(content.decode("utf-8-sig")), mtime, digest=digest)
+
+    async def _load_file(self) -> HelpSnapshot | None:
         try:
-            data = await asyncio.to_thread(self._read_file)
-            self._cache = data
-            self._cache_time = time.time()
-            self._last_good = data
-            return data
+            return await asyncio.to_thread(self._read_file)
         except Exception as e:
             print(f"[HelpContent] failed to load json: {e}")
-            if self._last_good is not None:
-                self._cache = self._last_good
-                self._cache_time = time.time()
-                return self._last_good
-            return {"sections": [], "content": {}}
+            return None
 
-    async def get_raw(self) -> Dict[str, Any]:
-        now = time.time()
-        if self._cache is not None and (now - self._cache_time) < self._ttl:
-            return self._cache
-        
+    async def reload(self) -> HelpSnapshot | None:
         async with self._lock:
-            now = time.time()
-            if self._cache is not None and (now - self._cache_time) < self._ttl:
-                return self._cache
-            return await self._load_and_cache()
+            snapshot = await self._load_file()
+            if snapshot is not None:
+                self._snapshot = snapshot
+            elif self._snapshot is None:
+                self._snapshot = HelpSnapshot(EMPTY_CONTENT, None)
+            return snapshot
+
+    async def snapshot(self) -> HelpSnapshot:
+        if self._snapshot is None:
+            await self.reload()
+        return self._snapshot
+
+    def _apply(self, data: str, version: int, digest: str | None = None) -> bool:
+        current = self._snapshot
+        if current is not None and current.version >= version:
+            return False
+        self._snapshot = HelpSnapshot(json_codec.loads(data), version=version, digest=digest)
+        return True
+
+    async def publish(self, snapshot: HelpSnapshot | None = None, seed: bool = False) -> int | None:
+        if snapshot is None:
+            snapshot = await self._load_file()
+            if snapshot is None:
+                return None
+        if snapshot.digest is None:
+            print(f"[HelpContent] {self.file_path} not found, nothing to publish")
+            return None
+        data = json_codec.dumps(snapshot.raw)
+        try:
+            await auth.init_redis()
+            version = await auth.redis_flags.eval(
+                PUBLISH_SCRIPT, 1, self.key, data, self.channel, snapshot.digest, int(seed)
+            )
+        except Exception as e:
+            print(f"[HelpContent] failed to publish to redis: {e}")
+            return None
+        if not version:
+            return None
+        self._apply(data, int(version), snapshot.digest)
+        return int(version)
+
+    async def pull(self) -> str | None:
+        try:
+            await auth.init_redis()
+            stored = await auth.redis_flags.hmget(self.key, "version", "data", "hash")
+        except Exception as e:
+            print(f"[HelpContent] failed to read from redis: {e}")
+            return None
+        version, data, digest = stored
+        if not version or not data:
+            return None
+        try:
+            self._apply(data, int(version), digest)
+        except (ValueError, TypeError) as e:
+            print(f"[HelpContent] invalid content in redis (version {version}): {e}")
+        return digest or ""
+
+    async def _sync_on_start(self) -> bool:
+        if await self.pull() is not None:
+            return True
+        local = await self._load_file()
+        if local is None or local.digest is None:
+            return False
+        print(f"[HelpContent] no shared copy in redis, seeding it from {self.file_path}")
+        if await self.publish(local, seed=True) is not None:
+            return True
+        return await self.pull() is not None
+
+    async def _subscribe(self):
+        while True:
+            pubsub = auth.redis_flags.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                await self.pull()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    current = self._snapshot
+                    if current is None or int(message["data"]) > current.version:
+                        await self.pull()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[HelpContent] subscription error: {e}")
+                await asyncio.sleep(5)
+            finally:
+                await pubsub.aclose()
+
+    def request_reload(self):
+        asyncio.get_running_loop().create_task(self.publish() if self.sync else self.reload())
+
+    async def start(self):
+        if not self.sync or not await self._sync_on_start():
+            await self.reload()
+        if self.sync and not self._subscriber:
+            self._subscriber = asyncio.create_task(self._subscribe(), name="help-content-sync")
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, self.request_reload)
+        except (NotImplementedError, AttributeError, RuntimeError):
+            pass
+        if self._watch_interval > 0 and not self._task:
+            self._task = asyncio.create_task(self._watch(), name="help-content-watch")
+
+    async def stop(self):
+        try:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+        except (NotImplementedError, AttributeError, RuntimeError):
+            pass
+        tasks = [task for task in (self._task, self._subscriber) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._subscriber = None
+
+    async def _watch(self):
+        last_mtime = self._mtime()
+        while True:
+            await asyncio.sleep(self._watch_interval)
+            mtime = self._mtime()
+            if mtime != last_mtime:
+                if await (self.publish() if self.sync else self.reload()) is not None:
+                    last_mtime = mtime
+
+    async def get_raw(self) -> Dict[str, Any]:
+        return (await self.snapshot()).raw
 
     async def get_sections(self, role: str | None, teacher_status: str | None = None) -> List[Tuple[str, str]]:
-        raw = await self.get_raw()
-        sections: List[Tuple[str, str]] = []
-        for sec in raw.get("sections", []):
-            key = sec.get("key")
-            title = sec.get("title", key)
-            visibility = sec.get("visible", ["all"]) or ["all"]
-            if self._is_visible(visibility, role, teacher_status):
-                sections.append((key, title))
-        return sections
+        return (await self.snapshot()).get_sections(role, teacher_status)
 
-    def _is_visible(self, visibility: List[str], role: str | None, teacher_status: str | None) -> bool:
-        for token in visibility:
-            if token == "all":
-                return True
-            if token == "guest" and role is None:
-                return True
-            if token == "student" and role == "student":
-                return True
-            if token == "teacher" and role == "teacher":
-                return True
-            if token == "teacher_active" and role == "teacher" and teacher_status == "active":
-                return True
-            if token == "non_teacher" and role is not None and role != "teacher":
-                return True
-        return False
+    async def get_flow_steps(self, scenario: str) -> int:
+        return (await self.snapshot()).flow_steps.get(scenario, 0)
 
     async def get_section_text(self, key: str) -> str:
-        raw = await self.get_raw()
-        return raw.get("content", {}).get(key, "")
+        return (await self.snapshot()).content.get(key, "")
+
+
+help_content = HelpContent(watch_interval=config.HELP_CONTENT_WATCH_INTERVAL, sync=config.HELP_CONTENT_SYNC)
 
 
-help_content = HelpContent()
+if __name__ == "__main__":
+    print(f"[HelpContent] published version {asyncio.run(help_content.publish())}")
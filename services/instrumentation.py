@@ -0,0 +1,128 @@
+import re
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Any, Protocol
+from urllib.parse import urlsplit
+
+import aiohttp
+from redis import asyncio as aioredis
+
+import config
+
+_NUMERIC_SEGMENT = re.compile(r"(?<=/)\d+(?=/|$)")
+
+
+class Operation:
+    __slots__ = ("kind", "name", "labels", "started", "duration", "error", "context")
+
+    def __init__(self, kind: str, name: str, labels: dict[str, Any]):
+        self.kind = kind
+        self.name = name
+        self.labels = labels
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.error: BaseException | None = None
+        self.context: dict[str, Any] = {}
+
+
+class Listener(Protocol):
+    def started(self, operation: Operation): ...
+
+    def finished(self, operation: Operation): ...
+
+
+_listeners: list[Listener] = []
+
+
+def add_listener(listener: Listener):
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: Listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def begin(kind: str, name: str, **labels) -> Operation | None:
+    if not _listeners:
+        return None
+    operation = Operation(kind, name, labels)
+    for listener in _listeners:
+        listener.started(operation)
+    return operation
+
+
+def end(operation: Operation | None, error: BaseException | None = None):
+    if operation is None:
+        return
+    operation.duration = time.perf_counter() - operation.started
+    operation.error = error
+    for listener in reversed(_listeners):
+        listener.finished(operation)
+
+
+@contextmanager
+def operation(kind: str, name: str, **labels):
+    current = begin(kind, name, **labels)
+    try:
+        yield current
+    except BaseException as e:
+        end(current, e)
+        raise
+    end(current)
+
+
+def endpoint_template(url) -> str:
+    url = str(url)
+    base = config.API_URL or ""
+    path = url[len(base):] if base and url.startswith(base) else urlsplit(url).path.lstrip("/")
+    path = path.split("?", 1)[0]
+    return _NUMERIC_SEGMENT.sub("{id}", "/" + path)[1:]
+
+
+async def _on_request_start(session, trace_config_ctx: SimpleNamespace, params: aiohttp.TraceRequestStartParams):
+    trace_config_ctx.operation = begin("tsu_api", endpoint_template(params.url), method=params.method)
+
+
+async def _on_request_end(session, trace_config_ctx: SimpleNamespace, params: aiohttp.TraceRequestEndParams):
+    current = getattr(trace_config_ctx, "operation", None)
+    if current is not None:
+        current.labels["status"] = str(params.response.status)
+    end(current)
+
+
+async def _on_request_exception(session, trace_config_ctx: SimpleNamespace,
+                                params: aiohttp.TraceRequestExceptionParams):
+    current = getattr(trace_config_ctx, "operation", None)
+    if current is not None:
+        current.labels["status"] = "error"
+    end(current, params.exception)
+
+
+def http_trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.on_request_exception.append(_on_request_exception)
+    return trace_config
+
+
+class InstrumentedRedis(aioredis.Redis):
+    async def execute_command(self, *args, **options):
+        if not _listeners:
+            return await super().execute_command(*args, **options)
+        with operation("redis", str(args[0]).upper()):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Any = None):
+        pipe = super().pipeline(transaction=transaction, shard_hint=shard_hint)
+        execute = pipe.execute
+
+        async def instrumented_execute(raise_on_error: bool = True):
+            with operation("redis", "PIPELINE" if not transaction else "MULTI", commands=len(pipe.command_stack)):
+                return await execute(raise_on_error=raise_on_error)
+
+        pipe.execute = instrumented_execute
+        return pipe
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+from services import instrumentation
+from services.instrumentation import Operation
+from services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+HANDLERS_DIR = f"{os.sep}handlers{os.sep}"
+STACK_DEPTH = 8
+
+
+def handler_from_stack(stack: traceback.StackSummary) -> str | None:
+    for frame in reversed(stack):
+        if HANDLERS_DIR in frame.filename:
+            return f"{os.path.splitext(os.path.basename(frame.filename))[0]}.{frame.name}"
+    return None
+
+
+class InFlightFilter(logging.Filter):
+    def __init__(self, monitor: "LoopMonitor"):
+        super().__init__()
+        self.monitor = monitor
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.msg, str) and record.msg.startswith("Executing"):
+            in_flight = ", ".join(sorted(set(self.monitor.in_flight.values()))) or "—"
+            record.msg = f"{record.msg} [handlers in flight: {in_flight}]"
+        return True
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = 0.5, slow_threshold: float = 0.1, debug: bool = False,
+                 report_interval: float = 300.0):
+        self.interval = float(interval)
+        self.slow_threshold = float(slow_threshold)
+        self.debug = debug
+        self.report_interval = float(report_interval)
+        self.in_flight: dict[int, str] = {}
+        self.blocked: Counter = Counter()
+        self._lags: list[float] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._filter = InFlightFilter(self)
+
+    def started(self, operation: Operation):
+        if operation.kind == "handler":
+            self.in_flight[id(operation)] = f"{operation.labels.get('router', '')}.{operation.name}"
+
+    def finished(self, operation: Operation):
+        if operation.kind == "handler":
+            self.in_flight.pop(id(operation), None)
+
+    async def _probe(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - started - self.interval, 0.0)
+            self._lags.append(lag)
+            metrics.loop_lag.observe(lag)
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_interval)
+            lags, self._lags = sorted(self._lags), []
+            if not lags:
+                continue
+            p50, p99 = lags[len(lags) // 2], lags[min(int(len(lags) * 0.99), len(lags) - 1)]
+            summary = ", ".join(f"{name} x{count}" for name, count in self.blocked.most_common(5)) or "—"
+            logger.info(
+                f"Event loop lag: p50 {p50 * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms, max {lags[-1] * 1000:.1f} ms; "
+                f"blocking handlers: {summary}"
+            )
+
+    def _record_block(self, handler: str, duration: float, stack: list[str]):
+        self.blocked[handler] += 1
+        metrics.loop_blocked.inc(handler=handler)
+        logger.warning(
+            f"Event loop blocked for {duration * 1000:.0f} ms in {handler}\n" + "".join(stack)
+        )
+
+    def _check(self) -> bool:
+        answered = threading.Event()
+        sent = time.monotonic()
+        try:
+            self._loop.call_soon_threadsafe(answered.set)
+        except RuntimeError:
+            return False
+        if not answered.wait(self.slow_threshold):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = traceback.extract_stack(frame) if frame is not None else traceback.StackSummary()
+            in_flight = ", ".join(sorted(set(tuple(self.in_flight.copy().values()))))
+            handler = handler_from_stack(stack) or (f"in flight: {in_flight}" if in_flight else "unknown")
+            while not answered.wait(1.0):
+                if self._stopping.is_set():
+                    return False
+            duration = time.monotonic() - sent
+            try:
+                self._loop.call_soon_threadsafe(
+                    self._record_block, handler, duration, traceback.format_list(stack[-STACK_DEPTH:])
+                )
+            except RuntimeError:
+                return False
+        return True
+
+    def _watch(self):
+        while not self._stopping.is_set():
+            try:
+                if not self._check():
+                    return
+            except Exception:
+                logger.exception("Event loop watchdog error")
+            self._stopping.wait(self.interval)
+
+    async def start(self):
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        instrumentation.add_listener(self)
+        if self.debug:
+            self._loop.set_debug(True)
+            self._loop.slow_callback_duration = self.slow_threshold
+            logging.getLogger("asyncio").addFilter(self._filter)
+        self._tasks = [
+            asyncio.create_task(self._probe(), name="loop-lag-probe"),
+            asyncio.create_task(self._report(), name="loop-lag-report")
+        ]
+        self._stopping.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started (interval {self.interval}s, slow threshold {self.slow_threshold * 1000:.0f} ms"
+            f"{', asyncio debug' if self.debug else ''})"
+        )
+
+    async def stop(self):
+        self._stopping.set()
+        instrumentation.remove_listener(self)
+        logging.getLogger("asyncio").removeFilter(self._filter)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._watchdog:
+            await asyncio.to_thread(self._watchdog.join, 2.0)
+            self._watchdog = None
@@ -0,0 +1,117 @@
+﻿import asyncio
+import heapq
+import logging
+import time
+from collections import defaultdict
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+
+import config
+from services.auth import auth
+
+logger = logging.getLogger(__name__)
+
+POP_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+"""
+
+BULK_DELETE_LIMIT = 100
+
+
+class MessageCleanup:
+    def __init__(self, key: str = "message_cleanup", tick: float = 1.0, batch_size: int = 500):
+        self.key = key
+        self.tick = float(tick)
+        self.batch_size = int(batch_size)
+        self._local: list[tuple[float, int, int]] = []
+        self._task: asyncio.Task | None = None
+        self._pop_due = None
+        self._bot: Optional[Bot] = None
+
+    async def delete_later(self, chat_id: int, message_id: int | None, delay: float = 5):
+        if not message_id:
+            return
+        due = time.time() + delay
+        try:
+            await auth.init_redis()
+            await auth.redis_flags.zadd(self.key, {f"{chat_id}:{message_id}": due})
+        except Exception as e:
+            logger.warning(f"Redis error (delete_later), keeping message {message_id} in memory: {e}")
+            heapq.heappush(self._local, (due, chat_id, message_id))
+
+    async def start(self, bot: Bot):
+        if self._task:
+            return
+        self._bot = bot
+        await auth.init_redis()
+        self._pop_due = auth.redis_flags.register_script(POP_DUE_SCRIPT)
+        self._task = asyncio.create_task(self._run(), name="message-cleanup")
+
+    async def stop(self):
+        if not self._task:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _collect_due(self, now: float) -> dict[int, list[int]]:
+        due: dict[int, list[int]] = defaultdict(list)
+        while self._local and self._local[0][0] <= now:
+            _, chat_id, message_id = heapq.heappop(self._local)
+            due[chat_id].append(message_id)
+        try:
+            members = await self._pop_due(keys=[self.key], args=[now, self.batch_size])
+        except Exception as e:
+            logger.error(f"Redis error (message cleanup): {e}")
+            members = []
+        for member in members:
+            chat_id, _, message_id = member.rpartition(":")
+            due[int(chat_id)].append(int(message_id))
+        return due
+
+    async def _requeue(self, chat_id: int, message_ids: list[int], due: float):
+        try:
+            await auth.init_redis()
+            await auth.redis_flags.zadd(self.key, {f"{chat_id}:{message_id}": due for message_id in message_ids})
+        except Exception as e:
+            logger.warning(f"Redis error (message cleanup requeue), keeping {len(message_ids)} messages in memory: {e}")
+            for message_id in message_ids:
+                heapq.heappush(self._local, (due, chat_id, message_id))
+
+    async def _flush(self, due: dict[int, list[int]]):
+        for chat_id, message_ids in due.items():
+            for i in range(0, len(message_ids), BULK_DELETE_LIMIT):
+                chunk = message_ids[i:i + BULK_DELETE_LIMIT]
+                try:
+                    if len(chunk) == 1:
+                        await self._bot.delete_message(chat_id=chat_id, message_id=chunk[0])
+                    else:
+                        await self._bot.delete_messages(chat_id=chat_id, message_ids=chunk)
+                except asyncio.CancelledError:
+                    raise
+                except TelegramRetryAfter as e:
+                    logger.info(f"Flood control in chat {chat_id}, retrying {len(chunk)} deletions in {e.retry_after} s")
+                    await self._requeue(chat_id, chunk, time.time() + e.retry_after)
+                except Exception as e:
+                    logger.warning(f"Unable to delete messages {chunk} in chat {chat_id}: {e}")
+
+    async def _run(self):
+        while True:
+            try:
+                due = await self._collect_due(time.time())
+                if due:
+                    await self._flush(due)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Message cleanup error: {e}")
+            await asyncio.sleep(self.tick)
+
+
+message_cleanup = MessageCleanup(tick=config.MESSAGE_CLEANUP_TICK)
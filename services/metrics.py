@@ -0,0 +1,248 @@
+import logging
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+from aiohttp import web
+
+from services import instrumentation
+from services.instrumentation import Operation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+    def samples(self) -> list[str]:
+        return []
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in self._values.items()]
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            state[0][index] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 collect: Callable[[], Iterable[tuple[tuple, float]]] | None = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def samples(self) -> list[str]:
+        values = dict(self._values)
+        if self._collect:
+            try:
+                values.update(self._collect())
+            except Exception as e:
+                logger.warning(f"Failed to collect gauge {self.name}: {e}")
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {value}" for key, value in values.items()]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class BotMetrics:
+    def __init__(self):
+        self.registry = MetricsRegistry()
+        self.handler_duration = self.registry.register(Histogram(
+            "bot_handler_duration_seconds", "Handler execution time", ("router", "action")
+        ))
+        self.handler_errors = self.registry.register(Counter(
+            "bot_handler_errors_total", "Handlers that raised", ("router", "action")
+        ))
+        self.api_duration = self.registry.register(Histogram(
+            "tsu_api_request_duration_seconds", "TSU API request time", ("method", "endpoint")
+        ))
+        self.api_responses = self.registry.register(Counter(
+            "tsu_api_responses_total", "TSU API responses by status", ("method", "endpoint", "status")
+        ))
+        self.redis_duration = self.registry.register(Histogram(
+            "redis_command_duration_seconds", "Redis command time", ("command",),
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+        ))
+        self.telegram_requests = self.registry.register(Counter(
+            "telegram_api_requests_total", "Outbound Bot API calls", ("method", "result")
+        ))
+        self.telegram_duration = self.registry.register(Histogram(
+            "telegram_api_request_duration_seconds", "Outbound Bot API call time", ("method",)
+        ))
+        self.loop_lag = self.registry.register(Histogram(
+            "event_loop_lag_seconds", "Delay of a periodic event loop probe",
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+        ))
+        self.loop_blocked = self.registry.register(Counter(
+            "event_loop_blocked_total", "Times the event loop was blocked past the slow threshold", ("handler",)
+        ))
+        self.api_queue_time = self.registry.register(Histogram(
+            "tsu_api_queue_seconds", "Time a TSU API request waited for a concurrency slot", ("endpoint_class",),
+            buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+        ))
+        self.api_shed = self.registry.register(Counter(
+            "tsu_api_shed_total", "TSU API requests rejected by load shedding", ("endpoint_class", "reason")
+        ))
+        self._limiters: list = []
+        self.registry.register(Gauge(
+            "tsu_api_requests", "TSU API requests queued or in flight", ("endpoint_class", "state"),
+            collect=self._collect_limiters
+        ))
+        self._storages: list = []
+        self.registry.register(Gauge(
+            "fsm_storage_keys", "Chats with FSM data in memory", ("kind",), collect=self._collect_storage
+        ))
+        self._runner: web.AppRunner | None = None
+
+    def track_limiter(self, limiter):
+        self._limiters.append(limiter)
+
+    def _collect_limiters(self) -> list[tuple[tuple, float]]:
+        return [sample for limiter in self._limiters for sample in limiter.collect()]
+
+    def track_storage(self, storage):
+        self._storages.append(storage)
+
+    def _collect_storage(self) -> list[tuple[tuple, float]]:
+        keys = states = 0
+        for storage in self._storages:
+            records = getattr(storage, "storage", None)
+            if records is None:
+                continue
+            for record in list(records.values()):
+                keys += 1
+                if getattr(record, "state", None):
+                    states += 1
+        return [(("keys",), keys), (("with_state",), states)]
+
+    def started(self, operation: Operation):
+        pass
+
+    def finished(self, operation: Operation):
+        labels = operation.labels
+        if operation.kind == "handler":
+            router = labels.get("router", "")
+            self.handler_duration.observe(operation.duration, router=router, action=operation.name)
+            if operation.error is not None:
+                self.handler_errors.inc(router=router, action=operation.name)
+        elif operation.kind == "tsu_api":
+            method = labels.get("method", "")
+            self.api_duration.observe(operation.duration, method=method, endpoint=operation.name)
+            self.api_responses.inc(method=method, endpoint=operation.name, status=labels.get("status", "error"))
+        elif operation.kind == "redis":
+            self.redis_duration.observe(operation.duration, command=operation.name)
+        elif operation.kind == "telegram":
+            result = "error" if operation.error is not None else "ok"
+            self.telegram_requests.inc(method=operation.name, result=result)
+            self.telegram_duration.observe(operation.duration, method=operation.name)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render().encode(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+        )
+
+    async def start(self, host: str, port: int):
+        if self._runner:
+            return
+        instrumentation.add_listener(self)
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        logger.info(f"Metrics available at http://{host}:{port}/metrics")
+
+    async def stop(self):
+        instrumentation.remove_listener(self)
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+metrics = BotMetrics()
@@ -0,0 +1,46 @@
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+async def iterate_pages(fetch_page: Callable[[int], Awaitable[dict[str, Any]]], first_page: int = 1,
+                        limit: int | None = None, prefetch: bool = True) -> AsyncIterator[Any]:
+    page = first_page
+    yielded = 0
+    pending: asyncio.Task | None = None
+    next_page: int | None = first_page
+    try:
+        while next_page is not None:
+            if pending is not None:
+                data = await pending
+                pending = None
+            else:
+                data = await fetch_page(next_page)
+            page, next_page = next_page, None
+            results = data.get("results", [])
+            if limit is not None:
+                results = results[:limit - yielded]
+            total_pages = data.get("total_pages") or 1
+            has_next = results and page - first_page + 1 < total_pages
+            if has_next and (limit is None or yielded + len(results) < limit):
+                next_page = page + 1
+                if prefetch:
+                    pending = asyncio.create_task(fetch_page(next_page))
+            for item in results:
+                yield item
+            yielded += len(results)
+    finally:
+        if pending is not None:
+            pending.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await pending
+
+
+async def first(items: AsyncIterator[T], predicate: Callable[[T], bool]) -> T | None:
+    async with contextlib.aclosing(items):
+        async for item in items:
+            if predicate(item):
+                return item
+    return None
@@ -1,4 +1,7 @@
-import logging
+﻿import logging
+
+from models.user import Profile
+from services.api_limiter import BackendOverloaded
 from services.auth import auth
 
 logger = logging.getLogger(__name__)
@@ -6,7 +9,7 @@ logger = logging.getLogger(__name__)
 
 class TSUProfile:
     @staticmethod
-    async def get_profile(telegram_id: int) -> dict | None:
+    async def get_profile(telegram_id: int) -> Profile | None:
         try:
             auth.telegram_id = telegram_id
             await auth.init_redis()
@@ -19,7 +22,9 @@ class TSUProfile:
                 logger.warning(f"Profile not found for telegram_id={telegram_id}")
                 return None
 
-            return response
+            return Profile.from_api(response)
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error retrieving telegram_id profile={telegram_id}: {e}")
             return None
@@ -27,8 +32,10 @@ class TSUProfile:
     async def get_teacher_status(self, telegram_id: int) -> str | None:
         try:
             profile_data = await self.get_profile(telegram_id)
-            if profile_data and profile_data.get("role") == "teacher":
-                return profile_data.get("status")
+            if profile_data and profile_data.role == "teacher":
+                return profile_data.status or None
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error obtaining teacher status: {e}")
         return None
@@ -36,8 +43,10 @@ class TSUProfile:
     async def get_dean_status(self, telegram_id: int) -> str | None:
         try:
             profile_data = await self.get_profile(telegram_id)
-            if profile_data and profile_data.get("role") == "dean":
-                return profile_data.get("status")
+            if profile_data and profile_data.role == "dean":
+                return profile_data.status or None
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error obtaining dean status: {e}")
         return None
@@ -62,6 +71,8 @@ class TSUProfile:
                 return True
             else:
                 logger.warning(f"Error updating name for telegram_id={telegram_id}: {response}")
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error updating name for telegram_id={telegram_id}: {e}")
         return False
@@ -71,13 +82,20 @@ class TSUProfile:
         if not user_data:
             return "❌ Профиль не найден. Попробуйте войти снова."
 
-        username = user_data.get("username", "—")
-        first_name = user_data.get("first_name", "—")
-        last_name = user_data.get("last_name", "—")
-        role = user_data.get("role", "—")
-        phone_number = user_data.get("phone_number", "—")
-        status = user_data.get("status", "—")
-        email = user_data.get("email", "")
+        calendar_connected = False
+        if user_data.role in ("teacher", "dean"):
+            calendar_connected = await TSUProfile.is_calendar_connected(telegram_id)
+        return TSUProfile.render_profile_text(user_data, calendar_connected)
+
+    @staticmethod
+    def render_profile_text(user_data: Profile, calendar_connected: bool = False) -> str:
+        username = user_data.username
+        first_name = user_data.first_name or "—"
+        last_name = user_data.last_name or "—"
+        role = user_data.role
+        phone_number = user_data.phone_number or "—"
+        status = user_data.status or "—"
+        email = user_data.email
 
         phone_display = phone_number if phone_number.startswith("+") else f"+{phone_number}"
 
@@ -90,10 +108,9 @@ class TSUProfile:
         }
         status_text = status_translation.get(status, status)
 
-        if role == "teacher":
-            is_calendar_connected = await TSUProfile.is_calendar_connected(telegram_id)
-            calendar_status = "✅" if is_calendar_connected else "❌"
+        calendar_status = "✅" if calendar_connected else "❌"
 
+        if role == "teacher":
             profile_text = (
                 f"👤 <b>Мой профиль</b>\n\n"
                 f"🪪 <b>Имя:</b> {first_name} {last_name}\n"
@@ -113,9 +130,6 @@ class TSUProfile:
             if show_email:
                 profile_text += f"📧 <b>Email:</b> {email}\n"
 
-            is_calendar_connected = await TSUProfile.is_calendar_connected(telegram_id)
-            calendar_status = "✅" if is_calendar_connected else "❌"
-
             profile_text += (
                 f"🎓 <b>Роль:</b> Деканат\n"
                 f"📌 <b>Статус:</b> {status_text}\n"
@@ -143,6 +157,8 @@ class TSUProfile:
             response = await auth.api_request("POST", "profile/approval/resubmit/")
 
             return bool(response)
+        except BackendOverloaded:
+            raise
         except Exception as e:
             import logging
             logging.error(f"Error resubmitting teacher request for telegram_id={telegram_id}: {e}")
@@ -159,6 +175,8 @@ class TSUProfile:
             response = await auth.api_request("POST", "profile/approval/resubmit/dean/")
 
             return bool(response)
+        except BackendOverloaded:
+            raise
         except Exception as e:
             import logging
             logging.error(f"Error resubmitting dean request for telegram_id={telegram_id}: {e}")
@@ -178,6 +196,8 @@ class TSUProfile:
                 return response["authorization_url"]
 
             logger.warning(f"Failed to get calendar auth URL for telegram_id={telegram_id}. Response: {response}")
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error getting calendar auth URL for telegram_id={telegram_id}: {e}")
         return None
@@ -192,6 +212,8 @@ class TSUProfile:
 
             response = await auth.api_request("DELETE", "profile/calendar/disconnect/")
             return bool(response)
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error disconnecting calendar for telegram_id={telegram_id}: {e}")
             return False
@@ -0,0 +1,105 @@
+import asyncio
+import cProfile
+import logging
+import pstats
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class HandlerProfiler:
+    def __init__(self, sample_rate: float = 0.0, directory: str = "profiles", flush_interval: float = 60.0):
+        self.sample_rate = 0.0
+        self.directory = Path(directory)
+        self.flush_interval = float(flush_interval)
+        self.samples: Counter = Counter()
+        self._stats: dict[str, pstats.Stats] = {}
+        self._active = False
+        self._task: asyncio.Task | None = None
+        self.set_rate(sample_rate)
+
+    def set_rate(self, sample_rate: float):
+        self.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+        if self.sample_rate:
+            logger.info(f"Handler profiling enabled for {self.sample_rate:.1%} of updates, writing to {self.directory}")
+        else:
+            logger.info("Handler profiling disabled")
+
+    def should_sample(self) -> bool:
+        return not self._active and random.random() < self.sample_rate
+
+    async def run(self, name: str, handler: Callable[..., Awaitable[Any]], *args) -> Any:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return await handler(*args)
+        self._active = True
+        try:
+            return await handler(*args)
+        finally:
+            profile.disable()
+            self._active = False
+            self._add(name, profile)
+
+    def _add(self, name: str, profile: cProfile.Profile):
+        stats = self._stats.get(name)
+        if stats is None:
+            self._stats[name] = pstats.Stats(profile)
+        else:
+            stats.add(profile)
+        self.samples[name] += 1
+
+    def _write(self, collected: dict[str, pstats.Stats]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name, stats in collected.items():
+            path = self.directory / f"{name}.prof"
+            if path.exists():
+                try:
+                    stats.add(str(path))
+                except Exception as e:
+                    logger.warning(f"Overwriting unreadable profile {path}: {e}")
+            stats.dump_stats(path)
+
+    async def flush(self):
+        collected, self._stats = self._stats, {}
+        if not collected:
+            return
+        try:
+            await asyncio.to_thread(self._write, collected)
+        except OSError as e:
+            logger.warning(f"Failed to write profiles to {self.directory}: {e}")
+
+    def status(self) -> str:
+        lines = [
+            f"Профилирование: {'включено, ' + format(self.sample_rate, '.1%') if self.sample_rate else 'выключено'}",
+            f"Каталог: {self.directory.resolve()}"
+        ]
+        for name, count in self.samples.most_common(10):
+            lines.append(f"{name}: {count}")
+        return "\n".join(lines)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        if self._task:
+            return
+        self._task = asyncio.create_task(self._run(), name="profiler-flush")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+
+profiler = HandlerProfiler(config.PROFILER_SAMPLE_RATE, config.PROFILER_DIR)
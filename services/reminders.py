@@ -0,0 +1,226 @@
+﻿import logging
+from datetime import datetime, timezone, timedelta
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+
+import config
+from models.consultation import Consultation
+from models.task import Task
+from services.auth import auth
+from services.scheduler import RetryJob, scheduler
+from utils.consultations_utils import TOMSK_TZ, convert_12_to_24, format_date_verbose
+
+logger = logging.getLogger(__name__)
+
+REMINDER_LABELS = {15: "15 минут", 30: "30 минут", 60: "1 час", 1440: "1 день"}
+
+
+def _parse_iso(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+
+
+class TaskReminders:
+    KIND = "task_reminder"
+
+    @staticmethod
+    def _group(task_id: int) -> str:
+        return f"task:{task_id}"
+
+    @staticmethod
+    def _recipients(telegram_id: int, task: Task) -> set[int]:
+        if task.assignee is not None:
+            if task.assignee.telegram_id:
+                return {int(task.assignee.telegram_id)}
+            logger.info(f"Task {task.id} assignee has no telegram_id, reminders skipped")
+            return set()
+        if task.creator and task.creator.telegram_id:
+            return {int(task.creator.telegram_id)}
+        return {telegram_id}
+
+    @staticmethod
+    def _minutes(task: Task, reminders: list | None) -> list[int]:
+        if reminders is not None:
+            minutes = set()
+            for reminder in reminders:
+                try:
+                    minutes.add(int(reminder.get("minutes", 0)))
+                except (AttributeError, TypeError, ValueError):
+                    continue
+        elif task.reminders is not None:
+            minutes = set(task.reminders)
+        else:
+            return [config.TASK_DEFAULT_REMINDER_MINUTES]
+        return sorted(m for m in minutes if m > 0)
+
+    async def schedule(self, telegram_id: int, task: Task, reminders: list | None = None):
+        task_id = task.id
+        if not task_id:
+            return
+        await self.cancel(task_id)
+
+        if task.status == "done" or not task.is_visible:
+            return
+        deadline = _parse_iso(task.deadline)
+        if not deadline:
+            return
+
+        now = datetime.now(timezone.utc)
+        group = self._group(task_id)
+        for minutes in self._minutes(task, reminders):
+            fire_at = deadline - timedelta(minutes=minutes)
+            if fire_at <= now:
+                continue
+            for chat_id in self._recipients(telegram_id, task):
+                await scheduler.schedule(
+                    f"{group}:{chat_id}:{minutes}",
+                    fire_at.timestamp(),
+                    self.KIND,
+                    {
+                        "chat_id": chat_id,
+                        "task_id": task_id,
+                        "title": task.title,
+                        "deadline": task.deadline,
+                        "minutes": minutes
+                    },
+                    group=group
+                )
+
+    async def cancel(self, task_id: int):
+        await scheduler.cancel_group(self._group(task_id))
+
+    @staticmethod
+    async def send(bot: Bot, data: dict):
+        deadline = _parse_iso(data.get("deadline"))
+        deadline_text = deadline.astimezone(TOMSK_TZ).strftime("%d.%m.%Y %H:%M") if deadline else "—"
+        minutes = data.get("minutes", 0)
+        label = REMINDER_LABELS.get(minutes, f"{minutes} минут")
+
+        text = (
+            f"🔔 <b>Напоминание о задаче</b>\n\n"
+            f"<b>{data.get('title', 'Без названия')}</b>\n"
+            f"📅 Дедлайн: {deadline_text}\n"
+            f"⏰ До дедлайна осталось {label}"
+        )
+        try:
+            await bot.send_message(chat_id=data["chat_id"], text=text, parse_mode="HTML")
+        except TelegramRetryAfter as e:
+            raise RetryJob(e.retry_after) from e
+        except TelegramAPIError as e:
+            logger.warning(f"Unable to send task reminder for task {data.get('task_id')} to {data.get('chat_id')}: {e}")
+
+
+class ConsultationReminders:
+    KIND = "consultation_reminder"
+
+    @staticmethod
+    def _group(consultation_id: int, telegram_id: int) -> str:
+        return f"consultation:{consultation_id}:{telegram_id}"
+
+    @staticmethod
+    def _students_key(consultation_id: int) -> str:
+        return f"consultation_reminders:{consultation_id}"
+
+    @staticmethod
+    def _start(consultation: Consultation) -> datetime | None:
+        date_str = consultation.date
+        start_time = convert_12_to_24(consultation.start_time or "")
+        try:
+            start = datetime.strptime(f"{date_str} {start_time}", "%Y-%m-%d %H:%M")
+        except (ValueError, TypeError):
+            return None
+        return start.replace(tzinfo=TOMSK_TZ)
+
+    async def schedule(self, telegram_id: int, consultation_id: int, consultation: Consultation):
+        start = self._start(consultation)
+        if not start:
+            return
+        await self.cancel_booking(telegram_id, consultation_id)
+
+        now = datetime.now(timezone.utc)
+        group = self._group(consultation_id, telegram_id)
+        scheduled = False
+        for minutes in config.CONSULTATION_REMINDER_OFFSETS:
+            fire_at = start - timedelta(minutes=minutes)
+            if fire_at <= now:
+                continue
+            await scheduler.schedule(
+                f"{group}:{minutes}",
+                fire_at.timestamp(),
+                self.KIND,
+                {
+                    "chat_id": telegram_id,
+                    "consultation_id": consultation_id,
+                    "title": consultation.title,
+                    "date": consultation.date,
+                    "start_time": consultation.start_time,
+                    "end_time": consultation.end_time,
+                    "minutes": minutes
+                },
+                group=group
+            )
+            scheduled = True
+
+        if scheduled:
+            try:
+                await auth.init_redis()
+                key = self._students_key(consultation_id)
+                await auth.redis_flags.sadd(key, telegram_id)
+                await auth.redis_flags.expireat(key, int(start.timestamp()) + 86400)
+            except Exception as e:
+                logger.error(f"Redis error indexing reminders for consultation {consultation_id}: {e}")
+
+    async def cancel_booking(self, telegram_id: int, consultation_id: int):
+        await scheduler.cancel_group(self._group(consultation_id, telegram_id))
+        try:
+            await auth.init_redis()
+            await auth.redis_flags.srem(self._students_key(consultation_id), telegram_id)
+        except Exception as e:
+            logger.error(f"Redis error (cancel_booking reminders) for consultation {consultation_id}: {e}")
+
+    async def cancel_consultation(self, consultation_id: int):
+        try:
+            await auth.init_redis()
+            key = self._students_key(consultation_id)
+            students = await auth.redis_flags.smembers(key)
+            await auth.redis_flags.delete(key)
+        except Exception as e:
+            logger.error(f"Redis error (cancel_consultation reminders) for consultation {consultation_id}: {e}")
+            return
+        for telegram_id in students:
+            await scheduler.cancel_group(self._group(consultation_id, int(telegram_id)))
+
+    @staticmethod
+    async def send(bot: Bot, data: dict):
+        minutes = data.get("minutes", 0)
+        label = REMINDER_LABELS.get(minutes, f"{minutes} минут")
+        start_time = convert_12_to_24(data.get("start_time") or "")
+        end_time = convert_12_to_24(data.get("end_time") or "")
+
+        text = (
+            f"🔔 <b>Напоминание о консультации</b>\n\n"
+            f"<b>{data.get('title', 'Без названия')}</b>\n"
+            f"📅 {format_date_verbose(data.get('date'))}\n"
+            f"🕒 {start_time} – {end_time}\n"
+            f"⏰ До начала осталось {label}"
+        )
+        try:
+            await bot.send_message(chat_id=data["chat_id"], text=text, parse_mode="HTML")
+        except TelegramRetryAfter as e:
+            raise RetryJob(e.retry_after) from e
+        except TelegramAPIError as e:
+            logger.warning(
+                f"Unable to send consultation reminder for consultation {data.get('consultation_id')} "
+                f"to {data.get('chat_id')}: {e}"
+            )
+
+
+task_reminders = TaskReminders()
+consultation_reminders = ConsultationReminders()
+scheduler.register(TaskReminders.KIND, task_reminders.send)
+scheduler.register(ConsultationReminders.KIND, consultation_reminders.send)
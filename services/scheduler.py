@@ -0,0 +1,238 @@
+﻿import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from aiogram import Bot
+
+import config
+from services.auth import auth
+from utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Bot, dict], Awaitable[None]]
+
+CLAIM_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, member in ipairs(due) do
+    redis.call('ZREM', KEYS[1], member)
+    redis.call('ZADD', KEYS[2], ARGV[3], member)
+end
+return due
+"""
+
+REQUEUE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, member in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], member)
+    redis.call('ZADD', KEYS[1], ARGV[1], member)
+end
+return #expired
+"""
+
+RETRY_SCRIPT = """
+if redis.call('HEXISTS', KEYS[3], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[2])
+redis.call('ZREM', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+return 1
+"""
+
+CANCEL_GROUP_SCRIPT = """
+local job_ids = redis.call('SMEMBERS', KEYS[4])
+for _, job_id in ipairs(job_ids) do
+    redis.call('ZREM', KEYS[1], job_id)
+    redis.call('ZREM', KEYS[2], job_id)
+    redis.call('HDEL', KEYS[3], job_id)
+end
+redis.call('DEL', KEYS[4])
+return #job_ids
+"""
+
+NON_RETRYABLE = (KeyError, TypeError, ValueError)
+
+
+class RetryJob(Exception):
+    def __init__(self, delay: float):
+        super().__init__(f"retry in {delay} s")
+        self.delay = float(delay)
+
+
+class DelayedJobScheduler:
+    def __init__(
+        self,
+        name: str,
+        workers: int = 4,
+        poll_interval: float = 1.0,
+        batch_size: int = 100,
+        lease_seconds: int = 60,
+        max_attempts: int = 5
+    ):
+        self.name = name
+        self.queue_key = f"{name}:queue"
+        self.processing_key = f"{name}:processing"
+        self.payload_key = f"{name}:payload"
+        self.dead_key = f"{name}:dead"
+        self.workers = max(int(workers), 1)
+        self.poll_interval = float(poll_interval)
+        self.batch_size = int(batch_size)
+        self.lease_seconds = int(lease_seconds)
+        self.max_attempts = max(int(max_attempts), 1)
+        self._handlers: dict[str, JobHandler] = {}
+        self._queue: asyncio.Queue[str] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._claim = None
+        self._requeue = None
+        self._bot: Optional[Bot] = None
+
+    def _group_key(self, group: str) -> str:
+        return f"{self.name}:group:{group}"
+
+    def register(self, kind: str, handler: JobHandler):
+        self._handlers[kind] = handler
+
+    async def _redis(self):
+        await auth.init_redis()
+        return auth.redis_flags
+
+    async def schedule(self, job_id: str, fire_at: float, kind: str, data: dict, group: str | None = None):
+        redis = await self._redis()
+        payload = json_codec.dumps({"kind": kind, "group": group, "data": data})
+        try:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.hset(self.payload_key, job_id, payload)
+                pipe.zadd(self.queue_key, {job_id: fire_at})
+                if group:
+                    pipe.sadd(self._group_key(group), job_id)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis error scheduling job {job_id} in {self.name}: {e}")
+
+    async def cancel(self, job_id: str, group: str | None = None):
+        redis = await self._redis()
+        try:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.zrem(self.queue_key, job_id)
+                pipe.zrem(self.processing_key, job_id)
+                pipe.hdel(self.payload_key, job_id)
+                if group:
+                    pipe.srem(self._group_key(group), job_id)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis error cancelling job {job_id} in {self.name}: {e}")
+
+    async def cancel_group(self, group: str):
+        redis = await self._redis()
+        try:
+            await redis.eval(
+                CANCEL_GROUP_SCRIPT, 4,
+                self.queue_key, self.processing_key, self.payload_key, self._group_key(group)
+            )
+        except Exception as e:
+            logger.error(f"Redis error cancelling group {group} in {self.name}: {e}")
+
+    async def start(self, bot: Bot):
+        if self._tasks:
+            return
+        redis = await self._redis()
+        self._bot = bot
+        self._queue = asyncio.Queue(maxsize=self.batch_size * 2)
+        self._claim = redis.register_script(CLAIM_SCRIPT)
+        self._requeue = redis.register_script(REQUEUE_SCRIPT)
+        self._tasks.append(asyncio.create_task(self._poll_loop(), name=f"{self.name}-poller"))
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker_loop(), name=f"{self.name}-worker-{i}"))
+        logger.info(f"Scheduler {self.name} started with {self.workers} workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def _poll_loop(self):
+        keys = [self.queue_key, self.processing_key]
+        while True:
+            try:
+                now = time.time()
+                await self._requeue(keys=keys, args=[now, self.batch_size])
+                claimed = await self._claim(keys=keys, args=[now, self.batch_size, now + self.lease_seconds])
+                for job_id in claimed:
+                    await self._queue.put(job_id)
+                if len(claimed) >= self.batch_size:
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scheduler {self.name} poll error: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _worker_loop(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scheduler {self.name} job {job_id} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _retry(self, redis, job_id: str, job: dict, delay: float) -> bool:
+        keys = [self.queue_key, self.processing_key, self.payload_key]
+        return bool(await redis.eval(RETRY_SCRIPT, 3, *keys, job_id, json_codec.dumps(job), time.time() + delay))
+
+    async def _dead_letter(self, redis, job_id: str, raw: Optional[str], error: Exception):
+        logger.error(f"Scheduler {self.name} job {job_id} dropped: {error!r}")
+        entry = {"payload": raw, "error": repr(error), "failed_at": time.time()}
+        await redis.hset(self.dead_key, job_id, json_codec.dumps(entry))
+
+    async def _run_job(self, job_id: str):
+        redis = await self._redis()
+        raw = await redis.hget(self.payload_key, job_id)
+        job: dict = {}
+        finished = True
+        try:
+            if raw:
+                job = json_codec.loads(raw)
+                handler = self._handlers.get(job.get("kind"))
+                if handler:
+                    await handler(self._bot, job.get("data", {}))
+                else:
+                    logger.warning(f"Scheduler {self.name}: no handler for job kind {job.get('kind')}")
+        except asyncio.CancelledError:
+            finished = False
+            raise
+        except RetryJob as e:
+            logger.info(f"Scheduler {self.name} job {job_id} postponed by {e.delay:.0f} s")
+            finished = not await self._retry(redis, job_id, job, e.delay)
+        except NON_RETRYABLE as e:
+            await self._dead_letter(redis, job_id, raw, e)
+        except Exception as e:
+            attempts = int(job.get("attempts", 0)) + 1
+            if attempts >= self.max_attempts:
+                await self._dead_letter(redis, job_id, raw, e)
+            else:
+                logger.warning(f"Scheduler {self.name} job {job_id} failed (attempt {attempts}/{self.max_attempts}): {e}")
+                finished = not await self._retry(redis, job_id, {**job, "attempts": attempts}, self.lease_seconds * attempts)
+        finally:
+            if finished:
+                async with redis.pipeline(transaction=True) as pipe:
+                    pipe.zrem(self.processing_key, job_id)
+                    pipe.hdel(self.payload_key, job_id)
+                    if job.get("group"):
+                        pipe.srem(self._group_key(job["group"]), job_id)
+                    await pipe.execute()
+
+
+scheduler = DelayedJobScheduler(
+    "scheduler",
+    workers=config.SCHEDULER_WORKERS,
+    poll_interval=config.SCHEDULER_POLL_INTERVAL,
+    max_attempts=config.SCHEDULER_MAX_ATTEMPTS
+)
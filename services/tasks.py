@@ -1,8 +1,12 @@
 ﻿import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import config
+from models.task import Task
+from services.api_limiter import BackendOverloaded
 from services.auth import auth
+from services.pagination import iterate_pages
+from services.reminders import task_reminders
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +22,7 @@ class TSUTasks:
         deadline: Optional[str] = None,
         assignee_id: Optional[int] = None,
         reminders: Optional[list] = None
-    ) -> dict | None:
+    ) -> Task | None:
         auth.telegram_id = telegram_id
         await auth.init_redis()
         await auth.init_session()
@@ -39,9 +43,12 @@ class TSUTasks:
             payload["reminders"] = reminders
 
         try:
-            response = await auth.api_request("POST", "todo/", json=payload)
-            logger.info(f"Task created successfully: {response.get('id')}")
-            return response
+            task = Task.from_api(await auth.api_request("POST", "todo/", json=payload))
+            logger.info(f"Task created successfully: {task.id}")
+            await task_reminders.schedule(telegram_id, task, reminders)
+            return task
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error creating task: {e}")
             return None
@@ -64,7 +71,7 @@ class TSUTasks:
 
         try:
             response = await auth.api_request("GET", "todo/all/", params=params)
-            results = response.get("results", [])
+            results = [Task.from_api(t) for t in response.get("results", [])]
             total_pages = response.get("total_pages", 1)
             current_page = response.get("current_page", page)
             return {
@@ -72,6 +79,8 @@ class TSUTasks:
                 "current_page": current_page,
                 "total_pages": total_pages
             }
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error fetching tasks page {page}: {e}")
             return {
@@ -81,7 +90,22 @@ class TSUTasks:
             }
 
     @staticmethod
-    async def get_task_details(telegram_id: int, task_id: int) -> dict | None:
+    def iter_tasks(
+        telegram_id: int,
+        page_size: int = 50,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefetch: bool = True
+    ) -> AsyncIterator[Task]:
+        return iterate_pages(
+            lambda page: TSUTasks.get_tasks(telegram_id, page=page, page_size=page_size, status=status),
+            first_page=1,
+            limit=limit,
+            prefetch=prefetch
+        )
+
+    @staticmethod
+    async def get_task_details(telegram_id: int, task_id: int) -> Task | None:
         auth.telegram_id = telegram_id
         await auth.init_redis()
         await auth.init_session()
@@ -89,7 +113,9 @@ class TSUTasks:
 
         try:
             response = await auth.api_request("GET", f"todo/{task_id}/")
-            return response
+            return Task.from_api(response)
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error fetching task {task_id}: {e}")
             return None
@@ -99,16 +125,20 @@ class TSUTasks:
         telegram_id: int,
         task_id: int,
         **kwargs
-    ) -> dict | None:
+    ) -> Task | None:
         auth.telegram_id = telegram_id
         await auth.init_redis()
         await auth.init_session()
         await auth.load_tokens_if_needed()
 
         try:
-            response = await auth.api_request("PATCH", f"todo/{task_id}/", json=kwargs)
+            task = Task.from_api(await auth.api_request("PATCH", f"todo/{task_id}/", json=kwargs))
             logger.info(f"Task {task_id} updated successfully")
-            return response
+            if {"deadline", "reminders", "status"} & kwargs.keys():
+                await task_reminders.schedule(telegram_id, task, kwargs.get("reminders"))
+            return task
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error updating task {task_id}: {e}")
             return None
@@ -123,7 +153,10 @@ class TSUTasks:
         try:
             await auth.api_request("DELETE", f"todo/{task_id}/")
             logger.info(f"Task {task_id} deleted successfully")
+            await task_reminders.cancel(task_id)
             return True
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error deleting task {task_id}: {e}")
             return False
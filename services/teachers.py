@@ -1,7 +1,12 @@
 ﻿import logging
+from typing import AsyncIterator
 
 import config
+from models.consultation import Consultation
+from models.user import Teacher
+from services.api_limiter import BackendOverloaded
 from services.auth import auth
+from services.pagination import iterate_pages
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +24,7 @@ class TSUTeachers:
         params = {"page": page + 1, "page_size": page_size}
         try:
             response = await auth.api_request("GET", "teachers/", params=params)
-            results = response.get("results", [])
+            results = [Teacher.from_api(t) for t in response.get("results", [])]
             total_pages = response.get("total_pages", 1)
             current_page = response.get("current_page", 1) - 1
             return {
@@ -27,6 +32,8 @@ class TSUTeachers:
                 "current_page": current_page,
                 "total_pages": total_pages
             }
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error fetching teachers page {page}: {e}")
             return {
@@ -46,7 +53,7 @@ class TSUTeachers:
         endpoint = f"teachers/{teacher_id}/consultations/"
         try:
             response = await auth.api_request("GET", endpoint, params=params)
-            results = response.get("results", [])
+            results = [Consultation.from_api(c) for c in response.get("results", [])]
             total_pages = response.get("total_pages", 1)
             current_page = response.get("current_page", 1) - 1
             return {
@@ -54,6 +61,8 @@ class TSUTeachers:
                 "current_page": current_page,
                 "total_pages": total_pages
             }
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error fetching schedule for teacher {teacher_id}, page {page}: {e}")
             return {
@@ -62,6 +71,26 @@ class TSUTeachers:
                 "total_pages": 1
             }
 
+    @staticmethod
+    def iter_teachers(telegram_id: int, page_size: int = 50, limit: int | None = None,
+                      prefetch: bool = True) -> AsyncIterator[Teacher]:
+        return iterate_pages(
+            lambda page: TSUTeachers.get_teachers_page(telegram_id, page=page, page_size=page_size),
+            first_page=0,
+            limit=limit,
+            prefetch=prefetch
+        )
+
+    @staticmethod
+    def iter_teacher_schedule(telegram_id: int, teacher_id: int, page_size: int = 50,
+                              limit: int | None = None, prefetch: bool = True) -> AsyncIterator[Consultation]:
+        return iterate_pages(
+            lambda page: TSUTeachers.get_teacher_schedule(telegram_id, teacher_id, page=page, page_size=page_size),
+            first_page=0,
+            limit=limit,
+            prefetch=prefetch
+        )
+
     @staticmethod
     async def subscribe_teacher(telegram_id: int, teacher_id: int) -> bool:
         auth.telegram_id = telegram_id
@@ -72,6 +101,8 @@ class TSUTeachers:
         try:
             await auth.api_request("POST", f"teachers/{teacher_id}/subscribe/")
             return True
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error subscribing to teacher {teacher_id}: {e}")
             return False
@@ -86,12 +117,14 @@ class TSUTeachers:
         try:
             await auth.api_request("DELETE", f"teachers/{teacher_id}/unsubscribe/")
             return True
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error unsubscribing from teacher_id={teacher_id}: {e}")
             return False
 
     @staticmethod
-    async def get_subscribed_teachers(telegram_id: int) -> list:
+    async def get_subscribed_teachers(telegram_id: int) -> list[Teacher]:
         auth.telegram_id = telegram_id
         await auth.init_redis()
         await auth.init_session()
@@ -99,7 +132,9 @@ class TSUTeachers:
 
         try:
             response = await auth.api_request("GET", "teachers/subscribed/")
-            return response.get("results", []) if response else []
+            return [Teacher.from_api(t) for t in response.get("results", [])] if response else []
+        except BackendOverloaded:
+            raise
         except Exception as e:
             logger.error(f"Error fetching subscribed teachers: {e}")
             return []
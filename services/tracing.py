@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar
+from pathlib import Path
+
+import aiohttp
+
+from services import instrumentation
+from services.instrumentation import Operation
+from utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "tsu-consult-bot"
+
+OTLP_SPAN_KINDS = {"update": 2, "tsu_api": 3, "redis": 3, "telegram": 3}
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "attributes", "start_ns", "end_ns", "error")
+
+    def __init__(self, trace: "Trace", name: str, kind: str, parent_id: str | None, attributes: dict):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1_000_000, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": OTLP_SPAN_KINDS.get(self.kind, 1),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}} for key, value in self.attributes.items()
+            ] + [{"key": "operation.kind", "value": {"stringValue": self.kind}}],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: list[Span] = []
+
+
+_current: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class FileExporter:
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def _write(self, spans: list[Span]):
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json_codec.dumps(span.to_dict(), default=str) + "\n")
+
+    async def export(self, spans: list[Span]):
+        await asyncio.to_thread(self._write, spans)
+
+    async def close(self):
+        pass
+
+
+class OTLPExporter:
+    def __init__(self, endpoint: str):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self._session: aiohttp.ClientSession | None = None
+
+    async def export(self, spans: list[Span]):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(json_serialize=json_codec.dumps)
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": [span.to_otlp() for span in spans]}]
+            }]
+        }
+        async with self._session.post(self.url, json=payload) as resp:
+            if resp.status >= 300:
+                logger.warning(f"OTLP export failed with status {resp.status}")
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+class Tracer:
+    def __init__(self, sample_rate: float, exporters: list, flush_interval: float = 5.0, max_pending: int = 10000):
+        self.sample_rate = float(sample_rate)
+        self.exporters = exporters
+        self.flush_interval = float(flush_interval)
+        self.max_pending = int(max_pending)
+        self._pending: list[Span] = []
+        self._task: asyncio.Task | None = None
+
+    def started(self, operation: Operation):
+        parent = _current.get()
+        if parent is None:
+            if operation.kind != "update" or random.random() >= self.sample_rate:
+                return
+            trace = Trace()
+        else:
+            trace = parent.trace
+        span = Span(trace, operation.name, operation.kind, parent.span_id if parent else None, operation.labels)
+        trace.spans.append(span)
+        operation.context["span"] = span
+        operation.context["span_token"] = _current.set(span)
+
+    def finished(self, operation: Operation):
+        span = operation.context.pop("span", None)
+        if span is None:
+            return
+        span.end_ns = time.time_ns()
+        if operation.error is not None:
+            span.error = f"{type(operation.error).__name__}: {operation.error}"
+        try:
+            _current.reset(operation.context.pop("span_token"))
+        except ValueError:
+            pass
+        if span.parent_id is None and len(self._pending) < self.max_pending:
+            self._pending.extend(span.trace.spans)
+
+    async def flush(self):
+        spans, self._pending = self._pending, []
+        if not spans:
+            return
+        for exporter in self.exporters:
+            try:
+                await exporter.export(spans)
+            except Exception as e:
+                logger.warning(f"Failed to export {len(spans)} spans via {type(exporter).__name__}: {e}")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self):
+        if self._task:
+            return
+        instrumentation.add_listener(self)
+        self._task = asyncio.create_task(self._run(), name="tracing-flush")
+        logger.info(f"Tracing enabled with sample rate {self.sample_rate}")
+
+    async def stop(self):
+        instrumentation.remove_listener(self)
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+        for exporter in self.exporters:
+            await exporter.close()
+
+
+def create_tracer(sample_rate: float, file_path: str | None = None, otlp_endpoint: str | None = None) -> Tracer | None:
+    exporters = []
+    if file_path:
+        exporters.append(FileExporter(file_path))
+    if otlp_endpoint:
+        exporters.append(OTLPExporter(otlp_endpoint))
+    if sample_rate <= 0 or not exporters:
+        return None
+    return Tracer(sample_rate, exporters)
@@ -0,0 +1,563 @@
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import re
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+from aiohttp import web
+
+PAGE_SIZE = 10
+
+_NUMERIC_SEGMENT = re.compile(r"(?<=/)\d+(?=/)")
+
+
+def _paginate(items: list, request: web.Request) -> dict:
+    page = max(int(request.query.get("page", 1)), 1)
+    page_size = max(int(request.query.get("page_size", PAGE_SIZE)), 1)
+    total_pages = max(math.ceil(len(items) / page_size), 1)
+    start = (page - 1) * page_size
+    return {
+        "count": len(items),
+        "total_pages": total_pages,
+        "current_page": page,
+        "next": page + 1 if page < total_pages else None,
+        "previous": page - 1 if page > 1 else None,
+        "results": items[start:start + page_size]
+    }
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class FakeTSUAPI:
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int | None = None):
+        self.latency = float(latency)
+        self.jitter = float(jitter)
+        self.error_rate = float(error_rate)
+        self.faults: dict[tuple[str, str], int] = {}
+        self.calls: Counter = Counter()
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._tokens = itertools.count(1)
+
+        self.users: dict[int, dict] = {}
+        self.access_tokens: dict[str, int] = {}
+        self.refresh_tokens: dict[str, int] = {}
+        self.subscriptions: dict[int, set[int]] = {}
+        self.consultations: dict[int, dict] = {}
+        self.bookings: dict[int, dict[int, str]] = {}
+        self.requests: dict[int, dict] = {}
+        self.request_subscribers: dict[int, set[int]] = {}
+        self.tasks: dict[int, dict] = {}
+
+        self._runner: web.AppRunner | None = None
+
+    # state helpers
+
+    def add_user(self, telegram_id: int, role: str = "student", first_name: str = "", last_name: str = "",
+                 username: str | None = None, status: str = "active", **extra) -> dict:
+        user = {
+            "id": next(self._ids),
+            "telegram_id": telegram_id,
+            "username": username or f"@user{telegram_id}",
+            "first_name": first_name or f"Имя{telegram_id}",
+            "last_name": last_name or f"Фамилия{telegram_id}",
+            "phone_number": extra.pop("phone_number", ""),
+            "role": role,
+            "status": status,
+            "email": extra.pop("email", ""),
+            **extra
+        }
+        self.users[telegram_id] = user
+        return user
+
+    def add_consultation(self, teacher_telegram_id: int, title: str, day: date, start_time: str = "10:00",
+                         end_time: str = "11:00", max_students: int = 10, is_closed: bool = False) -> dict:
+        teacher = self.users[teacher_telegram_id]
+        consultation = {
+            "id": next(self._ids),
+            "title": title,
+            "date": day.isoformat(),
+            "start_time": f"{start_time}:00" if len(start_time) == 5 else start_time,
+            "end_time": f"{end_time}:00" if len(end_time) == 5 else end_time,
+            "max_students": max_students,
+            "is_closed": is_closed,
+            "status": "active",
+            "teacher_id": teacher["id"],
+            "teacher_telegram_id": teacher_telegram_id,
+            "teacher_name": f"{teacher['first_name']} {teacher['last_name']}"
+        }
+        self.consultations[consultation["id"]] = consultation
+        self.bookings[consultation["id"]] = {}
+        return consultation
+
+    def add_task(self, creator_telegram_id: int, title: str, deadline: str | None = None,
+                 assignee_id: int | None = None, description: str = "", reminders: list | None = None) -> dict:
+        creator = self.users[creator_telegram_id]
+        assignee = next((u for u in self.users.values() if u["id"] == assignee_id), None) if assignee_id else None
+        task = {
+            "id": next(self._ids),
+            "title": title,
+            "description": description,
+            "deadline": deadline,
+            "status": "active",
+            "creator": self._person(creator),
+            "assignee": self._person(assignee) if assignee else None,
+            "reminders": reminders or [],
+            "created_at": _now_iso()
+        }
+        self.tasks[task["id"]] = task
+        return task
+
+    def seed(self, teachers: int = 20, students: int = 200, deans: int = 2, consultations_per_teacher: int = 6,
+             tasks_per_dean: int = 10, start_telegram_id: int = 1000000) -> dict[str, list[int]]:
+        telegram_ids = itertools.count(start_telegram_id + 1)
+        seeded: dict[str, list[int]] = {"teacher": [], "student": [], "dean": []}
+        for _ in range(teachers):
+            seeded["teacher"].append(self.add_user(next(telegram_ids), "teacher")["telegram_id"])
+        for _ in range(students):
+            seeded["student"].append(self.add_user(next(telegram_ids), "student")["telegram_id"])
+        for _ in range(deans):
+            seeded["dean"].append(self.add_user(next(telegram_ids), "dean", email="dean@example.com")["telegram_id"])
+
+        today = date.today()
+        for teacher_id in seeded["teacher"]:
+            for i in range(consultations_per_teacher):
+                hour = 9 + i % 8
+                self.add_consultation(
+                    teacher_id, f"Консультация {i + 1}", today + timedelta(days=1 + i),
+                    f"{hour:02d}:00", f"{hour + 1:02d}:00", max_students=self._random.randint(3, 15)
+                )
+        teacher_ids = [self.users[t]["id"] for t in seeded["teacher"]]
+        for dean_id in seeded["dean"]:
+            for i in range(tasks_per_dean):
+                deadline = (datetime.now(timezone.utc) + timedelta(days=1 + i)).isoformat().replace("+00:00", "Z")
+                self.add_task(dean_id, f"Задача {i + 1}", deadline, assignee_id=self._random.choice(teacher_ids))
+        return seeded
+
+    @staticmethod
+    def _person(user: dict) -> dict:
+        return {key: user[key] for key in ("id", "telegram_id", "username", "first_name", "last_name")}
+
+    def _issue_tokens(self, telegram_id: int) -> dict:
+        access = f"access-{telegram_id}-{next(self._tokens)}"
+        refresh = f"refresh-{telegram_id}-{next(self._tokens)}"
+        self.access_tokens[access] = telegram_id
+        self.refresh_tokens[refresh] = telegram_id
+        return {"access": access, "refresh": refresh}
+
+    def _user(self, request: web.Request) -> dict:
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        telegram_id = self.access_tokens.get(token)
+        if telegram_id is None or telegram_id not in self.users:
+            raise web.HTTPUnauthorized(text=json.dumps({"detail": "Invalid token"}), content_type="application/json")
+        return self.users[telegram_id]
+
+    @staticmethod
+    async def _json(request: web.Request) -> dict:
+        if not request.can_read_body:
+            return {}
+        try:
+            return await request.json()
+        except (ValueError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _id(request: web.Request, name: str = "id") -> int:
+        return int(request.match_info[name])
+
+    def _consultation(self, request: web.Request) -> dict:
+        consultation = self.consultations.get(self._id(request))
+        if consultation is None:
+            raise web.HTTPNotFound()
+        return consultation
+
+    def _task(self, request: web.Request) -> dict:
+        task = self.tasks.get(self._id(request))
+        if task is None:
+            raise web.HTTPNotFound()
+        return task
+
+    # middleware
+
+    @web.middleware
+    async def _chaos(self, request: web.Request, handler):
+        template = _NUMERIC_SEGMENT.sub("{id}", request.path)
+        self.calls[(request.method, template.lstrip("/"))] += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        status = self.faults.get((request.method, template.lstrip("/")))
+        if status is None and self.error_rate and self._random.random() < self.error_rate:
+            status = 503
+        if status:
+            return web.json_response({"detail": "Injected failure"}, status=status)
+        return await handler(request)
+
+    # auth
+
+    async def register(self, request: web.Request) -> web.Response:
+        data = await self._json(request)
+        telegram_id = int(data.get("telegram_id", 0))
+        if not telegram_id:
+            return web.json_response({"telegram_id": ["required"]}, status=400)
+        if telegram_id in self.users:
+            return web.json_response({"telegram_id": ["already registered"]}, status=400)
+        role = data.get("role", "student")
+        user = self.add_user(
+            telegram_id, role, data.get("first_name", ""), data.get("last_name", ""), data.get("username"),
+            status="pending" if role in ("teacher", "dean") else "active", phone_number=data.get("phone_number", "")
+        )
+        return web.json_response({**user, **self._issue_tokens(telegram_id)}, status=201)
+
+    async def login(self, request: web.Request) -> web.Response:
+        data = await self._json(request)
+        telegram_id = int(data.get("telegram_id", 0))
+        if telegram_id not in self.users:
+            return web.json_response({"detail": "User not found"}, status=404)
+        return web.json_response(self._issue_tokens(telegram_id))
+
+    async def refresh(self, request: web.Request) -> web.Response:
+        data = await self._json(request)
+        telegram_id = self.refresh_tokens.get(data.get("refresh", ""))
+        if telegram_id is None:
+            return web.json_response({"detail": "Invalid refresh token"}, status=400)
+        access = f"access-{telegram_id}-{next(self._tokens)}"
+        self.access_tokens[access] = telegram_id
+        return web.json_response({"access": access})
+
+    async def logout(self, request: web.Request) -> web.Response:
+        data = await self._json(request)
+        self.refresh_tokens.pop(data.get("refresh", ""), None)
+        return web.json_response({}, status=205)
+
+    async def add_credentials(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        data = await self._json(request)
+        user["email"] = data.get("email", "")
+        return web.json_response({"detail": "ok"})
+
+    # profile
+
+    async def get_profile(self, request: web.Request) -> web.Response:
+        return web.json_response(self._user(request))
+
+    async def update_profile(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        data = await self._json(request)
+        user.update({k: v for k, v in data.items() if k in ("first_name", "last_name")})
+        return web.json_response(user)
+
+    async def change_email(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        user["email"] = (await self._json(request)).get("email", user["email"])
+        return web.json_response({"detail": "ok"})
+
+    async def change_password(self, request: web.Request) -> web.Response:
+        self._user(request)
+        return web.json_response({"detail": "ok"})
+
+    async def resubmit(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        user["status"] = "pending"
+        return web.json_response({"detail": "ok"})
+
+    async def calendar_init(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        return web.json_response({"authorization_url": f"https://calendar.example.com/auth?user={user['id']}"})
+
+    async def calendar_disconnect(self, request: web.Request) -> web.Response:
+        self._user(request)
+        return web.json_response({"detail": "ok"})
+
+    # teachers
+
+    def _teachers(self) -> list[dict]:
+        return [self._person(u) for u in self.users.values() if u["role"] == "teacher" and u["status"] == "active"]
+
+    def _teacher_by_id(self, teacher_id: int) -> dict:
+        teacher = next((u for u in self.users.values() if u["id"] == teacher_id and u["role"] == "teacher"), None)
+        if teacher is None:
+            raise web.HTTPNotFound()
+        return teacher
+
+    async def list_teachers(self, request: web.Request) -> web.Response:
+        self._user(request)
+        return web.json_response(_paginate(self._teachers(), request))
+
+    async def subscribed_teachers(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        ids = self.subscriptions.get(user["id"], set())
+        return web.json_response({"results": [t for t in self._teachers() if t["id"] in ids]})
+
+    async def subscribe_teacher(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        self._teacher_by_id(self._id(request))
+        self.subscriptions.setdefault(user["id"], set()).add(self._id(request))
+        return web.json_response({"detail": "subscribed"}, status=201)
+
+    async def unsubscribe_teacher(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        self.subscriptions.get(user["id"], set()).discard(self._id(request))
+        return web.Response(status=204)
+
+    async def teacher_consultations(self, request: web.Request) -> web.Response:
+        self._user(request)
+        teacher = self._teacher_by_id(self._id(request))
+        items = [
+            self._consultation_view(c) for c in self.consultations.values()
+            if c["teacher_id"] == teacher["id"] and c["status"] == "active"
+        ]
+        return web.json_response(_paginate(items, request))
+
+    # consultations
+
+    def _consultation_view(self, consultation: dict) -> dict:
+        booked = len(self.bookings.get(consultation["id"], {}))
+        return {**consultation, "booked_count": booked, "free_places": consultation["max_students"] - booked}
+
+    async def my_consultations(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        if user["role"] == "teacher":
+            items = [c for c in self.consultations.values()
+                     if c["teacher_telegram_id"] == user["telegram_id"] and c["status"] == "active"]
+        else:
+            items = [c for c in self.consultations.values() if user["id"] in self.bookings.get(c["id"], {})]
+        is_closed = request.query.get("is_closed")
+        if is_closed is not None:
+            items = [c for c in items if c["is_closed"] == (is_closed == "true")]
+        return web.json_response(_paginate([self._consultation_view(c) for c in items], request))
+
+    async def create_consultation(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        if user["role"] != "teacher":
+            return web.json_response({"detail": "Forbidden"}, status=403)
+        data = await self._json(request)
+        try:
+            day = date.fromisoformat(data.get("date", ""))
+        except ValueError:
+            return web.json_response({"date": ["invalid"]}, status=400)
+        consultation = self.add_consultation(
+            user["telegram_id"], data.get("title", ""), day, data.get("start_time", "10:00"),
+            data.get("end_time", "11:00"), int(data.get("max_students", 10))
+        )
+        source_request = data.get("source_request_id") or request.match_info.get("id")
+        if source_request and int(source_request) in self.requests:
+            self.requests[int(source_request)]["status"] = "accepted"
+        return web.json_response(consultation, status=201)
+
+    async def book(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        consultation = self._consultation(request)
+        bookings = self.bookings[consultation["id"]]
+        if user["id"] in bookings:
+            return web.json_response({"detail": "Already booked"}, status=409)
+        if consultation["is_closed"] or len(bookings) >= consultation["max_students"]:
+            return web.json_response({"detail": "Consultation is closed"}, status=400)
+        bookings[user["id"]] = (await self._json(request)).get("message", "")
+        return web.json_response(self._consultation_view(consultation), status=201)
+
+    async def cancel_booking(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        consultation = self._consultation(request)
+        if self.bookings[consultation["id"]].pop(user["id"], None) is None:
+            return web.json_response({"detail": "Not booked"}, status=400)
+        return web.Response(status=204)
+
+    def _own_consultation(self, request: web.Request) -> dict:
+        user = self._user(request)
+        consultation = self._consultation(request)
+        if consultation["teacher_telegram_id"] != user["telegram_id"]:
+            raise web.HTTPForbidden()
+        return consultation
+
+    async def delete_consultation(self, request: web.Request) -> web.Response:
+        consultation = self._own_consultation(request)
+        consultation["status"] = "cancelled"
+        return web.Response(status=204)
+
+    async def close_consultation(self, request: web.Request) -> web.Response:
+        consultation = self._own_consultation(request)
+        consultation["is_closed"] = True
+        return web.json_response(self._consultation_view(consultation))
+
+    async def consultation_students(self, request: web.Request) -> web.Response:
+        consultation = self._own_consultation(request)
+        students = []
+        for user_id, message in self.bookings[consultation["id"]].items():
+            user = next((u for u in self.users.values() if u["id"] == user_id), None)
+            if user:
+                students.append({**self._person(user), "message": message})
+        return web.json_response(students)
+
+    # consultation requests
+
+    async def create_request(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        data = await self._json(request)
+        item = {
+            "id": next(self._ids),
+            "title": data.get("title", ""),
+            "description": data.get("description", ""),
+            "status": "open",
+            "student": self._person(user),
+            "created_at": _now_iso()
+        }
+        self.requests[item["id"]] = item
+        self.request_subscribers[item["id"]] = set()
+        return web.json_response(item, status=201)
+
+    async def list_requests(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        items = [
+            {**r, "is_subscribed": user["id"] in self.request_subscribers.get(r["id"], set())}
+            for r in self.requests.values()
+        ]
+        return web.json_response(_paginate(items, request))
+
+    async def subscribe_request(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        if self._id(request) not in self.requests:
+            raise web.HTTPNotFound()
+        self.request_subscribers[self._id(request)].add(user["id"])
+        return web.json_response({"detail": "subscribed"}, status=201)
+
+    async def unsubscribe_request(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        self.request_subscribers.get(self._id(request), set()).discard(user["id"])
+        return web.Response(status=204)
+
+    # todo
+
+    def _visible_tasks(self, user: dict) -> list[dict]:
+        return [
+            t for t in self.tasks.values()
+            if t["status"] != "deleted" and (
+                user["role"] == "dean"
+                or t["creator"]["id"] == user["id"]
+                or (t["assignee"] or {}).get("id") == user["id"]
+            )
+        ]
+
+    async def create_task(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        data = await self._json(request)
+        task = self.add_task(
+            user["telegram_id"], data.get("title", ""), data.get("deadline"), data.get("assignee_id"),
+            data.get("description", ""), data.get("reminders")
+        )
+        return web.json_response(task, status=201)
+
+    async def list_tasks(self, request: web.Request) -> web.Response:
+        user = self._user(request)
+        items = self._visible_tasks(user)
+        status = request.query.get("status")
+        if status:
+            items = [t for t in items if t["status"] == status]
+        return web.json_response(_paginate(items, request))
+
+    async def get_task(self, request: web.Request) -> web.Response:
+        self._user(request)
+        return web.json_response(self._task(request))
+
+    async def update_task(self, request: web.Request) -> web.Response:
+        self._user(request)
+        task = self._task(request)
+        data = await self._json(request)
+        if "assignee_id" in data:
+            assignee = next((u for u in self.users.values() if u["id"] == data.pop("assignee_id")), None)
+            task["assignee"] = self._person(assignee) if assignee else None
+        task.update({k: v for k, v in data.items() if k in ("title", "description", "deadline", "status", "reminders")})
+        return web.json_response(task)
+
+    async def delete_task(self, request: web.Request) -> web.Response:
+        self._user(request)
+        self._task(request)["status"] = "deleted"
+        return web.Response(status=204)
+
+    # server
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._chaos])
+        app.router.add_routes([
+            web.post("/auth/register/", self.register),
+            web.post("/auth/login/", self.login),
+            web.post("/auth/refresh/", self.refresh),
+            web.post("/auth/logout/", self.logout),
+            web.post("/auth/credentials/add/", self.add_credentials),
+
+            web.get("/profile/", self.get_profile),
+            web.put("/profile/", self.update_profile),
+            web.put("/profile/change/email/", self.change_email),
+            web.put("/profile/change/password/", self.change_password),
+            web.post("/profile/approval/resubmit/", self.resubmit),
+            web.post("/profile/approval/resubmit/dean/", self.resubmit),
+            web.get("/profile/calendar/init/", self.calendar_init),
+            web.delete("/profile/calendar/disconnect/", self.calendar_disconnect),
+
+            web.get("/teachers/", self.list_teachers),
+            web.get("/teachers/subscribed/", self.subscribed_teachers),
+            web.post("/teachers/{id:\\d+}/subscribe/", self.subscribe_teacher),
+            web.delete("/teachers/{id:\\d+}/unsubscribe/", self.unsubscribe_teacher),
+            web.get("/teachers/{id:\\d+}/consultations/", self.teacher_consultations),
+
+            web.get("/consultations/my/", self.my_consultations),
+            web.post("/consultations/", self.create_consultation),
+            web.post("/consultations/from/{id:\\d+}/", self.create_consultation),
+            web.post("/consultations/request/", self.create_request),
+            web.get("/consultations/requests/", self.list_requests),
+            web.post("/consultations/requests/{id:\\d+}/subscribe/", self.subscribe_request),
+            web.delete("/consultations/requests/{id:\\d+}/unsubscribe/", self.unsubscribe_request),
+            web.post("/consultations/{id:\\d+}/book/", self.book),
+            web.delete("/consultations/{id:\\d+}/cancel/", self.cancel_booking),
+            web.delete("/consultations/{id:\\d+}/delete/", self.delete_consultation),
+            web.post("/consultations/{id:\\d+}/close/", self.close_consultation),
+            web.get("/consultations/{id:\\d+}/students/", self.consultation_students),
+
+            web.post("/todo/", self.create_task),
+            web.get("/todo/all/", self.list_tasks),
+            web.get("/todo/{id:\\d+}/", self.get_task),
+            web.patch("/todo/{id:\\d+}/", self.update_task),
+            web.delete("/todo/{id:\\d+}/", self.delete_task),
+        ])
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}/"
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def serve(args):
+    api = FakeTSUAPI(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed)
+    seeded = api.seed(teachers=args.teachers, students=args.students)
+    url = await api.start(args.host, args.port)
+    print(f"✅ Fake TSU API: {url}")
+    print(f"   Преподаватели: {seeded['teacher'][:3]}..., студенты: {seeded['student'][:3]}..., деканы: {seeded['dean']}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="In-memory fake of the TSU API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--teachers", type=int, default=20)
+    parser.add_argument("--students", type=int, default=200)
+    asyncio.run(serve(parser.parse_args()))
@@ -1,8 +1,18 @@
-﻿from datetime import datetime, timezone, timedelta
-from babel.dates import format_date
+﻿from datetime import date, datetime, timezone, timedelta
+from functools import lru_cache
+
+from models.consultation import Consultation
 
 TOMSK_TZ = timezone(timedelta(hours=7))
 
+DATE_CACHE_SIZE = 1024
+
+WEEKDAYS_RU = ("Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота", "Воскресенье")
+MONTHS_GENITIVE_RU = (
+    "января", "февраля", "марта", "апреля", "мая", "июня",
+    "июля", "августа", "сентября", "октября", "ноября", "декабря"
+)
+
 
 def convert_12_to_24(time_str: str) -> str:
     if not time_str:
@@ -23,20 +33,38 @@ def format_time(t: str) -> str:
     except (ValueError, TypeError):
         return t or "—"
 
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _verbose_date(value: date) -> str:
+    return f"{WEEKDAYS_RU[value.weekday()]}, {value.day} {MONTHS_GENITIVE_RU[value.month - 1]}, {value.year}"
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _format_date_verbose(date_str: str) -> str:
+    return _verbose_date(datetime.strptime(date_str, "%Y-%m-%d").date())
+
 def format_date_verbose(date_str: str) -> str:
     try:
-        dt = datetime.strptime(date_str, "%Y-%m-%d")
-        formatted = format_date(dt, format="EEEE, d MMMM, y", locale="ru")
-        return formatted[0].upper() + formatted[1:]
+        return _format_date_verbose(date_str)
     except (ValueError, TypeError):
         return date_str or "—"
 
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _format_datetime_verbose(datetime_str: str) -> str:
+    dt = datetime.fromisoformat(datetime_str.replace("Z", "+00:00"))
+    dt_tomsk = dt.astimezone(TOMSK_TZ)
+    return f"{_verbose_date(dt_tomsk.date())}, {dt_tomsk.strftime('%H:%M')}"
+
 def format_datetime_verbose(datetime_str: str) -> str:
     try:
-        dt = datetime.fromisoformat(datetime_str.replace("Z", "+00:00"))
-        dt_tomsk = dt.astimezone(TOMSK_TZ)
-        date_part = format_date(dt_tomsk, format="EEEE, d MMMM, y", locale="ru")
-        time_part = dt_tomsk.strftime("%H:%M")
-        return f"{date_part[0].upper() + date_part[1:]}, {time_part}"
-    except (ValueError, TypeError):
+        return _format_datetime_verbose(datetime_str)
+    except (ValueError, TypeError, AttributeError):
         return datetime_str or "—"
+
+def format_consultation_card(c: Consultation) -> str:
+    status_emoji = "✅" if not c.is_closed else "🔒"
+    return (
+        f"\n<b>{status_emoji} {c.title}</b>\n"
+        f"📅 {format_date_verbose(c.date)}\n"
+        f"🕒 {format_time(c.start_time)} – {format_time(c.end_time)}\n"
+        f"👥 Мест: {c.max_students}\n"
+        f"📌 Статус: {'Открыта' if not c.is_closed else 'Закрыта'}"
+    )
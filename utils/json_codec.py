@@ -0,0 +1,49 @@
+import asyncio
+import json
+from typing import Any
+
+import aiohttp
+
+THREAD_DECODE_THRESHOLD = 256 * 1024
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    BACKEND = f"orjson {orjson.__version__}"
+    DecodeError = orjson.JSONDecodeError
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def loads(data: str | bytes | bytearray | memoryview) -> Any:
+        return orjson.loads(data)
+
+    def dumps_bytes(obj: Any, default=None) -> bytes:
+        return orjson.dumps(obj, default=default, option=_OPTIONS)
+
+    def dumps(obj: Any, default=None) -> str:
+        return orjson.dumps(obj, default=default, option=_OPTIONS).decode()
+else:
+    BACKEND = "json (stdlib)"
+    DecodeError = json.JSONDecodeError
+
+    def loads(data: str | bytes | bytearray | memoryview) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(obj: Any, default=None) -> str:
+        return json.dumps(obj, default=default, ensure_ascii=False, separators=(",", ":"))
+
+    def dumps_bytes(obj: Any, default=None) -> bytes:
+        return dumps(obj, default=default).encode()
+
+
+async def decode_response(resp: aiohttp.ClientResponse) -> Any:
+    body = await resp.read()
+    if not body or not body.strip():
+        return None
+    if len(body) >= THREAD_DECODE_THRESHOLD:
+        return await asyncio.to_thread(loads, body)
+    return loads(body)
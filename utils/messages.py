@@ -1,5 +1,5 @@
-﻿import asyncio
-import logging
+﻿import logging
+from collections import OrderedDict
 
 from aiogram import Bot
 from aiogram.exceptions import TelegramBadRequest
@@ -7,6 +7,11 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardMarkup, Message
 
 from config import PARSE_MODE
+from services.message_cleanup import message_cleanup
+
+RENDER_CACHE_SIZE = 10000
+
+_rendered: OrderedDict[tuple[int, int], tuple[int, int, tuple[int, int]]] = OrderedDict()
 
 
 async def delete_msg(bot: Bot, chat_id: int, message_id: int | None):
@@ -19,13 +24,10 @@ async def delete_msg(bot: Bot, chat_id: int, message_id: int | None):
     except Exception as e:
         logging.warning(f"Unable to delete message {message_id}: {e}")
 
-async def answer_and_delete(message: Message, text: str, delay: int = 5):
+async def answer_and_delete(message: Message, text: str, delay: int = 5) -> Message:
     msg = await message.answer(text, parse_mode=PARSE_MODE)
-    await asyncio.sleep(delay)
-    try:
-        await msg.delete()
-    except TelegramBadRequest:
-        pass
+    await message_cleanup.delete_later(msg.chat.id, msg.message_id, delay)
+    return msg
 
 async def edit_step(message: Message, state: FSMContext, text: str,
                     keyboard: InlineKeyboardMarkup | None = None, msg_id_key: str = "register_msg_id"):
@@ -47,3 +49,50 @@ async def edit_step(message: Message, state: FSMContext, text: str,
 
     new_msg = await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
     await state.update_data(**{msg_id_key: new_msg.message_id})
+
+
+def _markup_hash(markup: InlineKeyboardMarkup | None) -> int:
+    if not markup:
+        return 0
+    return hash(markup.model_dump_json(exclude_none=True))
+
+
+def _shown(message: Message) -> tuple[int, int]:
+    return hash(message.text or message.caption or ""), _markup_hash(message.reply_markup)
+
+
+def _remember(message: Message, text_key: int, markup_key: int):
+    key = (message.chat.id, message.message_id)
+    _rendered[key] = (text_key, markup_key, _shown(message))
+    _rendered.move_to_end(key)
+    if len(_rendered) > RENDER_CACHE_SIZE:
+        _rendered.popitem(last=False)
+
+
+async def render(message: Message, text: str, reply_markup: InlineKeyboardMarkup | None = None,
+                 parse_mode: str | None = None) -> Message:
+    text_key = hash((text, parse_mode))
+    markup_key = _markup_hash(reply_markup)
+
+    previous = _rendered.get((message.chat.id, message.message_id))
+    if previous and previous[2] != _shown(message):
+        previous = None
+
+    try:
+        if previous and previous[0] == text_key:
+            if previous[1] == markup_key:
+                return message
+            edited = await message.edit_reply_markup(reply_markup=reply_markup)
+        else:
+            edited = await message.edit_text(text, reply_markup=reply_markup, parse_mode=parse_mode)
+    except TelegramBadRequest as e:
+        if "message is not modified" in str(e):
+            return message
+        new_msg = await message.answer(text, reply_markup=reply_markup, parse_mode=parse_mode)
+        _remember(new_msg, text_key, markup_key)
+        return new_msg
+
+    if isinstance(edited, Message):
+        _remember(edited, text_key, markup_key)
+        return edited
+    return message
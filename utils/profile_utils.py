@@ -1,28 +1,21 @@
+from functools import lru_cache
+
 from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
 from services.profile import profile
+from utils.messages import render
 
 
-async def show_profile(message: Message, telegram_id: int, edit_message: Message | None = None, origin: str | None = None):
-    profile_text = await profile.format_profile_text(telegram_id)
-
-    teacher_status = await profile.get_teacher_status(telegram_id)
-    dean_status = await profile.get_dean_status(telegram_id)
-
-    status = teacher_status or dean_status
-
-    from services.auth import auth
-    role = await auth.get_role(telegram_id)
-
+@lru_cache(maxsize=64)
+def _profile_rows(status: str | None, is_teacher: bool, role: str | None,
+                  origin: str | None) -> tuple[tuple[InlineKeyboardButton, ...], ...]:
     back_callback = f"menu_back:{origin}" if origin else "menu_back"
 
     if status == "pending":
-        keyboard = InlineKeyboardMarkup(
-            inline_keyboard=[
-                [InlineKeyboardButton(text="⬅️ Назад", callback_data=back_callback)]
-            ]
-        )
+        keyboard_rows = [
+            [InlineKeyboardButton(text="⬅️ Назад", callback_data=back_callback)]
+        ]
     elif status == "rejected":
-        resubmit_callback = "resubmit_teacher_request" if teacher_status else "resubmit_dean_request"
+        resubmit_callback = "resubmit_teacher_request" if is_teacher else "resubmit_dean_request"
         edit_callback = f"edit_profile:{origin}" if origin else "edit_profile"
         keyboard_rows = [
             [
@@ -35,7 +28,6 @@ async def show_profile(message: Message, telegram_id: int, edit_message: Message
         if role == "dean":
             keyboard_rows.append([InlineKeyboardButton(text="🔐 Учетные данные", callback_data=credentials_callback)])
         keyboard_rows.append([InlineKeyboardButton(text="⬅️ Назад", callback_data=back_callback)])
-        keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
     else:
         edit_callback = f"edit_profile:{origin}" if origin else "edit_profile"
         credentials_callback = f"dean_manage_credentials:{origin}" if origin else "dean_manage_credentials"
@@ -51,9 +43,24 @@ async def show_profile(message: Message, telegram_id: int, edit_message: Message
             if status == "active":
                 keyboard_rows.append([InlineKeyboardButton(text="📅 Google Calendar", callback_data="teacher_manage_calendar")])
         keyboard_rows.append([InlineKeyboardButton(text="⬅️ Назад", callback_data=back_callback)])
-        keyboard = InlineKeyboardMarkup(inline_keyboard=keyboard_rows)
+    return tuple(tuple(row) for row in keyboard_rows)
+
+
+async def show_profile(message: Message, telegram_id: int, edit_message: Message | None = None, origin: str | None = None):
+    profile_text = await profile.format_profile_text(telegram_id)
+
+    teacher_status = await profile.get_teacher_status(telegram_id)
+    dean_status = await profile.get_dean_status(telegram_id)
+
+    status = teacher_status or dean_status
+
+    from services.auth import auth
+    role = await auth.get_role(telegram_id)
+
+    rows = _profile_rows(status, bool(teacher_status), role, origin)
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[list(row) for row in rows])
 
     if edit_message:
-        await edit_message.edit_text(profile_text, parse_mode="HTML", reply_markup=keyboard)
+        await render(edit_message, profile_text, reply_markup=keyboard, parse_mode="HTML")
     else:
         await message.answer(profile_text, parse_mode="HTML", reply_markup=keyboard)
@@ -0,0 +1,98 @@
+import asyncio
+import importlib.util
+import logging
+import ssl
+from typing import Any, Callable, Coroutine
+
+import aiohttp
+import certifi
+from aiogram import __version__ as aiogram_version
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiohttp.abc import AbstractResolver
+from aiohttp.hdrs import USER_AGENT
+from aiohttp.http import SERVER_SOFTWARE
+
+from utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+LOOP_CHOICES = ("auto", "uvloop", "asyncio")
+RESOLVER_CHOICES = ("auto", "aiodns", "threaded")
+
+
+def loop_factory(setting: str = "auto") -> Callable[[], asyncio.AbstractEventLoop] | None:
+    setting = (setting or "auto").lower()
+    if setting not in LOOP_CHOICES:
+        logger.warning(f"Unknown EVENT_LOOP={setting!r}, using the default asyncio loop")
+        return None
+    if setting == "asyncio":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        if setting == "uvloop":
+            logger.warning("EVENT_LOOP=uvloop but uvloop is not installed, using the default asyncio loop")
+        return None
+    return uvloop.new_event_loop
+
+
+def run(main: Coroutine[Any, Any, Any], setting: str = "auto") -> Any:
+    return asyncio.run(main, loop_factory=loop_factory(setting))
+
+
+def create_resolver(setting: str = "auto") -> AbstractResolver | None:
+    setting = (setting or "auto").lower()
+    if setting not in RESOLVER_CHOICES:
+        logger.warning(f"Unknown DNS_RESOLVER={setting!r}, using the threaded resolver")
+        return None
+    if setting == "threaded":
+        return None
+    if importlib.util.find_spec("aiodns") is None:
+        if setting == "aiodns":
+            logger.warning("DNS_RESOLVER=aiodns but aiodns is not installed, using the threaded resolver")
+        return None
+    try:
+        return aiohttp.AsyncResolver()
+    except RuntimeError as e:
+        if setting == "aiodns":
+            logger.warning(f"DNS_RESOLVER=aiodns is unavailable ({e}), using the threaded resolver")
+        return None
+
+
+class ResolverAiohttpSession(AiohttpSession):
+    def __init__(self, resolver: AbstractResolver | None = None, limit: int = 100, **kwargs: Any):
+        super().__init__(limit=limit, **kwargs)
+        self.resolver = resolver
+        self.limit = limit
+
+    async def create_session(self) -> aiohttp.ClientSession:
+        if self.resolver is None or self.proxy is not None:
+            return await super().create_session()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                ssl=ssl.create_default_context(cafile=certifi.where()),
+                limit=self.limit,
+                ttl_dns_cache=3600,
+                resolver=self.resolver
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={USER_AGENT: f"{SERVER_SOFTWARE} aiogram/{aiogram_version}"}
+            )
+        return self._session
+
+
+def bot_session(resolver: AbstractResolver | None = None) -> AiohttpSession:
+    return ResolverAiohttpSession(resolver, json_loads=json_codec.loads, json_dumps=json_codec.dumps)
+
+
+def describe(resolver: AbstractResolver | None = None) -> str:
+    loop = asyncio.get_running_loop()
+    module = type(loop).__module__.split(".", 1)[0]
+    if module == "uvloop":
+        import uvloop
+        loop_name = f"uvloop {uvloop.__version__}"
+    else:
+        loop_name = f"asyncio {type(loop).__name__}"
+    resolver_name = "aiodns" if isinstance(resolver, aiohttp.AsyncResolver) else "threaded"
+    return f"event loop: {loop_name}, DNS resolver: {resolver_name}, JSON: {json_codec.BACKEND}"
@@ -0,0 +1,56 @@
+import importlib
+import logging
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last_mark = self.started
+        self.phases: list[tuple[str, float]] = []
+        self.first_poll: float | None = None
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last_mark))
+        self._last_mark = now
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.phases.append((name, now - start))
+            self._last_mark = now
+
+    def import_module(self, name: str) -> ModuleType:
+        with self.phase(f"import {name}"):
+            return importlib.import_module(name)
+
+    def first_get_updates(self):
+        if self.first_poll is not None:
+            return
+        self.first_poll = time.perf_counter() - self.started
+        self.log()
+
+    def log(self):
+        lines = [f"  {name:<40} {elapsed * 1000:8.1f} ms" for name, elapsed in self.phases]
+        total = self.first_poll if self.first_poll is not None else time.perf_counter() - self.started
+        logger.info("Startup report:\n" + "\n".join(lines) + f"\n  {'time to first getUpdates':<40} {total * 1000:8.1f} ms")
+
+
+class FirstPollMiddleware:
+    def __init__(self, report: StartupReport):
+        self.report = report
+
+    async def __call__(self, make_request: Callable[..., Awaitable[Any]], bot, method) -> Any:
+        if self.report.first_poll is None and type(method).__name__ == "GetUpdates":
+            self.report.first_get_updates()
+        return await make_request(bot, method)